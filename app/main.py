@@ -1,26 +1,40 @@
-from fastapi import FastAPI, HTTPException, Query
+from app.services import startup
+from fastapi import FastAPI, HTTPException, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 from app.services.filters import VideoFilter
 from app.services.youtube_search import YouTubeSearch
 from app.services.llm_handler import LLMHandler
 from typing import List, Optional, Dict
 import os
-from dotenv import load_dotenv
 import re
-from app.services.channel_scraper import ChannelScraper
-from fastapi.responses import JSONResponse
+import uuid
+import logging
+from dotenv import load_dotenv
+from app.services.executors import executor_stats, run_store, shutdown_executors
+from app.services import single_flight, jobs
+from app.services.discovery import discover_channels
+from app.services.keyword_scheduler import KeywordScheduler
+from app.services.ranking import DEFAULT_TOP_K, RANK_CANDIDATES_PER_KEYWORD, TopKRanker, score_channel
+from app.services.export import EXPORT_FORMATS, export_stream, gzip_chunks
+from app.services.enrichment import BATCH_SIZE as ENRICH_BATCH_SIZE, MAX_ENRICH_CHANNELS, enrich_channels, ndjson_rows
+from app.services.proxy_pool import get_proxy_pool
+from app.services.captcha import get_captcha_breaker
+from app.services.quota import QuotaExceeded, get_youtube_quota, youtube_api_keys
+from app.services.llm_handler import SEARCH_KEYWORDS, llm_slots
+from app.services.admission import AdmissionRejected, client_identity, estimate_enrich_cost, estimate_extract_cost, estimate_search_cost, get_admission_controller
+from app.services.metrics import metrics, start_request_timings
+from app.services.logging_config import configure_logging, request_id_var, shutdown_logging
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.requests import Request
+from starlette.background import BackgroundTask
 
 load_dotenv()
+configure_logging()
+logger = logging.getLogger(__name__)
 
-# Check if environment variables are set
-youtube_key = os.getenv("YOUTUBE_API_KEY")
-CAPTCHA_API_KEY = os.getenv("CAPTCHA_API_KEY")
-PROXY = os.getenv("PROXY")
-
-if not youtube_key or youtube_key == "your_youtube_api_key_here":
-    raise ValueError("YOUTUBE_API_KEY is not set in .env file")
+# Accepted client-supplied X-Request-ID values; anything else gets a generated ID
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
 
 app = FastAPI(
     title="YouTube Content Discovery Tool",
@@ -34,6 +48,9 @@ class SearchQuery(BaseModel):
     min_views: Optional[int] = None
     country_code: Optional[str] = None
     limit: Optional[int] = None
+    # Ranked mode: return the top_k best-scoring channels; limit is then candidates per keyword
+    rank: bool = False
+    top_k: Optional[int] = None
 
 class VideoResult(BaseModel):
     title: str
@@ -70,6 +87,13 @@ class VideoUrlItem(BaseModel):
     id: str
     url: str
 
+class EnrichRequest(BaseModel):
+    # Channel IDs (UC...), @handles or channel URLs
+    channels: List[str]
+    classify: bool = False
+    scrape: bool = False
+    last_n: int = Field(3, ge=1, le=50)
+
 class ExtractEmailRequest(BaseModel):
     video_urls: List[VideoUrlItem]
 
@@ -91,10 +115,15 @@ class ChannelDiscoveryResult(BaseModel):
     average_views: float
     channel_url: str
     is_icp: Optional[bool] = None
+    high_ticket: Optional[bool] = None
+    potential_icp: Optional[bool] = None
+    score: Optional[float] = None
 
 class ChannelDiscoveryResponse(BaseModel):
     results: List[ChannelDiscoveryResult]
     related_keywords: List[str]
+    # Per-keyword pages, channels returned, new channels and yield
+    keyword_stats: Optional[List[dict]] = None
 
 app = FastAPI()
 
@@ -109,116 +138,329 @@ app.add_middleware(
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    print(f"Unhandled error: {exc}")  # Log for debugging
+    logger.error("Unhandled error: %s", exc, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Oops! Something went wrong. Please try again later."}
     )
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests, please retry later.", "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.middleware("http")
+async def request_timing_middleware(request: Request, call_next):
+    """
+    Collect a per-stage timing breakdown for each request and return it as a Server-Timing header.
+    """
+    timings = start_request_timings()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = timings.server_timing_header()
+    return response
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """
+    Give each request a correlation ID (the caller's X-Request-ID when valid) that every
+    log line written while handling it carries, and echo it back as X-Request-ID.
+    """
+    request_id = request.headers.get("X-Request-ID")
+    if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+@app.on_event("startup")
+async def startup_event():
+    if not youtube_api_keys():
+        logger.warning("YOUTUBE_API_KEY is not set; YouTube endpoints will fail until it is configured")
+    startup.run_warmup()
+    startup.mark_ready()
+    if startup.PROFILE_ENABLED:
+        logger.info("Startup profile", extra={"startup_profile": startup.startup_profile()})
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_executors()
+    shutdown_logging()
+
+def get_llm_service() -> LLMHandler:
+    return LLMHandler()
+
+def get_youtube_service() -> YouTubeSearch:
+    return YouTubeSearch()
+
+def _client_id(request: Request) -> str:
+    return client_identity(request.headers.get("X-API-Key"), request.client.host if request.client else None)
+
 @app.post("/search", response_model=ChannelDiscoveryResponse)
-async def search_videos(search_query: SearchQuery):
+async def search_videos(
+    search_query: SearchQuery,
+    request: Request,
+    llm_service: LLMHandler = Depends(get_llm_service),
+    youtube_service: YouTubeSearch = Depends(get_youtube_service),
+):
     """
     Search for channels based on the query and filter criteria.
     Returns a list of ChannelDiscoveryResult objects and related keywords.
+    Identical searches that are already in flight are joined rather than re-run.
+    Requests pass admission control first (429 with Retry-After when over budget).
     """
-    print("search_query============", search_query)
+    logger.debug("Search request", extra={"query": search_query.query, "limit": search_query.limit,
+                                          "country_code": search_query.country_code})
+    candidates = search_query.limit
+    if search_query.rank:
+        # limit counts candidates per keyword in ranked mode
+        candidates = (candidates or RANK_CANDIDATES_PER_KEYWORD) * SEARCH_KEYWORDS
+    async with get_admission_controller().admit(_client_id(request), estimate_search_cost(candidates)):
+        return await single_flight.search_requests.do(
+            search_query.model_dump_json(),
+            lambda: _run_search(search_query, llm_service, youtube_service)
+        )
+
+def _require_unranked(search_query: SearchQuery):
+    # Jobs and exports stream channels in discovery order; only /search ranks them
+    if search_query.rank:
+        raise HTTPException(status_code=422, detail="Ranked mode is only supported by /search.")
+
+def _discovery_result(result) -> ChannelDiscoveryResult:
+    return ChannelDiscoveryResult(**result.to_dict(), score=score_channel(result))
 
+async def _run_search(search_query: SearchQuery, llm_service: LLMHandler, youtube_service: YouTubeSearch) -> ChannelDiscoveryResponse:
     try:
-        llm_service = LLMHandler()
-        youtube_service = YouTubeSearch()
-        print(f"DEBUG: Received country_code: '{search_query.country_code}'")
-        allowed_countries = search_query.country_code.replace(" ", "").split(",") if search_query.country_code and search_query.country_code.strip() else None
-        print(f"DEBUG: Processed allowed_countries: {allowed_countries}")
-        filter_service = VideoFilter(
-            min_views=search_query.min_views or 100000,
-            min_subscribers=search_query.min_subscribers or 100000,
-            allowed_countries=allowed_countries
-        )
         related_keywords = await llm_service.generate_synonyms(search_query.query)
-        all_channels = []
-        seen_channel_ids = set()
-        total_channels_visited = 0
-        for keyword in related_keywords:
-            channels = await youtube_service.search_videos(keyword, limit=search_query.limit or 5)
-            for channel in channels:
-                total_channels_visited += 1
-                channel_id = channel.get('channel_id')
-                if not channel_id or channel_id in seen_channel_ids:
-                    continue
-                seen_channel_ids.add(channel_id)
-                if allowed_countries and channel.get('channel_country') not in allowed_countries:
-                    continue
-                if channel.get('channel_subscriber_count', 0) < (search_query.min_subscribers or 100000):
-                    continue
-                about = channel.get('channel_description', '')
-                # Extract all links from about
-                url_pattern = r'https?://[^\s<>"\)\(]+'
-                links = channel.get('links', [])
-                # Extract all emails from about
-                email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                emails = re.findall(email_pattern, about)
-                # Get last 3 videos
-                last_videos = await youtube_service.get_last_videos_for_channel(channel_id, n=3)
-                last_3_videos = [{
-                    'title': v['title'],
-                    'description': v['description'],
-                    'view_count': v['view_count']
-                } for v in last_videos]
-                average_views = float(sum(v['view_count'] for v in last_videos)) / len(last_videos) if last_videos else 0.0
-                
-                # Use LLM to analyze channel and extract contact info
-                channel_details = {
-                    'channel_name': channel.get('channel_name', ''),
-                    'sub_count': channel.get('channel_subscriber_count', 0),
-                    'about': about,
-                    'links': links,
-                    'last_3_titles': [v['title'] for v in last_3_videos],
-                    'avg_views': average_views,
-                    'last_3_descriptions': [v['description'] for v in last_3_videos],
-                    'country': channel.get('channel_country', '')
-                }
-                
-                llm_analysis = await llm_service.extract_contact_info(about, channel_details)
-                
-                # Use LLM extracted emails and contact links if available
-                llm_emails = llm_analysis.get('email', '')
-                if llm_emails:
-                    emails = [llm_emails] if llm_emails not in emails else emails
-                
-                llm_contact_links = llm_analysis.get('contact_links', [])
-                if llm_contact_links:
-                    links.extend(llm_contact_links)
-                
-                all_channels.append(ChannelDiscoveryResult(
-                    id=channel_id,
-                    channel_name=channel.get('channel_name', ''),
-                    subscriber_count=channel.get('channel_subscriber_count', 0),
-                    country=channel.get('channel_country', ''),
-                    about=about,
-                    links=links,
-                    emails=emails,
-                    channel_url=channel.get('channel_url', ''),
-                    last_3_videos=last_3_videos,
-                    average_views=average_views,
-                    is_icp=llm_analysis.get('isicp', False)
-                ))
-                if search_query.limit and len(all_channels) >= search_query.limit:
-                    break
-            if search_query.limit and len(all_channels) >= search_query.limit:
-                break
-        print(f"Total channels visited: {total_channels_visited}")
-        return ChannelDiscoveryResponse(results=all_channels, related_keywords=related_keywords)
+        ranker = TopKRanker(search_query.top_k or DEFAULT_TOP_K) if search_query.rank else None
+        scheduler = KeywordScheduler(related_keywords)
+        results = discover_channels(
+            related_keywords,
+            llm_service,
+            youtube_service,
+            min_subscribers=search_query.min_subscribers,
+            country_code=search_query.country_code,
+            limit=search_query.limit,
+            ranker=ranker,
+            scheduler=scheduler,
+        )
+        if ranker is None:
+            all_channels = [_discovery_result(result) async for result in results]
+        else:
+            async for _ in results:
+                pass
+            all_channels = [_discovery_result(result) for _, result in ranker.ranked()]
+        return ChannelDiscoveryResponse(results=all_channels, related_keywords=related_keywords,
+                                        keyword_stats=scheduler.keyword_stats())
+    except QuotaExceeded as e:
+        logger.warning("Search stopped: %s", e)
+        raise HTTPException(status_code=503, detail="The daily YouTube API quota is used up. Please try again tomorrow.")
     except Exception as e:
         # Log the real error for debugging
-        print(f"Internal error: {e}")
+        logger.exception("Search failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail="something went wrong on our end. Please try again later or contact support if the issue persists."
         )
 
+@app.post("/export/search")
+async def export_search(
+    search_query: SearchQuery,
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    llm_service: LLMHandler = Depends(get_llm_service),
+    youtube_service: YouTubeSearch = Depends(get_youtube_service),
+):
+    """
+    Run a search and stream the results as CSV or NDJSON rows (optionally gzipped)
+    while channels are discovered, instead of building the whole response in memory.
+    The admission budget is held until the stream ends.
+    """
+    _require_unranked(search_query)
+    admission = get_admission_controller()
+    held = await admission.acquire(_client_id(request), estimate_search_cost(search_query.limit))
+    release_admission = _release_once(admission, held)
+    try:
+        related_keywords = await llm_service.generate_synonyms(search_query.query)
+    except Exception as e:
+        release_admission()
+        logger.exception("Export failed: %s", e)
+        raise HTTPException(status_code=500, detail="something went wrong on our end. Please try again later.")
+    results = discover_channels(
+        related_keywords,
+        llm_service,
+        youtube_service,
+        min_subscribers=search_query.min_subscribers,
+        country_code=search_query.country_code,
+        limit=search_query.limit,
+    )
+    headers = {"Content-Disposition": f'attachment; filename="channels.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_stream(_log_stream_errors(results, release_admission), format, gzip=gzip),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers,
+        # Also runs if the client disconnects before the stream starts
+        background=BackgroundTask(release_admission),
+    )
+
+def _release_once(admission, held: int):
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            admission.release(held)
+    return release
+
+@app.post("/enrich")
+async def enrich(
+    body: EnrichRequest,
+    request: Request,
+    gzip: bool = False,
+    llm_service: LLMHandler = Depends(get_llm_service),
+    youtube_service: YouTubeSearch = Depends(get_youtube_service),
+):
+    """
+    Enrich known channels (IDs, @handles or URLs) without search.list and stream NDJSON,
+    one row per input in input order. API calls are batched 50 channels at a time;
+    `classify` adds the Gemini ICP classification and `scrape` the About-page contacts.
+    The whole request is charged to the client's rate limit on admission, but only one
+    batch's share is held in the in-flight budget while it streams.
+    """
+    if not body.channels:
+        raise HTTPException(status_code=400, detail="No channels given.")
+    if len(body.channels) > MAX_ENRICH_CHANNELS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_ENRICH_CHANNELS} channels per request.")
+    admission = get_admission_controller()
+    client_id = _client_id(request)
+    total_cost = estimate_enrich_cost(len(body.channels), body.classify, body.scrape)
+    batch_cost = estimate_enrich_cost(min(len(body.channels), ENRICH_BATCH_SIZE), body.classify, body.scrape)
+    held = await admission.acquire(client_id, batch_cost, rate_cost=total_cost)
+    release_admission = _release_once(admission, held)
+
+    rows = enrich_channels(
+        body.channels,
+        youtube_service,
+        llm_service,
+        classify=body.classify,
+        scrape=body.scrape,
+        last_n=body.last_n,
+    )
+    chunks = ndjson_rows(_log_stream_errors(rows, release_admission))
+    return StreamingResponse(
+        gzip_chunks(chunks) if gzip else chunks,
+        media_type=EXPORT_FORMATS["ndjson"],
+        headers={"Content-Encoding": "gzip"} if gzip else None,
+        background=BackgroundTask(release_admission),
+    )
+
+async def _log_stream_errors(results, on_close):
+    # Headers are already sent once streaming starts, so a failure can only end the export early
+    try:
+        async for result in results:
+            yield result
+    except Exception as e:
+        logger.exception("Stream ended early: %s", e)
+    finally:
+        on_close()
+
+@app.post("/jobs")
+async def create_discovery_job(
+    search_query: SearchQuery,
+    request: Request,
+    llm_service: LLMHandler = Depends(get_llm_service),
+    youtube_service: YouTubeSearch = Depends(get_youtube_service),
+):
+    """
+    Start a checkpointed discovery sweep in the background and return its job record.
+    Progress is saved per keyword page and per channel stage, so a failed or
+    interrupted job can be resumed without redoing finished work.
+    """
+    _require_unranked(search_query)
+    await get_admission_controller().charge(_client_id(request), estimate_search_cost(search_query.limit))
+    job = await jobs.create_job(search_query.model_dump())
+    await jobs.start_job(job["id"], llm_service, youtube_service)
+    return await jobs.get_job(job["id"])
+
+@app.get("/jobs/{job_id}")
+async def get_discovery_job(job_id: str):
+    job = await jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}/results", response_model=ChannelDiscoveryResponse)
+async def get_discovery_job_results(job_id: str):
+    """
+    Channels found so far, in discovery order. Use /export/jobs/{job_id} for large jobs.
+    """
+    job = await jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    results = [_discovery_result(result) async for result in jobs.job_results(job_id)]
+    return ChannelDiscoveryResponse(results=results, related_keywords=job["related_keywords"] or [],
+                                    keyword_stats=job.get("keyword_stats"))
+
+@app.post("/jobs/{job_id}/resume")
+async def resume_discovery_job(
+    job_id: str,
+    request: Request,
+    llm_service: LLMHandler = Depends(get_llm_service),
+    youtube_service: YouTubeSearch = Depends(get_youtube_service),
+):
+    """
+    Resume a failed job (or one orphaned by a worker restart) from its last checkpoint.
+    """
+    job = await jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not jobs.is_resumable(job):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']} and cannot be resumed")
+    admission = get_admission_controller()
+    client_id = _client_id(request)
+    cost = estimate_search_cost(job["params"].get("limit"))
+    await admission.charge(client_id, cost)
+    if not await jobs.start_job(job_id, llm_service, youtube_service):
+        await admission.refund(client_id, cost)
+        raise HTTPException(status_code=409, detail="Job is already running")
+    return await jobs.get_job(job_id)
+
+@app.get("/export/jobs/{job_id}")
+async def export_job(
+    job_id: str,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+):
+    """
+    Stream a job's results as CSV or NDJSON rows (optionally gzipped), read from its checkpoints.
+    """
+    if await jobs.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    headers = {"Content-Disposition": f'attachment; filename="job-{job_id}.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_stream(jobs.job_results(job_id), format, gzip=gzip),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers,
+    )
+
 @app.post("/extract-emails", response_model=List[EmailResult])
-async def extract_emails(req: ExtractEmailRequest):
-    youtube_service = YouTubeSearch()
+async def extract_emails(req: ExtractEmailRequest, request: Request, youtube_service: YouTubeSearch = Depends(get_youtube_service)):
+    async with get_admission_controller().admit(_client_id(request), estimate_extract_cost(len(req.video_urls))):
+        return await _run_extract_emails(req, youtube_service)
+
+async def _run_extract_emails(req: ExtractEmailRequest, youtube_service: YouTubeSearch) -> List[EmailResult]:
     try:
         # Convert HttpUrl to str for the service method
         # url_list = [str(url) for url in req.video_urls]
@@ -252,6 +494,68 @@ async def extract_emails(req: ExtractEmailRequest):
 async def root():
     return {"message": "YouTube Content Discovery Tool API"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus-style metrics: per-stage latency histograms, calls, quota units,
+    cache hits and errors, plus worker pool and in-flight coalescing gauges.
+    """
+    gauges = {
+        "discovery_executor_active_workers": {},
+        "discovery_executor_queue_depth": {},
+        "discovery_executor_saturation": {},
+        "discovery_single_flight_in_flight": {},
+    }
+    for name, stats in executor_stats().items():
+        gauges["discovery_executor_active_workers"][f'pool="{name}"'] = stats["active"]
+        gauges["discovery_executor_queue_depth"][f'pool="{name}"'] = stats["queue_depth"]
+        gauges["discovery_executor_saturation"][f'pool="{name}"'] = stats["saturation"]
+    for name, stats in single_flight.single_flight_stats().items():
+        gauges["discovery_single_flight_in_flight"][f'group="{name}"'] = stats["in_flight"]
+    breaker = get_captcha_breaker().stats()
+    admission = get_admission_controller().stats()
+    gauges["discovery_admission_inflight_cost"] = {'process="local"': admission["inflight_cost"]}
+    gauges["discovery_admission_queue_depth"] = {'process="local"': admission["queue_depth"]}
+    gauges["discovery_captcha_rate"] = {'window="recent"': breaker["captcha_rate"]}
+    gauges["discovery_captcha_throttle_seconds"] = {'state="open"' if breaker["open"] else 'state="closed"': breaker["delay_s"]}
+    return metrics.render_prometheus(gauges)
+
+@app.get("/proxies")
+async def get_proxy_stats():
+    """
+    Health of each scraper proxy: success rate, latency, captcha rate and cooldown state.
+    """
+    return get_proxy_pool().stats()
+
+@app.get("/quota")
+async def get_quota_stats():
+    """
+    YouTube quota used today per API key and Gemini calls in flight, across all worker processes.
+    """
+    return {"youtube": await run_store(get_youtube_quota().stats), "llm": await run_store(llm_slots.stats)}
+
+@app.get("/admission")
+async def get_admission_stats():
+    """
+    In-flight cost, queue depth and admitted/rejected counts for this worker process.
+    """
+    return get_admission_controller().stats()
+
+@app.get("/startup")
+async def get_startup_profile(top: int = Query(25, ge=1, le=500)):
+    """
+    Import-time breakdown of this worker (set STARTUP_PROFILE=true to time every import),
+    plus lazily loaded dependencies and warm-up durations.
+    """
+    return startup.startup_profile(top)
+
+@app.get("/executors")
+async def get_executor_stats():
+    """
+    Queue depth and saturation of the API, scraper and CPU worker pools.
+    """
+    return executor_stats()
+
    
 if __name__ == "__main__":
     import uvicorn
@@ -259,5 +563,10 @@ if __name__ == "__main__":
 
     # port = int(os.environ.get("PORT", 8000))  # default to 8000 locally
     port = int(os.getenv("PORT", 8000))
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
 
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    if workers > 1:
+        # Each worker imports the app itself; quotas, LLM slots and caches are shared through SHARED_STORE_PATH
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
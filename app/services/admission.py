@@ -0,0 +1,209 @@
+import os
+import math
+import time
+import heapq
+import asyncio
+import hashlib
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.shared_store import get_shared_store
+from app.services.executors import run_store
+from app.services.metrics import metrics
+
+# Weighted cost units. One unit is roughly one discovered channel: a search page,
+# a channels.list lookup, the last-videos calls and one Gemini classification.
+SEARCH_BASE_COST = 2
+SEARCH_COST_PER_CHANNEL = 1
+# A scraped URL holds a Chrome page (memory, proxy, possible captcha) for seconds
+EXTRACT_COST_PER_URL = 2
+DEFAULT_SEARCH_LIMIT = 5
+
+
+def estimate_search_cost(limit: Optional[int]) -> int:
+    return SEARCH_BASE_COST + SEARCH_COST_PER_CHANNEL * (limit or DEFAULT_SEARCH_LIMIT)
+
+
+def estimate_extract_cost(url_count: int) -> int:
+    return max(1, EXTRACT_COST_PER_URL * url_count)
+
+
+def estimate_enrich_cost(channel_count: int, classify: bool, scrape: bool) -> int:
+    """
+    Batched API calls cost one unit per 50 channels; classification and scraping are per channel.
+    """
+    per_channel = (1 if classify else 0) + (EXTRACT_COST_PER_URL if scrape else 0)
+    return max(1, math.ceil(channel_count / 50) + per_channel * channel_count)
+
+
+class AdmissionRejected(Exception):
+    """
+    The request was not admitted; `retry_after` is the suggested wait in seconds.
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionController:
+    """
+    Admission control in front of the expensive endpoints.
+
+    Each client has a token bucket (`client_rate` cost units per second, bursting to
+    `client_burst`) kept in the shared store, so the limit holds across worker
+    processes. Admitted requests then share this process's in-flight budget of
+    `max_inflight_cost` units. Requests that do not fit wait in a bounded queue,
+    cheapest first, so small interactive calls are not stuck behind batch runs.
+    A full queue or a wait longer than `queue_timeout` is rejected with a retry hint.
+    """
+
+    def __init__(self, client_rate: float, client_burst: float, max_inflight_cost: int,
+                 max_queue: int, queue_timeout: float):
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_inflight_cost = max_inflight_cost
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.inflight_cost = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # Smoothed time a request holds its budget, used for Retry-After on a full queue
+        self._hold_ewma: Optional[float] = None
+
+    def _reject(self, reason: str, retry_after: float) -> AdmissionRejected:
+        self.rejected += 1
+        metrics.increment(f"admission_rejected_{reason}")
+        return AdmissionRejected(reason, retry_after)
+
+    def _typical_hold(self) -> float:
+        return self._hold_ewma if self._hold_ewma is not None else 5.0
+
+    async def charge(self, client_id: str, cost: int):
+        """
+        Take `cost` from the client's token bucket only. Background jobs use this:
+        they are rate limited per client but do not hold the interactive in-flight budget.
+        """
+        if self.client_rate > 0:
+            wait = await run_store(
+                get_shared_store().take_tokens,
+                f"admission:{client_id}", min(cost, self.client_burst), self.client_rate, self.client_burst,
+            )
+            if wait > 0:
+                raise self._reject("rate_limited", wait)
+
+    async def refund(self, client_id: str, cost: int):
+        """
+        Return a charge for a request the server turned away, so saturation does not
+        also use up the client's rate budget.
+        """
+        if self.client_rate > 0:
+            await run_store(
+                get_shared_store().return_tokens,
+                f"admission:{client_id}", min(cost, self.client_burst), self.client_burst,
+            )
+
+    async def acquire(self, client_id: str, cost: int, rate_cost: Optional[int] = None) -> int:
+        """
+        Admit a request of `cost` units for `client_id`; returns the cost actually held.
+        `rate_cost` (default: the held cost) is charged to the client's rate limit, for
+        requests that hold only part of their total cost at a time.
+        Raises AdmissionRejected when the client is over its rate or the server is
+        saturated; in the latter case the rate charge is refunded.
+        """
+        # A request larger than a whole budget still runs, it just takes all of it
+        cost = max(1, min(cost, self.max_inflight_cost))
+        rate_cost = cost if rate_cost is None else rate_cost
+        await self.charge(client_id, rate_cost)
+
+        if self.inflight_cost + cost <= self.max_inflight_cost and not self._waiters:
+            self.inflight_cost += cost
+            self.admitted += 1
+            return cost
+        if len(self._waiters) >= self.max_queue:
+            await self.refund(client_id, rate_cost)
+            raise self._reject("queue_full", self._typical_hold())
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (cost, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(entry)
+            if future.done() and not future.cancelled():
+                # Admitted just as the wait ran out; give the budget back
+                self.release(cost)
+            await self.refund(client_id, rate_cost)
+            raise self._reject("queue_timeout", self._typical_hold())
+        except asyncio.CancelledError:
+            self._remove_waiter(entry)
+            if future.done() and not future.cancelled():
+                self.release(cost)
+            raise
+        self.admitted += 1
+        return cost
+
+    def _remove_waiter(self, entry):
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+
+    def release(self, cost: int, held_seconds: Optional[float] = None):
+        self.inflight_cost -= cost
+        if held_seconds is not None:
+            self._hold_ewma = held_seconds if self._hold_ewma is None else 0.2 * held_seconds + 0.8 * self._hold_ewma
+        # Wake queued requests, cheapest first, while they fit
+        while self._waiters and self.inflight_cost + self._waiters[0][0] <= self.max_inflight_cost:
+            waiter_cost, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.inflight_cost += waiter_cost
+            future.set_result(True)
+
+    @asynccontextmanager
+    async def admit(self, client_id: str, cost: int):
+        held = await self.acquire(client_id, cost)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(held, time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'inflight_cost': self.inflight_cost,
+            'max_inflight_cost': self.max_inflight_cost,
+            'queue_depth': len(self._waiters),
+            'max_queue': self.max_queue,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+        }
+
+
+def client_identity(api_key: Optional[str], client_host: Optional[str]) -> str:
+    """
+    Clients are identified by X-API-Key when sent (stored only as a digest), else by IP.
+    """
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return f"ip:{client_host or 'unknown'}"
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController(
+            client_rate=float(os.getenv("ADMISSION_CLIENT_RATE", 1.0)),
+            client_burst=float(os.getenv("ADMISSION_CLIENT_BURST", 60)),
+            max_inflight_cost=int(os.getenv("ADMISSION_MAX_INFLIGHT_COST", 200)),
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", 20)),
+            queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 30)),
+        )
+    return _controller
@@ -0,0 +1,184 @@
+import os
+import logging
+import time
+import asyncio
+from collections import deque
+from typing import Any, Dict, Optional
+from app.services.executors import run_api
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CaptchaSolver:
+    """
+    Solves reCAPTCHA challenges in the background.
+    Implementations must not block the event loop; `solve` returns the token or None.
+    """
+
+    name = 'none'
+
+    async def solve(self, site_key: str, page_url: str) -> Optional[str]:
+        return None
+
+
+class TwoCaptchaSolver(CaptchaSolver):
+    """
+    2Captcha solver. The task is submitted once and then polled with asyncio.sleep
+    between checks, so no browser and no worker thread waits while 2Captcha works.
+    """
+
+    name = '2captcha'
+
+    def __init__(self, api_key: str, poll_interval: float = 5.0, timeout: float = 180.0):
+        from twocaptcha import TwoCaptcha
+        self.solver = TwoCaptcha(api_key)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    async def solve(self, site_key: str, page_url: str) -> Optional[str]:
+        from twocaptcha import NetworkException
+        with metrics.span('captcha_solve') as span:
+            try:
+                captcha_id = await run_api(self.solver.send, method='userrecaptcha', googlekey=site_key, pageurl=page_url)
+                deadline = time.monotonic() + self.timeout
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(self.poll_interval)
+                    try:
+                        return await run_api(self.solver.get_result, captcha_id)
+                    except NetworkException:
+                        # CAPCHA_NOT_READY
+                        continue
+                logger.warning("Captcha solve timed out after %.0fs for %s", self.timeout, page_url)
+            except Exception as e:
+                logger.warning("Captcha solve failed: %s", e)
+            span.error()
+            return None
+
+
+class FakeCaptchaSolver(CaptchaSolver):
+    """
+    Local stand-in for testing: returns a fixed token after `delay` seconds.
+    """
+
+    name = 'fake'
+
+    def __init__(self, delay: float = 1.0, token: str = 'fake-recaptcha-token'):
+        self.delay = delay
+        self.token = token
+        self.solved = 0
+
+    async def solve(self, site_key: str, page_url: str) -> Optional[str]:
+        with metrics.span('captcha_solve'):
+            await asyncio.sleep(self.delay)
+            self.solved += 1
+            return self.token
+
+
+class CaptchaCircuitBreaker:
+    """
+    Slows scraping down as the captcha rate over the last `window` pages rises.
+
+    Below `slow_rate` pages run at full speed. Between `slow_rate` and `open_rate`
+    each page waits up to `max_delay` seconds, growing with the rate. At `open_rate`
+    the breaker opens and every page waits out `open_seconds` before trying again.
+    Nothing is throttled until `min_samples` pages have been seen.
+    """
+
+    def __init__(self, window: int = 20, slow_rate: float = 0.1, open_rate: float = 0.4,
+                 max_delay: float = 10.0, open_seconds: float = 120.0, min_samples: int = 10):
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self.slow_rate = slow_rate
+        self.open_rate = open_rate
+        self.max_delay = max_delay
+        self.open_seconds = open_seconds
+        self._outcomes = deque(maxlen=window)
+        self._open_until = 0.0
+        self.trips = 0
+
+    def record(self, captcha: bool):
+        self._outcomes.append(bool(captcha))
+        if len(self._outcomes) >= self.min_samples and self.captcha_rate() >= self.open_rate:
+            if time.monotonic() >= self._open_until:
+                self.trips += 1
+                logger.warning("Captcha circuit open: captcha rate %.0f%% over %d pages, pausing %.0fs",
+                               self.captcha_rate() * 100, len(self._outcomes), self.open_seconds)
+            self._open_until = time.monotonic() + self.open_seconds
+            # Start the next window fresh so the breaker can close after the pause
+            self._outcomes.clear()
+
+    def captcha_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def delay(self) -> float:
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            return remaining
+        rate = self.captcha_rate()
+        if len(self._outcomes) < self.min_samples or rate < self.slow_rate:
+            return 0.0
+        return self.max_delay * min(1.0, (rate - self.slow_rate) / (self.open_rate - self.slow_rate))
+
+    async def before_page(self):
+        delay = self.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'captcha_rate': self.captcha_rate(),
+            'window_pages': len(self._outcomes),
+            'open': self._open_until > time.monotonic(),
+            'delay_s': self.delay(),
+            'trips': self.trips,
+        }
+
+
+_solver: Optional[CaptchaSolver] = None
+_breaker: Optional[CaptchaCircuitBreaker] = None
+
+
+def get_captcha_solver() -> CaptchaSolver:
+    """
+    Solver selected by CAPTCHA_SOLVER: '2captcha' (default when APIKEY_2CAPTCHA is set),
+    'fake' for local testing, or 'none'.
+    """
+    global _solver
+    if _solver is None:
+        api_key = os.getenv("APIKEY_2CAPTCHA") or os.getenv("CAPTCHA_API_KEY")
+        kind = os.getenv("CAPTCHA_SOLVER", "2captcha" if api_key else "none").lower()
+        if kind == "fake":
+            _solver = FakeCaptchaSolver(delay=float(os.getenv("FAKE_CAPTCHA_DELAY", 1.0)))
+        elif kind == "2captcha" and api_key:
+            _solver = TwoCaptchaSolver(api_key)
+        else:
+            _solver = CaptchaSolver()
+    return _solver
+
+
+def set_captcha_solver(solver: CaptchaSolver):
+    """
+    Swap the solver, e.g. for a FakeCaptchaSolver in tests or benchmarks.
+    """
+    global _solver
+    _solver = solver
+
+
+def set_captcha_breaker(breaker: CaptchaCircuitBreaker):
+    """
+    Swap the circuit breaker, e.g. for one with different thresholds in benchmarks.
+    """
+    global _breaker
+    _breaker = breaker
+
+
+def get_captcha_breaker() -> CaptchaCircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        _breaker = CaptchaCircuitBreaker(
+            slow_rate=float(os.getenv("CAPTCHA_SLOW_RATE", 0.1)),
+            open_rate=float(os.getenv("CAPTCHA_OPEN_RATE", 0.4)),
+            open_seconds=float(os.getenv("CAPTCHA_OPEN_SECONDS", 120)),
+        )
+    return _breaker
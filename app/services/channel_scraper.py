@@ -1,7 +1,5 @@
 import os
-import re
-import time
-from urllib.parse import urlparse, parse_qs, unquote
+import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -9,13 +7,33 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
-from twocaptcha import TwoCaptcha
+from app.services.contact_extraction import is_valid_email, is_useful_social_link, redirect_target
+
+logger = logging.getLogger(__name__)
+
+# The About panel (or the captcha that replaces it) is what we wait for, not full page load
+ABOUT_PANEL_SELECTOR = "ytd-about-channel-renderer, yt-channel-external-link-view-model"
+CAPTCHA_SELECTOR = "[data-sitekey], iframe[src*='recaptcha']"
+# Images, fonts and media are never read; blocking them cuts bandwidth and page time
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m4a", "*.mp3",
+    "*googlevideo.com/videoplayback*", "*i.ytimg.com*", "*yt3.ggpht.com*",
+]
 
 class ChannelScraper:
-    def __init__(self):
+    def __init__(self, proxy=None):
+        """
+        Launch a headless Chrome. `proxy` is a --proxy-server value such as
+        "http://10.0.0.1:8080"; the browser keeps it for its whole lifetime.
+        """
+        self.proxy = proxy
         chrome_binary_path = os.getenv("CHROME_BINARY_PATH")
         chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
-        api_key = os.getenv("APIKEY_2CAPTCHA")
+        # Caps (seconds) on how long to wait for the About panel to appear
+        self.element_timeout = float(os.getenv("SCRAPER_ELEMENT_TIMEOUT", 6))
+        block_resources = os.getenv("SCRAPER_BLOCK_RESOURCES", "true").lower() != "false"
 
         options = Options()
         if chrome_binary_path:
@@ -29,6 +47,17 @@ class ChannelScraper:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if proxy:
+            options.add_argument(f"--proxy-server={proxy}")
+        # Hand control back at DOMContentLoaded; we wait for the elements we need instead
+        options.page_load_strategy = "eager"
+        if block_resources:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.fonts": 2,
+                "profile.managed_default_content_settings.media_stream": 2,
+            })
 
         try:
             if chromedriver_path and os.path.exists(chromedriver_path):
@@ -38,37 +67,29 @@ class ChannelScraper:
                 self.driver = webdriver.Chrome(options=options)
 
             self.driver.set_page_load_timeout(30)
-            self.driver.implicitly_wait(10)
+            # No implicit wait: a missing selector must return immediately, waits are explicit
+            self.driver.implicitly_wait(0)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if block_resources:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_PATTERNS})
         except Exception as e:
-            print(f"[Error] Chrome driver init failed: {e}")
+            logger.error("Chrome driver init failed: %s", e)
             raise
 
-        self.solver = TwoCaptcha(api_key) if api_key else None
-
     def close(self):
         try:
             self.driver.quit()
         except:
             pass
 
-    def solve_recaptcha(self, site_key, page_url):
-        if not self.solver:
-            return None
-        try:
-            result = self.solver.recaptcha(sitekey=site_key, url=page_url)
-            return result['code']
-        except Exception as e:
-            print(f"[Captcha Error] {e}")
-            return None
-
     def _close_overlays(self):
         try:
             buttons = self.driver.find_elements(By.XPATH, "//button[contains(@aria-label,'Close') or contains(@aria-label,'Dismiss')]")
             for btn in buttons:
                 if btn.is_displayed():
+                    # JS click is synchronous; no settle delay needed before reading the DOM
                     self.driver.execute_script("arguments[0].click();", btn)
-                    time.sleep(0.5)
         except:
             pass
 
@@ -81,36 +102,19 @@ class ChannelScraper:
                     return email
         except:
             pass
+        return None
 
+    def _page_source(self):
         try:
-            email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-            matches = re.findall(email_pattern, self.driver.page_source)
-            for match in matches:
-                if self._is_valid_email(match):
-                    return match
+            return self.driver.page_source
         except:
-            pass
-
-        return None
+            return None
 
     def _is_valid_email(self, email):
-        blocked = ["example.com", "test.com", "domain.com"]
-        if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email):
-          return False
-        if email.startswith("wght@"):
-          return False
-        return not any(b in email.lower() for b in blocked)
-
+        return is_valid_email(email)
 
     def _is_useful_social_link(self, url):
-        social_domains = [
-            "instagram.com", "facebook.com", "twitter.com", "x.com", "linkedin.com",
-            "t.me", "threads.net", "discord.gg", "patreon.com", "onlyfans.com",
-            "github.com", "pinterest.com", "linktr.ee", "soundcloud.com", "tiktok.com"
-        ]
-        return (
-            url.startswith("http") and any(domain in url for domain in social_domains)
-        )
+        return is_useful_social_link(url)
 
     def _extract_redirected_links(self):
         links = set()
@@ -119,40 +123,80 @@ class ChannelScraper:
             for el in redirect_elements:
                 href = el.get_attribute("href")
                 if href:
-                    parsed_url = urlparse(href)
-                    qs = parse_qs(parsed_url.query)
-                    if 'q' in qs:
-                        actual_url = unquote(qs['q'][0])
-                        if self._is_useful_social_link(actual_url):
-                            links.add(actual_url)
+                    actual_url = redirect_target(href)
+                    if actual_url and self._is_useful_social_link(actual_url):
+                        links.add(actual_url)
         except Exception as e:
-            print(f"[Redirect Link Error] {e}")
+            logger.debug("Could not read redirect links: %s", e)
         return links
 
-    def extract_from_channel(self, channel_url):
+    def _wait_for_page(self):
+        """
+        Wait until the About panel or a captcha is in the DOM, capped at element_timeout.
+        Channels without an About panel fall through after the cap and are read as-is.
+        """
+        try:
+            WebDriverWait(self.driver, self.element_timeout, poll_frequency=0.1).until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ABOUT_PANEL_SELECTOR)),
+                EC.presence_of_element_located((By.CSS_SELECTOR, CAPTCHA_SELECTOR)),
+            ))
+        except TimeoutException:
+            pass
+
+    def _find_captcha_site_key(self):
+        """
+        Return the reCAPTCHA site key, "" for a captcha without a readable key, or None if there is no captcha.
+        """
+        elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-sitekey]")
+        if elements:
+            return elements[0].get_attribute("data-sitekey") or ""
+        if self.driver.find_elements(By.CSS_SELECTOR, "iframe[src*='recaptcha']"):
+            return ""
+        return None
+
+    def extract_from_channel(self, channel_url, captcha_token=None):
+        """
+        Scrape email and social links from a channel's About page.
+
+        When no mailto link has an email, the result carries the page's 'page_source';
+        the caller scans it (first_email) on the CPU pool so this browser is freed first.
+
+        If the page shows a reCAPTCHA and no `captcha_token` is given, the page is parked:
+        the result carries a 'captcha_challenge' (site key and URL) and the browser is
+        free for other channels while the challenge is solved elsewhere. Calling again
+        with the solved token injects it and reads the page.
+        """
         # Convert handle to full URL if needed
         if channel_url.startswith("@"): 
             channel_url = f"https://www.youtube.com/{channel_url}"
         about_url = f"{channel_url.rstrip('/')}/about"
+        captcha = False
         try:
             self.driver.get(about_url)
-            WebDriverWait(self.driver, 20).until(lambda d: d.execute_script("return document.readyState") == "complete")
-
-            if "recaptcha" in self.driver.page_source.lower():
-                match = re.search(r'data-sitekey="(.+?)"', self.driver.page_source)
-                if match:
-                    token = self.solve_recaptcha(match.group(1), about_url)
-                    if token:
-                        self.driver.execute_script("document.getElementById('g-recaptcha-response').innerHTML = arguments[0];", token)
-                        time.sleep(3)
-                        self.driver.refresh()
+            self._wait_for_page()
+
+            site_key = self._find_captcha_site_key()
+            if site_key is not None:
+                captcha = True
+                if site_key and not captcha_token:
+                    return {
+                        "email": None, "links": [], "captcha": True, "error": None,
+                        "captcha_challenge": {"site_key": site_key, "page_url": about_url},
+                    }
+                if site_key:
+                    self.driver.execute_script("document.getElementById('g-recaptcha-response').innerHTML = arguments[0];", captcha_token)
+                    self.driver.refresh()
+                    self._wait_for_page()
 
             self._close_overlays()
             email = self._extract_email()
 
             links = self._extract_redirected_links()
 
-            return {"email": email, "links": list(links)}
+            result = {"email": email, "links": list(links), "captcha": captcha, "error": None}
+            if email is None:
+                result["page_source"] = self._page_source()
+            return result
         except Exception as e:
-            print(f"[Error] {channel_url}: {e}")
-            return {"email": None, "links": []}
+            logger.warning("Scrape failed for %s: %s", channel_url, e)
+            return {"email": None, "links": [], "captcha": captcha, "error": str(e)}
@@ -0,0 +1,167 @@
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, unquote
+
+# Patterns are compiled once at import. The email branch starts with a negative
+# lookbehind so a scan over long tokens (base64 blobs, minified JS in page sources)
+# rejects every mid-token start position immediately instead of backtracking.
+_EMAIL = r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}'
+# URLs may appear JSON-escaped in page sources (https:\/\/... \u0026...)
+_URL = r'https?:(?://|\\/\\/)(?:[^\s<>"\'()\\]|\\/|\\u0026)+'
+CONTACT_PATTERN = re.compile(rf'(?P<url>{_URL})|(?P<email>{_EMAIL})')
+EMAIL_PATTERN = re.compile(_EMAIL)
+URL_PATTERN = re.compile(_URL)
+VALID_EMAIL_PATTERN = re.compile(r'^[\w.+%-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}$')
+
+BLOCKED_EMAIL_DOMAINS = frozenset({"example.com", "test.com", "domain.com"})
+# Asset names such as "logo@2x.png" match the email pattern in page sources
+ASSET_SUFFIXES = frozenset({"png", "jpg", "jpeg", "gif", "webp", "svg", "css", "js", "ico", "woff", "woff2"})
+
+# Lookup table: registrable domain -> platform name
+SOCIAL_DOMAINS = {
+    "instagram.com": "instagram",
+    "facebook.com": "facebook",
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "linkedin.com": "linkedin",
+    "t.me": "telegram",
+    "threads.net": "threads",
+    "discord.gg": "discord",
+    "patreon.com": "patreon",
+    "onlyfans.com": "onlyfans",
+    "github.com": "github",
+    "pinterest.com": "pinterest",
+    "linktr.ee": "linktree",
+    "soundcloud.com": "soundcloud",
+    "tiktok.com": "tiktok",
+}
+
+# First path segments that are site sections rather than a user's handle
+_NON_HANDLE_SEGMENTS = frozenset({"", "p", "reel", "reels", "watch", "share", "sharer", "intent", "home", "in", "company", "pages", "pg", "groups", "status", "join", "invite", "c", "user"})
+_TRAILING_PUNCTUATION = '.,;:!?\'"'
+_ESCAPES = (("\\u0026", "&"), ("&amp;", "&"), ("\\/", "/"))
+
+
+def _clean_url(url: str) -> str:
+    url = url.rstrip(_TRAILING_PUNCTUATION)
+    for escaped, plain in _ESCAPES:
+        if escaped in url:
+            url = url.replace(escaped, plain)
+    return url
+
+
+def _host(url: str) -> str:
+    try:
+        host = urlparse(url).hostname or ""
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def social_platform(url: str) -> Optional[str]:
+    """
+    Return the platform name if `url` points at a known social/contact domain.
+    Subdomains (m.facebook.com, uk.linkedin.com) resolve through the lookup table.
+    """
+    host = _host(url)
+    while host:
+        platform = SOCIAL_DOMAINS.get(host)
+        if platform:
+            return platform
+        _, _, host = host.partition(".")
+    return None
+
+
+def is_useful_social_link(url: str) -> bool:
+    return url.startswith("http") and social_platform(url) is not None
+
+
+def is_valid_email(email: str) -> bool:
+    if not VALID_EMAIL_PATTERN.match(email):
+        return False
+    if email.startswith("wght@"):
+        return False
+    domain = email.rsplit("@", 1)[1].lower()
+    if domain.rsplit(".", 1)[-1] in ASSET_SUFFIXES:
+        return False
+    return not any(domain == b or domain.endswith("." + b) for b in BLOCKED_EMAIL_DOMAINS)
+
+
+def redirect_target(url: str) -> Optional[str]:
+    """
+    Decode the destination of a youtube.com/redirect link, or None for other URLs.
+    """
+    if "/redirect" not in url or not _host(url).endswith("youtube.com"):
+        return None
+    qs = parse_qs(urlparse(url).query)
+    if 'q' in qs:
+        return unquote(qs['q'][0])
+    return None
+
+
+def social_handle(url: str) -> Optional[str]:
+    """
+    Return "platform:handle" for profile URLs such as https://instagram.com/name.
+    """
+    platform = social_platform(url)
+    if not platform:
+        return None
+    segments = [s for s in urlparse(url).path.split("/") if s]
+    if not segments:
+        return None
+    handle = segments[0].lstrip("@")
+    if handle.lower() in _NON_HANDLE_SEGMENTS:
+        return None
+    return f"{platform}:{handle}"
+
+
+def first_email(text: str) -> Optional[str]:
+    """
+    Return the first valid email in `text`, stopping the scan as soon as one is found.
+    """
+    for match in EMAIL_PATTERN.finditer(text):
+        email = match.group(0)
+        if is_valid_email(email):
+            return email
+    return None
+
+
+def extract_contacts(text: str) -> Dict[str, List[str]]:
+    """
+    Find emails, URLs, youtube.com/redirect targets, social links and social handles
+    in a single pass over `text`. Every list is de-duplicated and keeps first-seen order.
+    """
+    emails: Dict[str, None] = {}
+    urls: Dict[str, None] = {}
+    redirects: Dict[str, None] = {}
+    social: Dict[str, None] = {}
+    handles: Dict[str, None] = {}
+
+    for match in CONTACT_PATTERN.finditer(text or ""):
+        email = match.group('email')
+        if email is not None:
+            if is_valid_email(email):
+                emails[email] = None
+            continue
+
+        url = _clean_url(match.group('url'))
+        if url in urls:
+            continue
+        urls[url] = None
+        target = redirect_target(url)
+        if target:
+            redirects[target] = None
+            url = target
+        if is_useful_social_link(url):
+            social[url] = None
+            handle = social_handle(url)
+            if handle:
+                handles[handle] = None
+
+    return {
+        'emails': list(emails),
+        'urls': list(urls),
+        'redirect_targets': list(redirects),
+        'social_links': list(social),
+        'handles': list(handles),
+    }
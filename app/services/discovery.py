@@ -0,0 +1,302 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.services.llm_handler import LLMHandler
+from app.services.youtube_search import CHANNEL_DETAILS_PARTS, YouTubeSearch
+from app.services.contact_extraction import extract_contacts
+from app.services import single_flight
+from app.services.metrics import metrics
+from app.services.records import ChannelRecord, ClassificationResult, DiscoveredChannel, VideoRecord
+from app.services.shared_store import get_shared_store
+from app.services.executors import run_store
+from app.services.ranking import RANK_CANDIDATES_PER_KEYWORD, TopKRanker, upper_bound
+from app.services.keyword_scheduler import KeywordScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SUBSCRIBERS = 100000
+
+# Average views and classification per channel, keyed by the ETags they were computed from
+ANALYSIS_NAMESPACE = 'channel_analysis'
+ANALYSIS_TTL = float(os.getenv("CHANNEL_ANALYSIS_TTL", 30 * 24 * 3600))
+
+
+def parse_country_codes(country_code: Optional[str]) -> Optional[List[str]]:
+    """
+    "US, GB" -> ["US", "GB"]; None or blank -> None (no country filter).
+    """
+    if not country_code or not country_code.strip():
+        return None
+    return country_code.replace(" ", "").split(",")
+
+
+class DiscoveryCheckpoint:
+    """
+    Progress hooks for discover_channels. This base class keeps progress in memory
+    only, which is all a plain /search needs; jobs.JobCheckpoint persists every
+    step so an interrupted sweep can resume where it stopped.
+    """
+
+    def __init__(self):
+        self._done = set()
+        self._found = 0
+
+    def found_count(self) -> int:
+        return self._found
+
+    async def keyword_progress(self, keyword: str) -> Optional[Dict[str, Any]]:
+        """
+        KeywordScheduler.progress() saved for `keyword`, or None to start fresh.
+        """
+        return None
+
+    async def save_keyword_progress(self, keyword: str, progress: Dict[str, Any]):
+        pass
+
+    async def is_done(self, channel_id: str) -> bool:
+        return channel_id in self._done
+
+    async def mark_done(self, channel_id: str, result: Optional[DiscoveredChannel]):
+        """
+        Record a finished channel: `result` is None when it was filtered out.
+        """
+        self._done.add(channel_id)
+        if result is not None:
+            self._found += 1
+
+    async def load_stage(self, channel_id: str, stage: str) -> Any:
+        return None
+
+    async def save_stage(self, channel_id: str, stage: str, value: Any):
+        pass
+
+    async def run_unit(self, fn: Callable[[], Awaitable[Any]], retry_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Run one unit of work (a search page or one channel stage).
+        """
+        return await fn()
+
+
+async def discover_channels(
+    related_keywords: List[str],
+    llm_service: LLMHandler,
+    youtube_service: YouTubeSearch,
+    min_subscribers: Optional[int] = None,
+    country_code: Optional[str] = None,
+    limit: Optional[int] = None,
+    checkpoint: Optional[DiscoveryCheckpoint] = None,
+    ranker: Optional[TopKRanker] = None,
+    scheduler: Optional[KeywordScheduler] = None,
+) -> AsyncIterator[DiscoveredChannel]:
+    """
+    Search the keywords (up to `limit` new channels per keyword, 5 by default), enrich and
+    classify every new channel that passes the country and subscriber filters, and
+    yield one DiscoveredChannel as soon as it is ready. Nothing is accumulated, so
+    callers can stream arbitrarily many.
+
+    `scheduler` (a fresh KeywordScheduler by default) picks which keyword's page to fetch
+    next: keywords whose pages are mostly channels already found are retired and their
+    unused pages go to the keywords still finding new ones. Pass one in to read its
+    per-keyword yield stats afterwards.
+
+    Each search page and each channel stage (details, last videos, classification)
+    goes through `checkpoint`, which can persist it and skip it on a later resume.
+
+    With a `ranker`, `limit` is the candidates searched per keyword (not a cap on results).
+    Channels that cannot enter the ranker's top K are dropped before their expensive
+    stages, and keyword expansion stops once further pages are unlikely to improve it.
+    """
+    if ranker is not None:
+        per_keyword = limit or RANK_CANDIDATES_PER_KEYWORD
+        limit = None
+    else:
+        per_keyword = limit or 5
+    checkpoint = checkpoint or DiscoveryCheckpoint()
+    scheduler = scheduler or KeywordScheduler(related_keywords)
+    scheduler.start(per_keyword)
+    for keyword in scheduler.keywords:
+        progress = await checkpoint.keyword_progress(keyword)
+        if progress is not None:
+            scheduler.restore(keyword, progress)
+    allowed_countries = parse_country_codes(country_code)
+    min_subscribers = min_subscribers or DEFAULT_MIN_SUBSCRIBERS
+    total_channels_visited = 0
+    duplicates_skipped = 0
+    try:
+        while True:
+            if limit and checkpoint.found_count() >= limit:
+                return
+            keyword = scheduler.next_keyword()
+            if keyword is None:
+                return
+            stats = scheduler.keywords[keyword]
+            page_size = scheduler.page_size(keyword)
+            channel_ids, next_page_token = await checkpoint.run_unit(
+                lambda: youtube_service.search_channels_page(keyword, page_size, stats.page_token)
+            )
+            new_ids = scheduler.record_page(keyword, channel_ids, next_page_token)
+            total_channels_visited += len(channel_ids)
+            duplicates_skipped += len(channel_ids) - len(new_ids)
+            for channel_id in new_ids:
+                if await checkpoint.is_done(channel_id):
+                    continue
+                result = await _process_channel(
+                    channel_id, llm_service, youtube_service, checkpoint, allowed_countries, min_subscribers, ranker
+                )
+                await checkpoint.mark_done(channel_id, result)
+                if result is not None:
+                    if ranker is not None:
+                        ranker.offer(result)
+                    yield result
+                    if limit and checkpoint.found_count() >= limit:
+                        return
+            await checkpoint.save_keyword_progress(keyword, scheduler.progress(keyword))
+            if ranker is not None and ranker.exhausted(min(50, per_keyword)):
+                logger.info("Ranking converged; not expanding further keywords", extra={
+                    "observed": ranker.observed, "improvements": ranker.improvements, "pruned": ranker.pruned})
+                return
+    finally:
+        logger.info("Discovery finished", extra={
+            "channels_visited": total_channels_visited, "duplicates_skipped": duplicates_skipped,
+            "search_pages": scheduler.pages_used})
+        metrics.increment("channels_visited", total_channels_visited)
+        metrics.increment("keyword_duplicates_skipped", duplicates_skipped)
+
+
+async def _stage(checkpoint: DiscoveryCheckpoint, channel_id: str, stage: str, fn, retry_if=None) -> Any:
+    value = await checkpoint.load_stage(channel_id, stage)
+    if value is None:
+        value = await checkpoint.run_unit(fn, retry_if)
+        # A result the unit would have retried (e.g. a failed classification) is not kept
+        if not (retry_if and retry_if(value)):
+            await checkpoint.save_stage(channel_id, stage, value)
+    return value
+
+
+async def _process_channel(
+    channel_id: str,
+    llm_service: LLMHandler,
+    youtube_service: YouTubeSearch,
+    checkpoint: DiscoveryCheckpoint,
+    allowed_countries: Optional[List[str]],
+    min_subscribers: int,
+    ranker: Optional[TopKRanker] = None,
+) -> Optional[DiscoveredChannel]:
+    channel = await _stage(checkpoint, channel_id, 'channel', lambda: youtube_service.get_channel_details(channel_id))
+    if allowed_countries and channel.country not in allowed_countries:
+        return None
+    if channel.subscriber_count < min_subscribers:
+        return None
+    if ranker is not None and ranker.prune(upper_bound(channel.subscriber_count)):
+        return None
+    about = channel.description
+    links: List[str] = []
+    # Extract all emails from about (shared precompiled single-pass extractor)
+    emails = extract_contacts(about)['emails']
+    last_videos = await _stage(
+        checkpoint, channel_id, 'last_videos', lambda: youtube_service.get_last_videos_for_channel(channel_id, n=3)
+    )
+
+    if ranker is not None and last_videos:
+        views = float(sum(v.view_count for v in last_videos)) / len(last_videos)
+        if ranker.prune(upper_bound(channel.subscriber_count, views)):
+            return None
+
+    fingerprint = content_fingerprint(channel, last_videos)
+    previous = await load_analysis(channel_id, CHANNEL_DETAILS_PARTS, fingerprint)
+    if previous is not None:
+        # YouTube answered 304 for the channel and its videos: nothing to recompute
+        average_views, classification = previous
+        metrics.increment("classification_reused")
+        await checkpoint.save_stage(channel_id, 'classification', classification)
+    else:
+        average_views = float(sum(v.view_count for v in last_videos)) / len(last_videos) if last_videos else 0.0
+
+        # Use LLM to analyze channel and extract contact info
+        channel_details = classification_details(channel, links, last_videos, average_views)
+        classification = await _stage(
+            checkpoint, channel_id, 'classification',
+            lambda: single_flight.channel_classification.do(
+                classification_key(channel_id, about, channel_details),
+                lambda: llm_service.classify_channel(about, channel_details)
+            ),
+            retry_if=lambda c: c.failed,
+        )
+        if not classification.failed:
+            await save_analysis(channel_id, CHANNEL_DETAILS_PARTS, fingerprint, average_views, classification)
+
+    # Use LLM extracted emails and contact links if available
+    if classification.email:
+        emails = [classification.email] if classification.email not in emails else emails
+    if classification.contact_links:
+        links = links + classification.contact_links
+
+    return DiscoveredChannel(channel, emails, links, last_videos, average_views, classification)
+
+
+def content_fingerprint(channel: ChannelRecord, last_videos: List[VideoRecord]) -> Optional[str]:
+    """
+    The ETags of the channel and its last videos, or None if any is missing.
+    Equal fingerprints mean YouTube reported nothing changed since the last analysis.
+    """
+    etags = [channel.etag] + [v.etag for v in last_videos]
+    if not all(etags):
+        return None
+    return '|'.join(etags)
+
+
+def _analysis_key(channel_id: str, channel_parts: str) -> str:
+    # /search and /enrich fetch channels with different part sets (and so different
+    # ETags); each keeps its own entry rather than overwriting the other's
+    return f"{channel_id}:{channel_parts}"
+
+
+async def load_analysis(channel_id: str, channel_parts: str, fingerprint: Optional[str]) -> Optional[Tuple[float, ClassificationResult]]:
+    """
+    The stored analysis of a channel fetched with `channel_parts`, if its fingerprint still matches.
+    """
+    if fingerprint is None or ANALYSIS_TTL <= 0:
+        return None
+    state = await run_store(get_shared_store().get, ANALYSIS_NAMESPACE, _analysis_key(channel_id, channel_parts))
+    if state is None or state['fingerprint'] != fingerprint:
+        return None
+    return state['average_views'], ClassificationResult.from_state(state['classification'])
+
+
+async def save_analysis(channel_id: str, channel_parts: str, fingerprint: Optional[str], average_views: float,
+                        classification: ClassificationResult):
+    if fingerprint is None or ANALYSIS_TTL <= 0:
+        return
+    await run_store(get_shared_store().set, ANALYSIS_NAMESPACE, _analysis_key(channel_id, channel_parts), {
+        'fingerprint': fingerprint,
+        'average_views': average_views,
+        'classification': classification.to_state(),
+    }, ttl=ANALYSIS_TTL)
+
+
+def classification_details(channel: ChannelRecord, links: List[str], last_videos: List[VideoRecord], average_views: float) -> Dict[str, Any]:
+    """
+    The channel_details dict LLMHandler.extract_contact_info builds its prompt from.
+    """
+    return {
+        'channel_name': channel.name or '',
+        'sub_count': channel.subscriber_count,
+        'about': channel.description,
+        'links': links,
+        'last_3_titles': [v.title for v in last_videos],
+        'avg_views': average_views,
+        'last_3_descriptions': [v.description for v in last_videos],
+        'country': channel.country or ''
+    }
+
+
+def classification_key(channel_id: str, about: str, channel_details: Dict[str, Any]) -> str:
+    """
+    Coalescing key for a classification: /search and /enrich build different prompts for
+    the same channel (other videos, other fields), so they only share a call when the
+    prompt inputs are identical.
+    """
+    inputs = json.dumps([about, channel_details], sort_keys=True, ensure_ascii=False, default=str)
+    return f"{channel_id}:{hashlib.sha256(inputs.encode('utf-8')).hexdigest()[:16]}"
@@ -0,0 +1,231 @@
+import os
+import re
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.services.contact_extraction import extract_contacts
+from app.services.discovery import classification_details, classification_key, content_fingerprint, load_analysis, save_analysis
+from app.services.llm_handler import LLMHandler
+from app.services.youtube_search import CHANNEL_BATCH_PARTS, YouTubeSearch
+from app.services.quota import QuotaExceeded
+from app.services.ranking import score_channel
+from app.services.records import ChannelRecord, ClassificationResult, DiscoveredChannel, VideoRecord
+from app.services.scrape_cache import canonical_channel_key
+from app.services import single_flight
+
+logger = logging.getLogger(__name__)
+
+# channels.list and videos.list take at most 50 IDs per call
+BATCH_SIZE = 50
+MAX_ENRICH_CHANNELS = int(os.getenv("ENRICH_MAX_CHANNELS", 5000))
+CHANNEL_ID_PATTERN = re.compile(r'^UC[\w-]{22}$')
+
+
+def parse_channel_ref(ref: str) -> Tuple[str, str]:
+    """
+    ('id', 'UC...') or ('handle', '@name') for a channel ID, @handle or channel URL.
+    Raises ValueError for anything else (legacy /c/ and /user/ URLs included).
+    """
+    value = ref.strip()
+    if CHANNEL_ID_PATTERN.match(value):
+        return 'id', value
+    key = canonical_channel_key(value)
+    if key.startswith('@') and len(key) > 1:
+        return 'handle', key
+    if key.startswith('channel/') and CHANNEL_ID_PATTERN.match(key.split('/', 1)[1]):
+        return 'id', key.split('/', 1)[1]
+    raise ValueError(f"not a channel ID, @handle or channel URL: {ref!r}")
+
+
+def _error_row(ref: str, error: str, channel_id: Optional[str] = None) -> Dict[str, Any]:
+    return {'input': ref, 'id': channel_id, 'error': error}
+
+
+def _merge(*groups: List[str]) -> List[str]:
+    merged: Dict[str, None] = {}
+    for group in groups:
+        for value in group:
+            if value:
+                merged[value] = None
+    return list(merged)
+
+
+async def enrich_channels(
+    refs: List[str],
+    youtube_service: YouTubeSearch,
+    llm_service: Optional[LLMHandler] = None,
+    classify: bool = False,
+    scrape: bool = False,
+    last_n: int = 3,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Enrich channel IDs, @handles or channel URLs without search.list, yielding one row per
+    input in input order: the ChannelDiscoveryResult fields plus `input`, `score` and
+    `error` (None, or why the input could not be enriched).
+
+    Inputs are processed 50 at a time: handles are resolved with channels.list forHandle,
+    then one channels.list call covers details and uploads playlists, one playlistItems.list
+    call per channel finds its last `last_n` uploads and videos.list fetches them 50 IDs per
+    call. Classification (Gemini) and About-page scraping are optional. Only one batch is in
+    memory at a time.
+    """
+    seen = set()
+    for start in range(0, len(refs), BATCH_SIZE):
+        rows = await _enrich_batch(refs[start:start + BATCH_SIZE], seen, youtube_service, llm_service, classify, scrape, last_n)
+        for row in rows:
+            yield row
+
+
+async def _enrich_batch(
+    refs: List[str],
+    seen: set,
+    youtube_service: YouTubeSearch,
+    llm_service: Optional[LLMHandler],
+    classify: bool,
+    scrape: bool,
+    last_n: int,
+) -> List[Dict[str, Any]]:
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(refs)
+    parsed: List[Optional[Tuple[str, str]]] = [None] * len(refs)
+    for i, ref in enumerate(refs):
+        try:
+            parsed[i] = parse_channel_ref(ref)
+        except ValueError as e:
+            rows[i] = _error_row(ref, str(e))
+
+    # Resolve handles concurrently (forHandle takes one handle per call)
+    handle_indexes = [i for i, p in enumerate(parsed) if p and p[0] == 'handle']
+    resolved = await asyncio.gather(
+        *(youtube_service.resolve_handle(parsed[i][1]) for i in handle_indexes), return_exceptions=True
+    )
+    channel_ids: List[Optional[str]] = [p[1] if p and p[0] == 'id' else None for p in parsed]
+    for i, outcome in zip(handle_indexes, resolved):
+        if isinstance(outcome, QuotaExceeded):
+            raise outcome
+        if isinstance(outcome, Exception):
+            rows[i] = _error_row(refs[i], f"handle lookup failed: {outcome}")
+        elif outcome is None:
+            rows[i] = _error_row(refs[i], 'not_found')
+        else:
+            channel_ids[i] = outcome
+
+    pending = []
+    for i, channel_id in enumerate(channel_ids):
+        if channel_id is None or rows[i] is not None:
+            continue
+        if channel_id in seen:
+            rows[i] = _error_row(refs[i], 'duplicate', channel_id)
+            continue
+        seen.add(channel_id)
+        pending.append(i)
+    if not pending:
+        return rows
+    try:
+        await _fill_rows(rows, refs, channel_ids, pending, youtube_service, llm_service, classify, scrape, last_n)
+    except QuotaExceeded:
+        raise
+    except Exception as e:
+        logger.exception("Enrichment batch failed: %s", e)
+        for i in pending:
+            if rows[i] is None:
+                rows[i] = _error_row(refs[i], f"enrichment failed: {e}", channel_ids[i])
+    return rows
+
+
+async def _fill_rows(
+    rows: List[Optional[Dict[str, Any]]],
+    refs: List[str],
+    channel_ids: List[Optional[str]],
+    pending: List[int],
+    youtube_service: YouTubeSearch,
+    llm_service: Optional[LLMHandler],
+    classify: bool,
+    scrape: bool,
+    last_n: int,
+):
+    channels = await youtube_service.get_channels_batch([channel_ids[i] for i in pending])
+    found = []
+    for i in pending:
+        if channel_ids[i] in channels:
+            found.append(i)
+        else:
+            rows[i] = _error_row(refs[i], 'not_found', channel_ids[i])
+
+    last_videos = await _last_videos(youtube_service, [channels[channel_ids[i]] for i in found], last_n)
+    results: Dict[int, DiscoveredChannel] = {}
+    for i in found:
+        channel, _ = channels[channel_ids[i]]
+        videos = last_videos.get(channel.channel_id, [])
+        average_views = float(sum(v.view_count for v in videos)) / len(videos) if videos else 0.0
+        results[i] = DiscoveredChannel(channel, extract_contacts(channel.description)['emails'], [], videos,
+                                       average_views, ClassificationResult())
+
+    if classify and llm_service is not None:
+        await asyncio.gather(*(_classify(llm_service, results[i]) for i in found))
+    scraped: Dict[str, Dict[str, Any]] = {}
+    if scrape:
+        items = [{'id': channel_ids[i], 'url': results[i].channel.url} for i in found]
+        for item in await youtube_service.extract_emails_and_links_from_urls(items):
+            scraped[item['id']] = item
+
+    for i in found:
+        result = results[i]
+        classification = result.classification
+        page = scraped.get(channel_ids[i], {})
+        result.emails = _merge(result.emails, [classification.email], [page.get('email')])
+        result.links = _merge(classification.contact_links, page.get('links') or [])
+        row = result.to_dict()
+        if not classify:
+            # Not classified is not the same as classified "no"
+            row.update(is_icp=None, high_ticket=None, potential_icp=None)
+        row.update(input=refs[i], score=score_channel(result), error=None)
+        rows[i] = row
+
+
+async def _last_videos(
+    youtube_service: YouTubeSearch, channels: List[Tuple[ChannelRecord, Optional[str]]], last_n: int
+) -> Dict[str, List[VideoRecord]]:
+    playlists = [(channel, uploads) for channel, uploads in channels if uploads]
+    outcomes = await asyncio.gather(
+        *(youtube_service.get_playlist_video_ids(uploads, last_n) for _, uploads in playlists), return_exceptions=True
+    )
+    video_ids: Dict[str, List[str]] = {}
+    for (channel, _), outcome in zip(playlists, outcomes):
+        if isinstance(outcome, QuotaExceeded):
+            raise outcome
+        if isinstance(outcome, Exception):
+            # A channel with no public uploads playlist (404) just has no recent videos
+            logger.warning("Could not list uploads for %s: %s", channel.channel_id, outcome)
+            continue
+        video_ids[channel.channel_id] = outcome
+
+    all_ids = [video_id for ids in video_ids.values() for video_id in ids]
+    videos: Dict[str, VideoRecord] = {}
+    for start in range(0, len(all_ids), BATCH_SIZE):
+        videos.update(await youtube_service.get_videos_batch(all_ids[start:start + BATCH_SIZE]))
+    return {
+        channel_id: [videos[v] for v in ids if v in videos]
+        for channel_id, ids in video_ids.items()
+    }
+
+
+async def _classify(llm_service: LLMHandler, result: DiscoveredChannel):
+    channel = result.channel
+    fingerprint = content_fingerprint(channel, result.last_videos)
+    previous = await load_analysis(channel.channel_id, CHANNEL_BATCH_PARTS, fingerprint)
+    if previous is not None:
+        result.classification = previous[1]
+        return
+    details = classification_details(channel, [], result.last_videos, result.average_views)
+    result.classification = await single_flight.channel_classification.do(
+        classification_key(channel.channel_id, channel.description, details),
+        lambda: llm_service.classify_channel(channel.description, details)
+    )
+    if not result.classification.failed:
+        await save_analysis(channel.channel_id, CHANNEL_BATCH_PARTS, fingerprint, result.average_views, result.classification)
+
+
+async def ndjson_rows(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield (json.dumps(row, ensure_ascii=False) + '\n').encode('utf-8')
@@ -0,0 +1,157 @@
+import os
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+
+class BoundedExecutor:
+    """
+    Thread pool for one class of blocking work (API I/O, browser scraping, parsing).
+    Tracks how many jobs are queued and running so saturation can be observed.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_queued = 0
+
+    def _run(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+        return result
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on this pool without blocking the event loop.
+        """
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        try:
+            # Run in a copy of the caller's context so the request's correlation ID follows the job
+            context = contextvars.copy_context()
+            future = self._executor.submit(partial(context.run, self._run, fn, *args, **kwargs))
+        except RuntimeError:
+            # Executor refused the job (e.g. shutting down); undo the queue accounting
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        # A job cancelled while still queued never reaches _run
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return queue depth and saturation for this pool.
+        Saturation is the fraction of workers busy; queue_depth counts jobs waiting for a worker.
+        """
+        with self._lock:
+            return {
+                'name': self.name,
+                'max_workers': self.max_workers,
+                'active': self._active,
+                'queue_depth': self._queued,
+                'peak_queue_depth': self._peak_queued,
+                'completed': self._completed,
+                'failed': self._failed,
+                'saturation': self._active / self.max_workers,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _pool_size(env_var: str, default: int) -> int:
+    try:
+        return int(os.getenv(env_var, default))
+    except ValueError:
+        return default
+
+
+# One pool per workload class so slow Chrome pages cannot starve fast API calls.
+# API_EXECUTOR_WORKERS: YouTube Data API / Gemini / captcha HTTP calls (I/O bound, many threads are cheap)
+# SCRAPER_EXECUTOR_WORKERS: Selenium page loads (each worker drives one Chrome instance)
+# CPU_EXECUTOR_WORKERS: parsing of large page sources and other CPU-bound work
+# STORE_EXECUTOR_WORKERS: shared-store and scrape-cache SQLite statements, which can wait
+#   up to the busy timeout for another worker process's write lock
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+_POOL_DEFAULTS = {
+    'api': ('API_EXECUTOR_WORKERS', 32),
+    'scraper': ('SCRAPER_EXECUTOR_WORKERS', 4),
+    'cpu': ('CPU_EXECUTOR_WORKERS', os.cpu_count() or 2),
+    'store': ('STORE_EXECUTOR_WORKERS', 4),
+}
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """
+    Return the shared executor for a workload class ('api', 'scraper', 'cpu' or 'store').
+    Executors are created on first use.
+    """
+    if name not in _POOL_DEFAULTS:
+        raise ValueError(f"Unknown executor '{name}'. Expected one of: {', '.join(_POOL_DEFAULTS)}")
+    with _executors_lock:
+        if name not in _executors:
+            env_var, default = _POOL_DEFAULTS[name]
+            _executors[name] = BoundedExecutor(name, _pool_size(env_var, default))
+        return _executors[name]
+
+
+async def run_api(fn: Callable, *args, **kwargs) -> Any:
+    return await get_executor('api').run(fn, *args, **kwargs)
+
+
+async def run_scraper(fn: Callable, *args, **kwargs) -> Any:
+    return await get_executor('scraper').run(fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    return await get_executor('cpu').run(fn, *args, **kwargs)
+
+
+async def run_store(fn: Callable, *args, **kwargs) -> Any:
+    return await get_executor('store').run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Queue depth and saturation for every executor that has been created.
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.stats() for executor in executors}
+
+
+def shutdown_executors(wait: bool = False):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List
+from app.services.records import DiscoveredChannel, NOT_AVAILABLE
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+# Number of videos flattened into video_N_* columns
+EXPORT_VIDEOS = 3
+LIST_SEPARATOR = '; '
+
+EXPORT_COLUMNS: List[str] = [
+    'id', 'channel_name', 'channel_url', 'subscriber_count', 'country', 'average_views',
+    'is_icp', 'emails', 'links', 'about',
+] + [
+    f'video_{i}_{field}'
+    for i in range(1, EXPORT_VIDEOS + 1)
+    for field in ('title', 'view_count', 'description')
+]
+
+
+def flatten_channel(result: DiscoveredChannel) -> Dict[str, Any]:
+    """
+    One flat row per channel: emails and links are joined with "; ",
+    last_3_videos becomes video_1_title, video_1_view_count, ... columns.
+    """
+    channel = result.channel
+    row = {
+        'id': channel.channel_id,
+        'channel_name': channel.name or NOT_AVAILABLE,
+        'channel_url': channel.url,
+        'subscriber_count': channel.subscriber_count,
+        'country': channel.country or NOT_AVAILABLE,
+        'average_views': result.average_views,
+        'is_icp': result.classification.is_icp,
+        'emails': LIST_SEPARATOR.join(result.emails),
+        'links': LIST_SEPARATOR.join(result.links),
+        'about': channel.description,
+    }
+    for i in range(EXPORT_VIDEOS):
+        video = result.last_videos[i] if i < len(result.last_videos) else None
+        row[f'video_{i + 1}_title'] = video.title if video else None
+        row[f'video_{i + 1}_view_count'] = video.view_count if video else None
+        row[f'video_{i + 1}_description'] = video.description if video else None
+    return row
+
+
+async def csv_chunks(results: AsyncIterator[DiscoveredChannel]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    yield buffer.getvalue().encode('utf-8')
+    async for result in results:
+        # Reuse one buffer; each row is sent as soon as its channel is ready
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(flatten_channel(result))
+        yield buffer.getvalue().encode('utf-8')
+
+
+async def ndjson_chunks(results: AsyncIterator[DiscoveredChannel]) -> AsyncIterator[bytes]:
+    async for result in results:
+        yield (json.dumps(flatten_channel(result), ensure_ascii=False) + '\n').encode('utf-8')
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Gzip a byte stream incrementally; only the compressor's window is held in memory.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(results: AsyncIterator[DiscoveredChannel], export_format: str, gzip: bool = False) -> AsyncIterator[bytes]:
+    """
+    Encode discovery results as CSV or NDJSON rows, optionally gzipped.
+    Rows are produced as results arrive, so memory use does not grow with the export size.
+    """
+    chunks = csv_chunks(results) if export_format == 'csv' else ndjson_chunks(results)
+    return gzip_chunks(chunks) if gzip else chunks
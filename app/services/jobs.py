@@ -0,0 +1,271 @@
+import os
+import logging
+import time
+import uuid
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from app.services.discovery import DiscoveryCheckpoint, discover_channels
+from app.services.keyword_scheduler import KeywordScheduler
+from app.services.llm_handler import LLMHandler
+from app.services.youtube_search import YouTubeSearch
+from app.services.quota import QuotaExceeded
+from app.services.records import ChannelRecord, ClassificationResult, DiscoveredChannel, VideoRecord
+from app.services.shared_store import SharedStore, get_shared_store
+from app.services.executors import run_store
+
+logger = logging.getLogger(__name__)
+
+JOB_NAMESPACE = 'jobs'
+# Per-channel stage results, keyword progress and ordered results: "<job_id>:..."
+CHECKPOINT_NAMESPACE = 'job_checkpoints'
+
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+JOB_TTL = float(os.getenv("JOB_TTL_SECONDS", 7 * 24 * 3600))
+# Attempts per unit of work (a search page or one channel stage) before the job fails
+JOB_UNIT_ATTEMPTS = int(os.getenv("JOB_UNIT_ATTEMPTS", 3))
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", 1.0))
+# A running job with no checkpoint for this long is treated as orphaned (e.g. its worker restarted)
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", 300))
+# The job record is rewritten at most this often while nothing new is found
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", 10))
+
+# Stage name -> (encode, decode) between records and their checkpointed JSON form
+STAGE_CODECS = {
+    'channel': (lambda c: c.to_state(), ChannelRecord.from_state),
+    'last_videos': (lambda vs: [v.to_state() for v in vs], lambda s: [VideoRecord.from_state(v) for v in s]),
+    'classification': (lambda c: c.to_state(), ClassificationResult.from_state),
+}
+
+
+class JobLeaseLost(Exception):
+    """
+    The job's run lease expired and another worker may have taken the job over.
+    """
+
+
+def job_lease_name(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+class JobCheckpoint(DiscoveryCheckpoint):
+    """
+    Persists a job's progress in the shared store as it runs: keyword page tokens,
+    each channel's stage results, finished channels and the ordered results.
+    Resuming a job replays it against this state, so finished work is not repeated.
+
+    The job record itself is rewritten when a result is found and otherwise at most
+    every JOB_HEARTBEAT_SECONDS; each rewrite also renews the job's run lease.
+    """
+
+    def __init__(self, store: SharedStore, job: Dict[str, Any], lease_id: Optional[str] = None):
+        super().__init__()
+        self.store = store
+        self.job = job
+        self.job_id = job['id']
+        self.lease_id = lease_id
+
+    def _key(self, *parts: str) -> str:
+        return ':'.join((self.job_id,) + parts)
+
+    async def _touch(self, force: bool = False):
+        now = time.time()
+        if not force and now - (self.job['heartbeat_at'] or 0) < JOB_HEARTBEAT_SECONDS:
+            return
+        if self.lease_id is not None and not await run_store(
+            self.store.renew_lease, job_lease_name(self.job_id), self.lease_id, JOB_STALE_SECONDS
+        ):
+            raise JobLeaseLost(f"Job {self.job_id} lost its run lease")
+        self.job['heartbeat_at'] = now
+        await save_job(self.job, self.store)
+
+    def found_count(self) -> int:
+        return self.job['found']
+
+    async def keyword_progress(self, keyword: str) -> Optional[Dict[str, Any]]:
+        return await run_store(self.store.get, CHECKPOINT_NAMESPACE, self._key('keyword', keyword))
+
+    async def save_keyword_progress(self, keyword: str, progress: Dict[str, Any]):
+        await run_store(self.store.set, CHECKPOINT_NAMESPACE, self._key('keyword', keyword), progress, ttl=JOB_TTL)
+        await self._touch()
+
+    async def is_done(self, channel_id: str) -> bool:
+        return await run_store(self.store.get, CHECKPOINT_NAMESPACE, self._key('channel', channel_id, 'done'), False)
+
+    async def mark_done(self, channel_id: str, result: Optional[DiscoveredChannel]):
+        if result is not None:
+            # Zero-padded sequence keeps results in discovery order under a key scan
+            key = self._key('result', f"{self.job['found']:09d}")
+            await run_store(self.store.set, CHECKPOINT_NAMESPACE, key, result.to_state(), ttl=JOB_TTL)
+            self.job['found'] += 1
+        await run_store(self.store.set, CHECKPOINT_NAMESPACE, self._key('channel', channel_id, 'done'), True, ttl=JOB_TTL)
+        # `found` numbers the result keys, so it is saved as soon as it changes
+        await self._touch(force=result is not None)
+
+    async def load_stage(self, channel_id: str, stage: str) -> Any:
+        state = await run_store(self.store.get, CHECKPOINT_NAMESPACE, self._key('channel', channel_id, stage))
+        return None if state is None else STAGE_CODECS[stage][1](state)
+
+    async def save_stage(self, channel_id: str, stage: str, value: Any):
+        await run_store(self.store.set, CHECKPOINT_NAMESPACE, self._key('channel', channel_id, stage),
+                        STAGE_CODECS[stage][0](value), ttl=JOB_TTL)
+
+    async def run_unit(self, fn: Callable[[], Awaitable[Any]], retry_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Retry a failed unit with exponential backoff so a transient YouTube or Gemini
+        error costs one unit, not the sweep. Quota exhaustion is not retried.
+        """
+        for attempt in range(JOB_UNIT_ATTEMPTS):
+            last_attempt = attempt == JOB_UNIT_ATTEMPTS - 1
+            try:
+                value = await fn()
+            except QuotaExceeded:
+                raise
+            except Exception as e:
+                if last_attempt:
+                    raise
+                logger.warning("Retrying job unit after error: %s", e, extra={"job_id": self.job_id, "attempt": attempt + 1})
+            else:
+                if last_attempt or not (retry_if and retry_if(value)):
+                    return value
+                logger.warning("Retrying job unit with unusable result", extra={"job_id": self.job_id, "attempt": attempt + 1})
+            self.job['retries'] += 1
+            await asyncio.sleep(JOB_RETRY_BACKOFF * (2 ** attempt))
+
+
+async def save_job(job: Dict[str, Any], store: Optional[SharedStore] = None):
+    job['updated_at'] = time.time()
+    # A snapshot, so the store thread never serializes a dict the loop is changing
+    await run_store((store or get_shared_store()).set, JOB_NAMESPACE, job['id'], dict(job), ttl=JOB_TTL)
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return await run_store(get_shared_store().get, JOB_NAMESPACE, job_id)
+
+
+async def create_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a discovery job for SearchQuery-shaped `params` (query, min_subscribers, country_code, limit).
+    """
+    now = time.time()
+    job = {
+        'id': uuid.uuid4().hex,
+        'status': PENDING,
+        'params': params,
+        'related_keywords': None,
+        'keyword_stats': None,
+        'found': 0,
+        'retries': 0,
+        'runs': 0,
+        'error': None,
+        'created_at': now,
+        'updated_at': now,
+        'heartbeat_at': None,
+    }
+    await save_job(job)
+    return job
+
+
+def is_resumable(job: Dict[str, Any]) -> bool:
+    if job['status'] in (PENDING, FAILED):
+        return True
+    # A job left "running" by a worker that died stops sending heartbeats
+    return job['status'] == RUNNING and time.time() - (job['heartbeat_at'] or 0) > JOB_STALE_SECONDS
+
+
+async def job_results(job_id: str) -> AsyncIterator[DiscoveredChannel]:
+    """
+    Stream a job's results in discovery order, a batch of store rows at a time.
+    """
+    store = get_shared_store()
+    prefix = f"{job_id}:result:"
+    after = None
+    while True:
+        rows = await run_store(store.scan, CHECKPOINT_NAMESPACE, prefix, after=after)
+        if not rows:
+            return
+        for key, state in rows:
+            yield DiscoveredChannel.from_state(state)
+        after = rows[-1][0]
+
+
+async def run_job(job_id: str, llm_service: LLMHandler, youtube_service: YouTubeSearch, lease_id: Optional[str] = None):
+    """
+    Run a job to completion or failure. `lease_id` is the job's run lease (see start_job),
+    released when the run ends.
+    """
+    store = get_shared_store()
+    try:
+        await _run_job(store, job_id, llm_service, youtube_service, lease_id)
+    finally:
+        if lease_id is not None:
+            await run_store(store.release_lease, job_lease_name(job_id), lease_id)
+
+
+async def _run_job(store: SharedStore, job_id: str, llm_service: LLMHandler, youtube_service: YouTubeSearch, lease_id: Optional[str]):
+    job = await get_job(job_id)
+    if job is None:
+        # Expired (JOB_TTL_SECONDS) between the request and the start of the run
+        logger.warning("Job not found; not running it", extra={"job_id": job_id})
+        return
+    job['status'] = RUNNING
+    job['runs'] += 1
+    job['error'] = None
+    job['heartbeat_at'] = time.time()
+    await save_job(job, store)
+    checkpoint = JobCheckpoint(store, job, lease_id)
+    params = job['params']
+    scheduler = None
+    try:
+        if job['related_keywords'] is None:
+            job['related_keywords'] = await checkpoint.run_unit(lambda: llm_service.generate_synonyms(params['query']))
+            await save_job(job, store)
+        scheduler = KeywordScheduler(job['related_keywords'])
+        async for _ in discover_channels(
+            job['related_keywords'],
+            llm_service,
+            youtube_service,
+            min_subscribers=params.get('min_subscribers'),
+            country_code=params.get('country_code'),
+            limit=params.get('limit'),
+            checkpoint=checkpoint,
+            scheduler=scheduler,
+        ):
+            pass
+        job['status'] = COMPLETED
+    except JobLeaseLost:
+        # Another worker may own the job now; leave its record alone
+        logger.warning("Job lost its run lease; stopping", extra={"job_id": job_id})
+        return
+    except Exception as e:
+        logger.exception("Job failed: %s", e, extra={"job_id": job_id})
+        job['status'] = FAILED
+        job['error'] = str(e)
+    if scheduler is not None:
+        job['keyword_stats'] = scheduler.keyword_stats()
+    await save_job(job, store)
+
+
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+async def start_job(job_id: str, llm_service: LLMHandler, youtube_service: YouTubeSearch) -> bool:
+    """
+    Run (or resume) a job in the background in this worker. Returns False if it is
+    already running, here or in another worker: a run holds the job's store lease
+    (renewed with each heartbeat, expiring after JOB_STALE_SECONDS), so two workers
+    resuming the same stale job cannot both write its checkpoints.
+    """
+    task = _tasks.get(job_id)
+    if task is not None and not task.done():
+        return False
+    lease_id = await run_store(get_shared_store().acquire_lease, job_lease_name(job_id), 1, JOB_STALE_SECONDS)
+    if lease_id is None:
+        return False
+    task = asyncio.ensure_future(run_job(job_id, llm_service, youtube_service, lease_id))
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(job_id, None))
+    return True
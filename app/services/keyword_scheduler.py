@@ -0,0 +1,150 @@
+import os
+import math
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A keyword whose pages are mostly channels already found through other keywords is
+# retired once it has returned at least KEYWORD_MIN_SAMPLE channels
+KEYWORD_RETIRE_YIELD = float(os.getenv("KEYWORD_RETIRE_YIELD", 0.3))
+KEYWORD_MIN_SAMPLE = int(os.getenv("KEYWORD_MIN_SAMPLE", 5))
+# search.list returns at most 50 results per page
+PAGE_SIZE = 50
+
+
+class KeywordStats:
+    """
+    Paging state and new-channel yield of one expanded keyword. `new_ids` are the
+    channels this keyword found first, kept so a resumed run knows they were seen.
+    """
+
+    __slots__ = ('keyword', 'page_token', 'pages', 'fetched', 'new', 'new_ids', 'done', 'retired')
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.page_token: Optional[str] = None
+        self.pages = 0
+        self.fetched = 0
+        self.new = 0
+        self.new_ids: List[str] = []
+        self.done = False
+        self.retired = False
+
+    def yield_rate(self) -> Optional[float]:
+        return self.new / self.fetched if self.fetched else None
+
+    def smoothed_yield(self) -> float:
+        # Laplace smoothing so a keyword with one lucky result does not outrank a proven one
+        return (self.new + 1) / (self.fetched + 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        rate = self.yield_rate()
+        return {
+            'keyword': self.keyword,
+            'pages': self.pages,
+            'channels': self.fetched,
+            'new_channels': self.new,
+            'yield': round(rate, 3) if rate is not None else None,
+            'retired': self.retired,
+            'exhausted': self.done,
+        }
+
+
+class KeywordScheduler:
+    """
+    Decides which expanded keyword's next search.list page to fetch.
+
+    Synonyms often return the same channels, so each page is scored by how many of
+    its channels are new across all keywords. Keywords are paged in order, each up to
+    its share of the budget (ceil(per_keyword / 50) pages, as plain per-keyword paging
+    would use) or until it has found `per_keyword` new channels. A keyword whose yield
+    falls below KEYWORD_RETIRE_YIELD is retired early; the pages retired and exhausted
+    keywords leave unused then go to the highest-yield keywords still active.
+    """
+
+    def __init__(self, keywords: List[str], retire_yield: float = KEYWORD_RETIRE_YIELD,
+                 min_sample: int = KEYWORD_MIN_SAMPLE):
+        # Synonym lists sometimes repeat a keyword; page it once
+        self.keywords = {keyword: KeywordStats(keyword) for keyword in dict.fromkeys(keywords)}
+        self.retire_yield = retire_yield
+        self.min_sample = min_sample
+        self.per_keyword = 0
+        self.pages_per_keyword = 0
+        self.page_budget = 0
+        self.pages_used = 0
+        self.seen = set()
+
+    def start(self, per_keyword: int):
+        self.per_keyword = per_keyword
+        self.pages_per_keyword = math.ceil(per_keyword / PAGE_SIZE)
+        self.page_budget = len(self.keywords) * self.pages_per_keyword
+
+    def restore(self, keyword: str, progress: Dict[str, Any]):
+        """
+        Continue from checkpointed progress ({'page_token', 'fetched', 'new', 'new_ids',
+        'pages', 'done', 'retired'}). Channels other keywords already found stay seen, so
+        they are not counted as new again.
+        """
+        stats = self.keywords[keyword]
+        stats.page_token = progress.get('page_token')
+        stats.fetched = progress.get('fetched', 0)
+        stats.new = progress.get('new', stats.fetched)
+        stats.new_ids = list(progress.get('new_ids', []))
+        self.seen.update(stats.new_ids)
+        stats.pages = progress.get('pages', math.ceil(stats.fetched / PAGE_SIZE))
+        stats.done = progress.get('done', False)
+        stats.retired = progress.get('retired', False)
+        self.pages_used += stats.pages
+
+    def progress(self, keyword: str) -> Dict[str, Any]:
+        stats = self.keywords[keyword]
+        return {
+            'page_token': stats.page_token, 'fetched': stats.fetched, 'new': stats.new,
+            'new_ids': list(stats.new_ids), 'pages': stats.pages, 'done': stats.done, 'retired': stats.retired,
+        }
+
+    def next_keyword(self) -> Optional[str]:
+        """
+        The keyword whose next page to fetch, or None when the budget is spent or no keyword is left.
+        """
+        if self.pages_used >= self.page_budget:
+            return None
+        active = [s for s in self.keywords.values() if not s.done and not s.retired]
+        for stats in active:
+            if stats.pages < self.pages_per_keyword and stats.new < self.per_keyword:
+                return stats.keyword
+        if not active:
+            return None
+        return max(active, key=lambda s: s.smoothed_yield()).keyword
+
+    def page_size(self, keyword: str) -> int:
+        stats = self.keywords[keyword]
+        remaining = self.per_keyword - stats.new
+        return min(PAGE_SIZE, remaining if remaining > 0 else self.per_keyword)
+
+    def record_page(self, keyword: str, channel_ids: List[str], next_page_token: Optional[str]) -> List[str]:
+        """
+        Account for one fetched page and return its channels not seen through any keyword yet.
+        """
+        stats = self.keywords[keyword]
+        stats.pages += 1
+        self.pages_used += 1
+        new_ids = []
+        for channel_id in channel_ids:
+            stats.fetched += 1
+            if channel_id not in self.seen:
+                self.seen.add(channel_id)
+                new_ids.append(channel_id)
+        stats.new += len(new_ids)
+        stats.new_ids.extend(new_ids)
+        stats.page_token = next_page_token
+        stats.done = not next_page_token or not channel_ids
+        rate = stats.yield_rate()
+        if not stats.done and stats.fetched >= self.min_sample and rate is not None and rate < self.retire_yield:
+            stats.retired = True
+            logger.info("Retiring low-yield keyword", extra={"keyword": keyword, "yield": round(rate, 3)})
+        return new_ids
+
+    def keyword_stats(self) -> List[Dict[str, Any]]:
+        return [stats.to_dict() for stats in self.keywords.values()]
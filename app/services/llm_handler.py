@@ -1,18 +1,38 @@
-import google.generativeai as genai
 import os
+import logging
 from typing import List
 from dotenv import load_dotenv
 import json
 import re
+from app.services.executors import run_api
+from app.services.metrics import metrics
+from app.services.prompt_compaction import compact_classification_input, estimate_tokens, input_tokens
+from app.services.records import ClassificationResult
+from app.services.shared_store import SharedSemaphore
+from app.services.startup import lazy_import
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Gemini calls in flight across all worker processes
+llm_slots = SharedSemaphore("llm", int(os.getenv("LLM_MAX_CONCURRENCY", 8)))
+# Expanded keywords searched per query (up to the 5 Gemini returns). Each one costs its
+# own search.list pages (100 quota units each), so only the first is searched by default
+SEARCH_KEYWORDS = min(5, max(1, int(os.getenv("SEARCH_KEYWORDS", 1))))
+
 
 class LLMHandler:
-    def __init__(self):
+    def __init__(self, model=None):
+        # A pre-built model (e.g. a recorded stand-in for benchmarks) skips Gemini setup
+        if model is not None:
+            self.model = model
+            return
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is not set")
+        # Loaded on first use so workers that never classify skip the Gemini SDK
+        genai = lazy_import("google.generativeai")
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel("gemini-2.5-pro")
 
@@ -20,6 +40,10 @@ class LLMHandler:
         """
         Generate related keywords/phrases using Gemini's model.
         """
+        with metrics.span('synonym_generation'):
+            return await self._generate_synonyms(query)
+
+    async def _generate_synonyms(self, query: str) -> List[str]:
         try:
             prompt = (
                 "Generate 5 related search terms or phrases for YouTube content discovery.\n"
@@ -30,9 +54,11 @@ class LLMHandler:
                 "- Keep each term concise (2-4 words)\n"
                 "- Return only the 5 terms, one per line"
             )
-            response = self.model.generate_content(prompt)
+            # Gemini calls block, so keep them off the event loop on the API pool
+            async with llm_slots.slot():
+                response = await run_api(self.model.generate_content, prompt)
             related_terms = response.text.strip().split("\n")
-            related_terms = [term.strip() for term in related_terms if term.strip()][:1]
+            related_terms = [term.strip() for term in related_terms if term.strip()][:SEARCH_KEYWORDS]
             return related_terms
         except Exception as e:
             raise Exception(f"Error generating synonyms: {str(e)}")
@@ -42,7 +68,31 @@ class LLMHandler:
         Extract email addresses and useful contact links from a channel description using Gemini.
         Returns a dict with 'email', 'contact_links', and 'isicp'.
         """
+        with metrics.span('llm_classification') as span:
+            contact_info = await self._extract_contact_info(description, channel_details)
+            if contact_info.get('error'):
+                span.error()
+                del contact_info['error']
+            return contact_info
+
+    async def classify_channel(self, description: str, channel_details: dict) -> ClassificationResult:
+        """
+        extract_contact_info normalised into a ClassificationResult; failed calls are flagged
+        rather than looking like a "not ICP" answer.
+        """
+        with metrics.span('llm_classification') as span:
+            contact_info = await self._extract_contact_info(description, channel_details)
+            failed = bool(contact_info.pop('error', False))
+            if failed:
+                span.error()
+        return ClassificationResult.from_llm(contact_info, failed=failed)
+
+    async def _extract_contact_info(self, description: str, channel_details: dict) -> dict:
         try:
+            raw_tokens = input_tokens(description, channel_details)
+            # Dedupe and strip boilerplate, then fit each field to its token budget
+            description, channel_details = compact_classification_input(description, channel_details)
+            saved_tokens = raw_tokens - input_tokens(description, channel_details)
             # Build a formatted string from channel_details
             channel_name = channel_details.get('channel_name', '')
             sub_count = channel_details.get('sub_count', '')
@@ -111,7 +161,12 @@ class LLMHandler:
                 "Here is the channel data:\n"
                 f"{channel_data_str}"
             )
-            response = self.model.generate_content(prompt)
+            prompt_tokens = estimate_tokens(prompt)
+            metrics.increment("llm_prompt_tokens", prompt_tokens)
+            logger.debug("Classification prompt built", extra={"channel_name": channel_name, "prompt_tokens": prompt_tokens,
+                                                                "tokens_saved": saved_tokens})
+            async with llm_slots.slot():
+                response = await run_api(self.model.generate_content, prompt)
             result = response.text.strip()
             # Remove Markdown code block (```json ... ```)
       
@@ -139,11 +194,11 @@ class LLMHandler:
                     contact_info.setdefault(key, value)
                 return contact_info
             except Exception as e:
-                print(f"Error in extract_contact_info: {str(e)}")
-                return {"email": "", "contact_links": [], "isicp": False}
+                logger.warning("Could not parse classification response: %s", e)
+                return {"email": "", "contact_links": [], "isicp": False, "error": True}
         except Exception as e:
-            print(f"Error in extract_contact_info: {str(e)}")
-            return {"email": "", "contact_links": [], "isicp": False}
+            logger.warning("Error in extract_contact_info: %s", e)
+            return {"email": "", "contact_links": [], "isicp": False, "error": True}
 
     async def __del__(self):
         if hasattr(self, "client") and hasattr(self.client, "aclose"):
@@ -0,0 +1,143 @@
+import os
+import sys
+import copy
+import json
+import queue
+import random
+import atexit
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Correlation ID of the request (or background job) being handled; set by the
+# X-Request-ID middleware and copied into worker-pool threads with the context
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not extra fields
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "sample"}
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps each record with the current correlation ID. Runs on the calling
+    thread, before the record is handed to the queue.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of records below WARNING: `sample` passed in `extra`, else `rate`.
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = getattr(record, "sample", self.rate)
+        return rate >= 1 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, request_id and any `extra` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Human-readable lines for local runs; `extra` fields are appended as key=value.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [f"{key}={json.dumps(value, default=str)}" for key, value in record.__dict__.items()
+                  if key not in _STANDARD_ATTRS and not key.startswith("_")]
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            fields.insert(0, f"request_id={request_id}")
+        return f"{line} {' '.join(fields)}" if fields else line
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues a copy of each record with only its message rendered. The stock
+    QueueHandler formats the whole record on the calling thread and drops
+    exc_info, which would put tracebacks inside `message`; here the listener's
+    formatter does that work and still sees the exception.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Args may be mutated once the logging call returns, so merge them now
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging():
+    """
+    Route the "app" loggers through a queue to a stdout handler on a listener thread,
+    so formatting (apart from merging the message args) and writes happen off the event loop.
+    LOG_LEVEL (default INFO), LOG_FORMAT (json or text, default json) and
+    LOG_SAMPLE_RATE (fraction of DEBUG/INFO records kept, default 1) configure it.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        stream.setFormatter(TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        stream.setFormatter(JsonFormatter())
+
+    handler = RecordQueueHandler(queue.SimpleQueue())
+    handler.addFilter(SamplingFilter(float(os.getenv("LOG_SAMPLE_RATE", 1.0))))
+    handler.addFilter(RequestIdFilter())
+
+    logger = logging.getLogger("app")
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    Flush queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
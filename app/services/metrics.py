@@ -0,0 +1,200 @@
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# YouTube Data API quota cost per call
+QUOTA_COSTS = {
+    'search.list': 100,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'videos.list': 1,
+}
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class StageStats:
+    """
+    Counters and a latency histogram for one pipeline stage.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.quota_units = 0
+        self.cache_hits = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, seconds: float):
+        self.calls += 1
+        self.total_seconds += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+class RequestTimings:
+    """
+    Per-request breakdown of time spent in each stage, rendered as a Server-Timing header.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, seconds: float):
+        entry = self.stages.setdefault(stage, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def server_timing_header(self) -> str:
+        parts = [
+            f'{stage};dur={total * 1000:.1f};desc="calls={count}"'
+            for stage, (count, total) in self.stages.items()
+        ]
+        parts.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.1f}')
+        return ', '.join(parts)
+
+
+_current_request: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+class Span:
+    """
+    Handle yielded by `MetricsRegistry.span`; lets the caller record outcomes the
+    surrounding code swallows instead of raising.
+    """
+
+    def __init__(self, registry: 'MetricsRegistry', stage: str):
+        self._registry = registry
+        self.stage = stage
+        self.failed = False
+
+    def error(self):
+        self.failed = True
+
+    def add_quota(self, units: int):
+        self._registry.add_quota(self.stage, units)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+        self._counters: Dict[str, float] = {}
+
+    def _stage(self, stage: str) -> StageStats:
+        stats = self._stages.get(stage)
+        if stats is None:
+            stats = self._stages[stage] = StageStats()
+        return stats
+
+    @contextmanager
+    def span(self, stage: str, quota_units: int = 0):
+        """
+        Time a block of work as one call of `stage`, counting quota units and errors.
+        """
+        span = Span(self, stage)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats = self._stage(stage)
+                stats.observe(elapsed)
+                stats.quota_units += quota_units
+                if span.failed:
+                    stats.errors += 1
+            timings = _current_request.get()
+            if timings is not None:
+                timings.add(stage, elapsed)
+
+    def add_quota(self, stage: str, units: int):
+        with self._lock:
+            self._stage(stage).quota_units += units
+
+    def record_cache_hit(self, stage: str):
+        with self._lock:
+            self._stage(stage).cache_hits += 1
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'quota_units': stats.quota_units,
+                    'cache_hits': stats.cache_hits,
+                    'total_seconds': stats.total_seconds,
+                }
+                for stage, stats in self._stages.items()
+            }
+
+    def render_prometheus(self, gauges: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+        """
+        Render all stage metrics in the Prometheus text exposition format.
+        `gauges` maps a metric name to {label_value: value} for point-in-time values
+        such as executor queue depth.
+        """
+        lines = []
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+
+            lines.append('# HELP discovery_stage_duration_seconds Time spent in each pipeline stage.')
+            lines.append('# TYPE discovery_stage_duration_seconds histogram')
+            for stage, stats in stages:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    cumulative += count
+                    lines.append(f'discovery_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'discovery_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.calls}')
+                lines.append(f'discovery_stage_duration_seconds_sum{{stage="{stage}"}} {stats.total_seconds:.6f}')
+                lines.append(f'discovery_stage_duration_seconds_count{{stage="{stage}"}} {stats.calls}')
+
+            for metric, attr, help_text in (
+                ('discovery_stage_calls_total', 'calls', 'Calls made per pipeline stage.'),
+                ('discovery_stage_errors_total', 'errors', 'Failed calls per pipeline stage.'),
+                ('discovery_stage_quota_units_total', 'quota_units', 'YouTube Data API quota units spent per stage.'),
+                ('discovery_stage_cache_hits_total', 'cache_hits', 'Calls served from a cache or a shared in-flight call.'),
+            ):
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} counter')
+                for stage, stats in stages:
+                    lines.append(f'{metric}{{stage="{stage}"}} {getattr(stats, attr)}')
+
+        for name, value in counters:
+            lines.append(f'# TYPE discovery_{name}_total counter')
+            lines.append(f'discovery_{name}_total {value}')
+
+        for name, values in sorted((gauges or {}).items()):
+            lines.append(f'# TYPE {name} gauge')
+            for label, value in sorted(values.items()):
+                lines.append(f'{name}{{{label}}} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Begin collecting a per-request stage breakdown for the current context.
+    """
+    timings = RequestTimings()
+    _current_request.set(timings)
+    return timings
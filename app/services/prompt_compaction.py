@@ -0,0 +1,157 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+from app.services.contact_extraction import EMAIL_PATTERN, URL_PATTERN
+
+# Rough Gemini tokenisation for English text with URLs: ~4 characters per token
+CHARS_PER_TOKEN = 4
+
+# Per-field token budgets for the ICP classification prompt
+ABOUT_TOKEN_BUDGET = int(os.getenv("PROMPT_ABOUT_TOKENS", 400))
+VIDEO_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("PROMPT_VIDEO_DESCRIPTION_TOKENS", 150))
+LINKS_TOKEN_BUDGET = int(os.getenv("PROMPT_LINKS_TOKENS", 150))
+
+# Chapter lists: "0:00 Intro", "(12:34) - Part 2", "1:02:03 Outro"
+TIMESTAMP_LINE = re.compile(r'^\s*[\[(]?(?:\d{1,2}:)?\d{1,2}:\d{2}[\])]?(?:\s|[-–—:|.]|$)')
+HASHTAG_LINE = re.compile(r'^\s*(?:#\w+\s*)+$')
+# Affiliate and promo boilerplate. These lines are summarised rather than dropped,
+# because sponsorships are a high-ticket signal for the classifier.
+AFFILIATE_LINE = re.compile(
+    r'affiliate|commission|amzn\.to|amazon\.com/shop|promo code|discount code|use code|coupon'
+    r'|\b\d{1,2}% off\b|#ad\b|sponsored by|as an amazon associate|gear i use|my gear|links? below',
+    re.IGNORECASE,
+)
+# Lines the classifier needs most: contact details and business/sponsor mentions
+PRIORITY_LINE = re.compile(r'business|contact|inquir|enquir|sponsor|partnership|booking|patreon|email|e-mail', re.IGNORECASE)
+TRUNCATION_MARK = ' …'
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def input_tokens(description: str, channel_details: Dict[str, Any]) -> int:
+    """
+    Estimated tokens of the fields compaction works on.
+    """
+    fields = [description or '', channel_details.get('about', '') or '']
+    fields += channel_details.get('links', []) or []
+    fields += channel_details.get('last_3_descriptions', []) or []
+    return sum(estimate_tokens(f) for f in fields)
+
+
+def _normalise(line: str) -> str:
+    return ' '.join(line.lower().split())
+
+
+def _domain(url: str) -> str:
+    try:
+        host = urlparse(url).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def _fit(lines: List[str], budget_tokens: int) -> List[str]:
+    """
+    Keep priority lines (emails, contact and sponsor mentions) first, then the
+    remaining lines in order, until the budget is spent; original order is preserved.
+    """
+    budget = budget_tokens * CHARS_PER_TOKEN
+    if sum(len(line) + 1 for line in lines) <= budget:
+        return lines
+    priority = [i for i, line in enumerate(lines) if EMAIL_PATTERN.search(line) or PRIORITY_LINE.search(line)]
+    priority_set = set(priority)
+    rest = [i for i in range(len(lines)) if i not in priority_set]
+    kept: Dict[int, str] = {}
+    for i in priority + rest:
+        line = lines[i]
+        if len(line) + 1 <= budget:
+            kept[i] = line
+            budget -= len(line) + 1
+        elif budget > 40:
+            # Cut the first line that no longer fits at a word boundary, then stop
+            cut = line[:budget - len(TRUNCATION_MARK)].rsplit(' ', 1)[0]
+            kept[i] = cut + TRUNCATION_MARK
+            break
+        else:
+            break
+    return [kept[i] for i in sorted(kept)]
+
+
+def compact_text(text: str, budget_tokens: int, seen_lines: Optional[Set[str]] = None,
+                 seen_links: Optional[Set[str]] = None) -> str:
+    """
+    Shrink a free-text field for the prompt: drop timestamp/chapter lists, hashtag-only
+    lines, repeated lines and repeated links, collapse affiliate/promo lines into one
+    summary line, and fit what is left into `budget_tokens`.
+    `seen_lines` / `seen_links` can be shared across fields so text repeated between
+    the About section and video descriptions is sent once.
+    """
+    if not text:
+        return ''
+    seen_lines = set() if seen_lines is None else seen_lines
+    seen_links = set() if seen_links is None else seen_links
+    lines: List[str] = []
+    affiliate_domains: Dict[str, None] = {}
+    affiliate_lines = 0
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or TIMESTAMP_LINE.match(line) or HASHTAG_LINE.match(line):
+            continue
+        key = _normalise(line)
+        if key in seen_lines:
+            continue
+        seen_lines.add(key)
+        if AFFILIATE_LINE.search(line) and not EMAIL_PATTERN.search(line):
+            affiliate_lines += 1
+            for url in URL_PATTERN.findall(line):
+                affiliate_domains[_domain(url)] = None
+            continue
+        urls = URL_PATTERN.findall(line)
+        if urls:
+            new_urls = [u for u in urls if u not in seen_links]
+            seen_links.update(urls)
+            if not new_urls and not URL_PATTERN.sub('', line).strip(' :-–—|'):
+                # The line is only links that were already sent
+                continue
+        lines.append(line)
+    if affiliate_lines:
+        domains = ', '.join(d for d in affiliate_domains if d)
+        # Worded to match PRIORITY_LINE so truncation keeps the sponsor signal
+        lines.append(f"[{affiliate_lines} sponsor/affiliate lines removed{': ' + domains if domains else ''}]")
+    return '\n'.join(_fit(lines, budget_tokens))
+
+
+def compact_links(links: List[str], budget_tokens: int, seen_links: Optional[Set[str]] = None) -> List[str]:
+    seen_links = set() if seen_links is None else seen_links
+    unique = []
+    for link in links:
+        if link not in seen_links:
+            seen_links.add(link)
+            unique.append(link)
+    return _fit(unique, budget_tokens)
+
+
+def compact_classification_input(description: str, channel_details: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Compacted copies of extract_contact_info's inputs. The About text goes first so
+    lines and links it shares with the video descriptions are kept there only.
+    """
+    seen_lines: Set[str] = set()
+    seen_links: Set[str] = set()
+    details = dict(channel_details)
+    about = channel_details.get('about', '') or ''
+    details['about'] = compact_text(about, ABOUT_TOKEN_BUDGET, seen_lines, seen_links)
+    details['links'] = compact_links(channel_details.get('links', []) or [], LINKS_TOKEN_BUDGET, seen_links)
+    details['last_3_descriptions'] = [
+        compact_text(d, VIDEO_DESCRIPTION_TOKEN_BUDGET, seen_lines, seen_links)
+        for d in channel_details.get('last_3_descriptions', []) or []
+    ]
+    # The description is usually the About text again; send it once
+    if description and description != about:
+        description = compact_text(description, ABOUT_TOKEN_BUDGET, seen_lines, seen_links)
+    else:
+        description = '(same as About)' if description else ''
+    return description, details
@@ -0,0 +1,204 @@
+import os
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Latency EWMA weight for the newest observation
+LATENCY_ALPHA = 0.3
+# Consecutive failures (errors or captchas) before a proxy is cooled down
+MAX_CONSECUTIVE_FAILURES = 3
+# Cooldowns double each time, up to this many, after which the proxy is evicted
+MAX_COOLDOWNS = 5
+
+
+class ProxyStats:
+    """
+    Health record for one proxy: success rate, latency EWMA, captcha rate and cooldown state.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self.successes = 0
+        self.failures = 0
+        self.captchas = 0
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.cooldowns = 0
+        self.cooldown_until = 0.0
+        self.in_use = 0
+        self.evicted = False
+
+    @property
+    def server(self) -> str:
+        """
+        Value for Chrome's --proxy-server flag.
+        """
+        return self.address if "://" in self.address else f"http://{self.address}"
+
+    @property
+    def requests(self) -> int:
+        return self.successes + self.failures
+
+    def score(self) -> float:
+        """
+        Higher is better. Smoothed success rate and captcha rate (Laplace prior so new
+        proxies get tried) divided by latency, so fast clean proxies are favoured.
+        """
+        success_rate = (self.successes + 1) / (self.requests + 2)
+        captcha_rate = (self.captchas + 0.5) / (self.requests + 2)
+        latency = self.latency_ewma if self.latency_ewma is not None else 5.0
+        return success_rate * (1 - captcha_rate) / max(latency, 0.1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'proxy': self.address,
+            'successes': self.successes,
+            'failures': self.failures,
+            'captchas': self.captchas,
+            'success_rate': self.successes / self.requests if self.requests else None,
+            'captcha_rate': self.captchas / self.requests if self.requests else None,
+            'latency_ewma_s': self.latency_ewma,
+            'in_use': self.in_use,
+            'cooling_down_s': max(0.0, self.cooldown_until - time.time()),
+            'evicted': self.evicted,
+            'score': self.score(),
+        }
+
+
+class ProxyPool:
+    """
+    Pool of proxies for ChannelScraper workers, loaded from the PROXY_LIST_PATH file.
+    Workers acquire a proxy when they launch a browser and report each page's outcome;
+    proxies that keep failing or hitting captchas are cooled down and eventually evicted.
+    """
+
+    def __init__(self, addresses: List[str], cooldown_seconds: float = 60.0):
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._proxies: Dict[str, ProxyStats] = {}
+        for address in addresses:
+            if address not in self._proxies:
+                self._proxies[address] = ProxyStats(address)
+
+    @classmethod
+    def from_file(cls, path: str, extra: Optional[List[str]] = None, cooldown_seconds: float = 60.0) -> 'ProxyPool':
+        """
+        Load `ip:port` (or `scheme://ip:port`) lines, skipping comments and blanks.
+        Credentialed entries (`user:pass@ip:port`) are skipped: Chrome's --proxy-server
+        flag cannot carry credentials.
+        """
+        addresses = list(extra or [])
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                addresses.extend(line.strip() for line in f)
+        usable = []
+        for address in addresses:
+            if not address or address.startswith('#'):
+                continue
+            if '@' in address:
+                logger.warning("Skipping proxy %s: authenticated proxies are not supported by Chrome's --proxy-server", address.split('@')[-1])
+                continue
+            usable.append(address)
+        return cls(usable, cooldown_seconds=cooldown_seconds)
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def available_count(self) -> int:
+        now = time.time()
+        with self._lock:
+            return sum(1 for p in self._proxies.values() if not p.evicted and p.cooldown_until <= now)
+
+    def acquire(self, exclude: Optional[ProxyStats] = None) -> Optional[ProxyStats]:
+        """
+        Pick a healthy proxy, preferring idle ones and weighting by score.
+        Returns None when no proxy is usable; callers then scrape without a proxy.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [
+                p for p in self._proxies.values()
+                if not p.evicted and p.cooldown_until <= now and p is not exclude
+            ]
+            if not candidates:
+                return None
+            least_used = min(p.in_use for p in candidates)
+            candidates = [p for p in candidates if p.in_use == least_used]
+            proxy = random.choices(candidates, weights=[p.score() for p in candidates])[0]
+            proxy.in_use += 1
+            return proxy
+
+    def release(self, proxy: Optional[ProxyStats]):
+        if proxy is None:
+            return
+        with self._lock:
+            proxy.in_use = max(0, proxy.in_use - 1)
+
+    def report(self, proxy: Optional[ProxyStats], success: bool, latency: Optional[float] = None, captcha: bool = False):
+        """
+        Record the outcome of one page load through `proxy`.
+        """
+        if proxy is None:
+            return
+        with self._lock:
+            if success:
+                proxy.successes += 1
+            else:
+                proxy.failures += 1
+            if captcha:
+                proxy.captchas += 1
+            # A captcha means YouTube is throttling this exit, even if the page was eventually read
+            if success and not captcha:
+                proxy.consecutive_failures = 0
+            else:
+                proxy.consecutive_failures += 1
+            if latency is not None:
+                proxy.latency_ewma = latency if proxy.latency_ewma is None else (
+                    LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * proxy.latency_ewma
+                )
+            if proxy.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                self._cool_down(proxy)
+
+    def _cool_down(self, proxy: ProxyStats):
+        proxy.cooldowns += 1
+        proxy.consecutive_failures = 0
+        if proxy.cooldowns > MAX_COOLDOWNS:
+            proxy.evicted = True
+            logger.warning("Evicted proxy %s after %d cooldowns", proxy.address, MAX_COOLDOWNS)
+            return
+        duration = self.cooldown_seconds * (2 ** (proxy.cooldowns - 1))
+        proxy.cooldown_until = time.time() + duration
+        logger.info("Cooling down proxy %s for %.0fs", proxy.address, duration)
+
+    def is_usable(self, proxy: Optional[ProxyStats]) -> bool:
+        if proxy is None:
+            return True
+        with self._lock:
+            return not proxy.evicted and proxy.cooldown_until <= time.time()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [p.to_dict() for p in self._proxies.values()]
+
+
+_pool: Optional[ProxyPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_proxy_pool() -> ProxyPool:
+    """
+    Shared pool loaded from PROXY_LIST_PATH plus the PROXY env var. The file is opt-in
+    (no default), so an unconfigured worker scrapes directly.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            path = os.getenv("PROXY_LIST_PATH", "")
+            extra = [os.getenv("PROXY")] if os.getenv("PROXY") else []
+            cooldown = float(os.getenv("PROXY_COOLDOWN_SECONDS", 60))
+            _pool = ProxyPool.from_file(path, extra=extra, cooldown_seconds=cooldown)
+        return _pool
@@ -0,0 +1,119 @@
+import os
+import logging
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+from app.services.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+# YouTube Data API quotas reset at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+# Counters outlive their day by a margin so late readers still see the final value
+COUNTER_TTL = 2 * 24 * 3600
+
+
+class QuotaExceeded(Exception):
+    """
+    Every configured YouTube API key has used up today's quota.
+    """
+
+
+def quota_day() -> str:
+    return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def key_fingerprint(api_key: str) -> str:
+    # Keys are never written to the shared store, only a short digest
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class YouTubeQuota:
+    """
+    Daily YouTube Data API quota shared by all worker processes, with rotation
+    across several API keys. Units are reserved before each call; when the current
+    key cannot cover a call the shared key index moves to the next key with room,
+    so every worker switches keys together.
+    A daily_limit of 0 disables reservation; keys then rotate only when YouTube
+    reports quotaExceeded.
+    Methods block on the shared store, so async callers run them with executors.run_store.
+    """
+
+    def __init__(self, store: SharedStore, api_keys: List[str], daily_limit: int):
+        self.store = store
+        self.api_keys = api_keys
+        self.daily_limit = daily_limit
+
+    def _counter(self, api_key: str) -> str:
+        return f"youtube_quota:{key_fingerprint(api_key)}:{quota_day()}"
+
+    def _current_index(self) -> int:
+        return self.store.get("youtube", "key_index", 0) % len(self.api_keys)
+
+    def reserve(self, units: int) -> str:
+        """
+        Reserve `units` on a key with room left today and return that key.
+        Raises QuotaExceeded when no key has room.
+        """
+        start = self._current_index()
+        if not self.daily_limit:
+            return self.api_keys[start]
+        for offset in range(len(self.api_keys)):
+            index = (start + offset) % len(self.api_keys)
+            api_key = self.api_keys[index]
+            if self.store.try_consume(self._counter(api_key), units, self.daily_limit, ttl=COUNTER_TTL):
+                if offset:
+                    logger.info("Rotating to YouTube API key %s", key_fingerprint(api_key))
+                    self.store.set("youtube", "key_index", index)
+                return api_key
+        raise QuotaExceeded(f"YouTube API quota exhausted for all {len(self.api_keys)} key(s) on {quota_day()}")
+
+    def exhaust(self, api_key: str):
+        """
+        Mark `api_key` as spent for today (YouTube answered quotaExceeded) and move
+        the shared index past it.
+        """
+        if self.daily_limit:
+            self.store.set_counter(self._counter(api_key), self.daily_limit, ttl=COUNTER_TTL)
+        if api_key in self.api_keys:
+            self.store.set("youtube", "key_index", (self.api_keys.index(api_key) + 1) % len(self.api_keys))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "day": quota_day(),
+            "daily_limit_per_key": self.daily_limit,
+            "current_key": key_fingerprint(self.api_keys[self._current_index()]) if self.api_keys else None,
+            "used": {key_fingerprint(k): self.store.counter(self._counter(k)) for k in self.api_keys},
+        }
+
+
+def youtube_api_keys() -> List[str]:
+    """
+    Keys from YOUTUBE_API_KEYS (comma-separated), falling back to YOUTUBE_API_KEY.
+    """
+    keys = [k.strip() for k in os.getenv("YOUTUBE_API_KEYS", "").split(",") if k.strip()]
+    if not keys and os.getenv("YOUTUBE_API_KEY"):
+        keys = [os.getenv("YOUTUBE_API_KEY")]
+    # The .env template's placeholder is not a key
+    return [k for k in keys if k != "your_youtube_api_key_here"]
+
+
+_quota: Optional[YouTubeQuota] = None
+_quota_lock = threading.Lock()
+
+
+def get_youtube_quota() -> YouTubeQuota:
+    """
+    Shared quota for the configured keys; YOUTUBE_DAILY_QUOTA units per key per day (default 10000).
+    """
+    global _quota
+    with _quota_lock:
+        if _quota is None or _quota.store is not get_shared_store():
+            _quota = YouTubeQuota(
+                get_shared_store(),
+                youtube_api_keys(),
+                daily_limit=int(os.getenv("YOUTUBE_DAILY_QUOTA", 10000)),
+            )
+        return _quota
@@ -0,0 +1,135 @@
+import os
+import math
+import heapq
+import itertools
+from collections import deque
+from typing import List, Optional, Tuple
+from app.services.records import DiscoveredChannel
+
+# Score weights. Subscriber and view components are log-scaled to [0, 1]
+# (full marks at SUBSCRIBERS_FULL / AVERAGE_VIEWS_FULL); the booleans add flat bonuses.
+SUBSCRIBER_WEIGHT = 1.0
+VIEWS_WEIGHT = 1.5
+ICP_WEIGHT = 3.0
+POTENTIAL_ICP_WEIGHT = 1.0
+HIGH_TICKET_WEIGHT = 1.0
+SUBSCRIBERS_FULL = 10_000_000
+AVERAGE_VIEWS_FULL = 1_000_000
+
+# Candidates searched per keyword in ranked mode when the query sets no limit
+RANK_CANDIDATES_PER_KEYWORD = int(os.getenv("RANK_CANDIDATES_PER_KEYWORD", 20))
+DEFAULT_TOP_K = int(os.getenv("RANK_DEFAULT_TOP_K", 10))
+# Stop expanding once the chance that the next page improves the top K drops below this,
+# estimated from the last RANK_STOP_WINDOW candidates seen after the top K filled
+RANK_STOP_PROBABILITY = float(os.getenv("RANK_STOP_PROBABILITY", 0.1))
+RANK_STOP_WINDOW = int(os.getenv("RANK_STOP_WINDOW", 10))
+
+
+def _log_scale(value: float, full: float) -> float:
+    return min(1.0, math.log10(1 + max(0.0, value)) / math.log10(1 + full))
+
+
+def score_parts(subscriber_count: int, average_views: Optional[float]) -> float:
+    """
+    The subscriber and view components; with `average_views` unknown the view part is
+    taken at its maximum, which makes the result an upper bound.
+    """
+    views = VIEWS_WEIGHT if average_views is None else VIEWS_WEIGHT * _log_scale(average_views, AVERAGE_VIEWS_FULL)
+    return SUBSCRIBER_WEIGHT * _log_scale(subscriber_count, SUBSCRIBERS_FULL) + views
+
+
+def score_channel(result: DiscoveredChannel) -> float:
+    classification = result.classification
+    score = score_parts(result.channel.subscriber_count, result.average_views)
+    if classification.is_icp:
+        score += ICP_WEIGHT
+    elif classification.potential_icp:
+        score += POTENTIAL_ICP_WEIGHT
+    if classification.high_ticket:
+        score += HIGH_TICKET_WEIGHT
+    return round(score, 4)
+
+
+def upper_bound(subscriber_count: int, average_views: Optional[float] = None) -> float:
+    """
+    Best score a channel could still reach before it is classified (ICP and high-ticket).
+    """
+    return score_parts(subscriber_count, average_views) + max(ICP_WEIGHT, POTENTIAL_ICP_WEIGHT) + HIGH_TICKET_WEIGHT
+
+
+class TopKRanker:
+    """
+    Keeps the `k` best-scoring channels in a min-heap and decides when searching on is
+    no longer worth it.
+
+    Once the heap is full, channels whose upper bound cannot beat the K-th score are
+    pruned before their remaining API and Gemini calls. Every candidate seen after that
+    point is an observation of whether a new channel can still enter the top K. The
+    entry rate over the last `window` observations gives the chance that a whole next
+    page improves the result, and discovery stops expanding keywords once it falls
+    below RANK_STOP_PROBABILITY. The threshold only rises, so recent observations are
+    what matter; with the defaults, ten candidates in a row that miss the top K stop it.
+    """
+
+    def __init__(self, k: int, stop_probability: float = RANK_STOP_PROBABILITY, window: int = RANK_STOP_WINDOW):
+        self.k = max(1, k)
+        self.stop_probability = stop_probability
+        self._heap: List[Tuple[float, int, DiscoveredChannel]] = []
+        self._sequence = itertools.count()
+        self._recent = deque(maxlen=max(1, window))
+        self.observed = 0
+        self.improvements = 0
+        self.pruned = 0
+
+    def full(self) -> bool:
+        return len(self._heap) >= self.k
+
+    def threshold(self) -> float:
+        return self._heap[0][0] if self.full() else float('-inf')
+
+    def _observe(self, entered: bool):
+        if self.full():
+            self.observed += 1
+            self.improvements += entered
+            self._recent.append(entered)
+
+    def prune(self, bound: float) -> bool:
+        """
+        True if a channel whose score can be at most `bound` cannot enter the top K.
+        """
+        if bound > self.threshold():
+            return False
+        self._observe(False)
+        self.pruned += 1
+        return True
+
+    def offer(self, result: DiscoveredChannel) -> bool:
+        score = score_channel(result)
+        entry = (score, -next(self._sequence), result)  # earlier finds win ties
+        if not self.full():
+            heapq.heappush(self._heap, entry)
+            return True
+        entered = entry > self._heap[0]
+        if entered:
+            heapq.heapreplace(self._heap, entry)
+        self._observe(entered)
+        return entered
+
+    def improvement_probability(self, page_size: int) -> float:
+        """
+        Chance that a page of `page_size` candidates improves the top K; 1.0 until
+        the window has filled, so a few early misses do not end the search.
+        """
+        if len(self._recent) < self._recent.maxlen:
+            return 1.0
+        rate = sum(self._recent) / len(self._recent)
+        return 1 - (1 - rate) ** max(1, page_size)
+
+    def exhausted(self, page_size: int) -> bool:
+        return self.improvement_probability(page_size) < self.stop_probability
+
+    def ranked(self) -> List[Tuple[float, DiscoveredChannel]]:
+        """
+        (score, channel) pairs, best first.
+        """
+        return [(score, result) for score, _, result in sorted(self._heap, reverse=True)]
@@ -0,0 +1,380 @@
+from typing import Any, Dict, List, Optional
+
+# Placeholder the API has always returned for missing channel fields. Records keep
+# None internally; the placeholder is only applied when converting for a response.
+NOT_AVAILABLE = 'N/A'
+
+
+def _slot_state(record, skip=()) -> Dict[str, Any]:
+    return {name: getattr(record, name) for name in record.__slots__ if name not in skip}
+
+
+class ChannelRecord:
+    """
+    One channel as returned by channels.list (snippet, statistics, brandingSettings).
+    Records are shared between coalesced callers, so treat them as read-only.
+    """
+
+    __slots__ = (
+        'channel_id', 'name', 'description', 'custom_url', 'published_at', 'country',
+        'default_language', 'keywords', 'subscriber_count', 'video_count', 'view_count',
+        'hidden_subscriber_count', 'url', 'etag',
+    )
+
+    def __init__(
+        self,
+        channel_id: str,
+        name: Optional[str] = None,
+        description: str = '',
+        custom_url: Optional[str] = None,
+        published_at: Optional[str] = None,
+        country: Optional[str] = None,
+        default_language: Optional[str] = None,
+        keywords: Optional[str] = None,
+        subscriber_count: int = 0,
+        video_count: int = 0,
+        view_count: int = 0,
+        hidden_subscriber_count: bool = False,
+        url: Optional[str] = None,
+        etag: Optional[str] = None,
+    ):
+        self.channel_id = channel_id
+        self.name = name
+        self.description = description
+        self.custom_url = custom_url
+        self.published_at = published_at
+        self.country = country
+        self.default_language = default_language
+        self.keywords = keywords
+        self.subscriber_count = subscriber_count
+        self.video_count = video_count
+        self.view_count = view_count
+        self.hidden_subscriber_count = hidden_subscriber_count
+        # Prefer the @handle URL over the channel ID form; it scrapes more reliably
+        self.url = url or (
+            f"https://www.youtube.com/{custom_url}" if custom_url
+            else f"https://www.youtube.com/channel/{channel_id}"
+        )
+        # The API resource's ETag; unchanged when nothing in the resource changed
+        self.etag = etag
+
+    @classmethod
+    def from_api(cls, channel_id: str, item: Dict[str, Any]) -> 'ChannelRecord':
+        snippet = item.get('snippet', {})
+        stats = item.get('statistics', {})
+        branding = item.get('brandingSettings', {}).get('channel', {})
+        return cls(
+            channel_id,
+            name=snippet.get('title'),
+            description=snippet.get('description', ''),
+            custom_url=snippet.get('customUrl'),
+            published_at=snippet.get('publishedAt'),
+            country=snippet.get('country'),
+            default_language=branding.get('defaultLanguage'),
+            keywords=branding.get('keywords'),
+            subscriber_count=int(stats.get('subscriberCount', 0)),
+            video_count=int(stats.get('videoCount', 0)),
+            view_count=int(stats.get('viewCount', 0)),
+            hidden_subscriber_count=stats.get('hiddenSubscriberCount', False),
+            etag=item.get('etag'),
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        JSON-safe form for checkpoints; from_state reverses it.
+        """
+        return _slot_state(self)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'ChannelRecord':
+        return cls(**state)
+
+    def info_dict(self) -> Dict[str, Any]:
+        """
+        Channel details in the VideoResult.channel_info shape.
+        """
+        return {
+            'description': self.description,
+            'custom_url': self.custom_url,
+            'published_at': self.published_at,
+            'default_language': self.default_language,
+            'keywords': self.keywords,
+            'video_count': self.video_count,
+            'total_views': self.view_count,
+            'hidden_subscriber_count': self.hidden_subscriber_count,
+        }
+
+
+class VideoRecord:
+    """
+    One video. `channel` points at the shared ChannelRecord rather than copying its fields.
+    """
+
+    __slots__ = (
+        'video_id', 'title', 'description', 'view_count', 'published_at', 'tags', 'category_id',
+        'duration', 'definition', 'caption', 'licensed_content', 'projection', 'topic_categories',
+        'like_count', 'comment_count', 'link', 'etag', 'channel',
+    )
+
+    def __init__(
+        self,
+        video_id: str = '',
+        title: str = '',
+        description: str = '',
+        view_count: int = 0,
+        published_at: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        category_id: Optional[str] = None,
+        duration: Optional[str] = None,
+        definition: Optional[str] = None,
+        caption: Optional[str] = None,
+        licensed_content: Optional[bool] = None,
+        projection: Optional[str] = None,
+        topic_categories: Optional[List[str]] = None,
+        like_count: Optional[int] = None,
+        comment_count: Optional[int] = None,
+        link: Optional[str] = None,
+        etag: Optional[str] = None,
+        channel: Optional[ChannelRecord] = None,
+    ):
+        self.video_id = video_id
+        self.title = title
+        self.description = description
+        self.view_count = view_count
+        self.published_at = published_at
+        self.tags = tags
+        self.category_id = category_id
+        self.duration = duration
+        self.definition = definition
+        self.caption = caption
+        self.licensed_content = licensed_content
+        self.projection = projection
+        self.topic_categories = topic_categories
+        self.like_count = like_count
+        self.comment_count = comment_count
+        self.link = link or (f"https://www.youtube.com/watch?v={video_id}" if video_id else None)
+        self.etag = etag
+        self.channel = channel
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any], channel: Optional[ChannelRecord] = None) -> 'VideoRecord':
+        """
+        Build from a videos.list item (snippet, statistics and optionally contentDetails/topicDetails).
+        """
+        snippet = item.get('snippet', {})
+        stats = item.get('statistics', {})
+        details = item.get('contentDetails', {})
+        return cls(
+            video_id=item.get('id', ''),
+            title=snippet.get('title', ''),
+            description=snippet.get('description', ''),
+            view_count=int(stats.get('viewCount', 0)),
+            published_at=snippet.get('publishedAt'),
+            tags=snippet.get('tags'),
+            category_id=snippet.get('categoryId'),
+            duration=details.get('duration'),
+            definition=details.get('definition'),
+            caption=details.get('caption'),
+            licensed_content=details.get('licensedContent'),
+            projection=details.get('projection'),
+            topic_categories=item.get('topicDetails', {}).get('topicCategories'),
+            like_count=int(stats['likeCount']) if 'likeCount' in stats else None,
+            comment_count=int(stats['commentCount']) if 'commentCount' in stats else None,
+            etag=item.get('etag'),
+            channel=channel,
+        )
+
+    @classmethod
+    def from_flat(cls, row: Dict[str, Any]) -> 'VideoRecord':
+        """
+        Build from a flat row with video_* and channel_* keys (the older VideoFilter input).
+        """
+        channel = ChannelRecord(
+            row.get('channel_id', ''),
+            name=row.get('channel_name'),
+            description=row.get('channel_description', ''),
+            custom_url=row.get('channel_custom_url'),
+            published_at=row.get('channel_published_at'),
+            country=row.get('channel_country'),
+            default_language=row.get('channel_default_language'),
+            keywords=row.get('channel_keywords'),
+            subscriber_count=row.get('channel_subscriber_count', 0),
+            video_count=row.get('channel_video_count', 0),
+            view_count=row.get('channel_view_count', 0),
+            hidden_subscriber_count=row.get('channel_hidden_subscriber_count', False),
+        )
+        return cls(
+            video_id=row.get('video_id', ''),
+            title=row.get('video_title', ''),
+            description=row.get('video_description', ''),
+            view_count=row.get('video_view_count', 0),
+            published_at=row.get('video_published_at'),
+            tags=row.get('video_tags'),
+            category_id=row.get('video_category_id'),
+            duration=row.get('video_duration'),
+            definition=row.get('video_definition'),
+            caption=row.get('video_caption'),
+            licensed_content=row.get('video_licensed_content'),
+            projection=row.get('video_projection'),
+            topic_categories=row.get('video_topic_categories'),
+            like_count=row.get('video_like_count'),
+            comment_count=row.get('video_comment_count'),
+            link=row.get('video_link'),
+            channel=channel,
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        JSON-safe form for checkpoints. The channel reference is not included.
+        """
+        return _slot_state(self, skip=('channel',))
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], channel: Optional[ChannelRecord] = None) -> 'VideoRecord':
+        return cls(channel=channel, **state)
+
+    def summary_dict(self) -> Dict[str, Any]:
+        """
+        The title/description/view_count shape used for last_3_videos.
+        """
+        return {'title': self.title, 'description': self.description, 'view_count': self.view_count}
+
+
+class ClassificationResult:
+    """
+    Normalised ICP classification from the LLM: email is always a string,
+    contact_links always a list. `failed` marks the defaults returned when the
+    LLM call or its JSON could not be used.
+    """
+
+    __slots__ = ('email', 'contact_links', 'is_icp', 'why', 'high_ticket', 'potential_icp', 'failed')
+
+    def __init__(self, email: str = '', contact_links: Optional[List[str]] = None, is_icp: bool = False,
+                 why: str = '', high_ticket: bool = False, potential_icp: bool = False, failed: bool = False):
+        self.email = email
+        self.contact_links = contact_links or []
+        self.is_icp = is_icp
+        self.why = why
+        self.high_ticket = high_ticket
+        self.potential_icp = potential_icp
+        self.failed = failed
+
+    def to_state(self) -> Dict[str, Any]:
+        return _slot_state(self)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'ClassificationResult':
+        return cls(**state)
+
+    @classmethod
+    def from_llm(cls, contact_info: Dict[str, Any], failed: bool = False) -> 'ClassificationResult':
+        email = contact_info.get('email')
+        if isinstance(email, list):
+            email = email[0] if email and isinstance(email[0], str) else ''
+        elif not isinstance(email, str):
+            email = ''
+        links = contact_info.get('contact_links')
+        if isinstance(links, str):
+            links = [links] if links else []
+        elif not isinstance(links, list):
+            links = []
+        return cls(
+            email=email,
+            contact_links=links,
+            is_icp=bool(contact_info.get('isicp', False)),
+            why=contact_info.get('why') or '',
+            high_ticket=bool(contact_info.get('high_ticket', False)),
+            potential_icp=bool(contact_info.get('potential_icp', False)),
+            failed=failed,
+        )
+
+
+class DiscoveredChannel:
+    """
+    A channel that passed discovery: the channel record, its recent videos, the
+    contact info gathered for it and its classification.
+    """
+
+    __slots__ = ('channel', 'emails', 'links', 'last_videos', 'average_views', 'classification')
+
+    def __init__(self, channel: ChannelRecord, emails: List[str], links: List[str],
+                 last_videos: List[VideoRecord], average_views: float, classification: ClassificationResult):
+        self.channel = channel
+        self.emails = emails
+        self.links = links
+        self.last_videos = last_videos
+        self.average_views = average_views
+        self.classification = classification
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'channel': self.channel.to_state(),
+            'emails': self.emails,
+            'links': self.links,
+            'last_videos': [v.to_state() for v in self.last_videos],
+            'average_views': self.average_views,
+            'classification': self.classification.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'DiscoveredChannel':
+        return cls(
+            ChannelRecord.from_state(state['channel']),
+            state['emails'],
+            state['links'],
+            [VideoRecord.from_state(v) for v in state['last_videos']],
+            state['average_views'],
+            ClassificationResult.from_state(state['classification']),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Fields of the ChannelDiscoveryResult response model.
+        """
+        channel = self.channel
+        return {
+            'id': channel.channel_id,
+            'channel_name': channel.name or NOT_AVAILABLE,
+            'subscriber_count': channel.subscriber_count,
+            'country': channel.country or NOT_AVAILABLE,
+            'about': channel.description,
+            'links': self.links,
+            'emails': self.emails,
+            'channel_url': channel.url,
+            'last_3_videos': [v.summary_dict() for v in self.last_videos],
+            'average_views': self.average_views,
+            'is_icp': self.classification.is_icp,
+            'high_ticket': self.classification.high_ticket,
+            'potential_icp': self.classification.potential_icp,
+        }
+
+
+def video_result_dict(video: VideoRecord, classification: ClassificationResult) -> Dict[str, Any]:
+    """
+    Fields of the VideoResult response model for a filtered video.
+    """
+    channel = video.channel or ChannelRecord('')
+    return {
+        'title': video.title or NOT_AVAILABLE,
+        'link': video.link or NOT_AVAILABLE,
+        'channel_name': channel.name or NOT_AVAILABLE,
+        'email': classification.email or NOT_AVAILABLE,
+        'contact_links': classification.contact_links,
+        'subscriber_count': channel.subscriber_count,
+        'view_count': video.view_count,
+        'country': channel.country or NOT_AVAILABLE,
+        'description': video.description,
+        'published_at': video.published_at,
+        'tags': video.tags or [],
+        'category_id': video.category_id,
+        'duration': video.duration,
+        'definition': video.definition,
+        'caption_available': video.caption,
+        'licensed_content': video.licensed_content,
+        'projection': video.projection,
+        'topic_categories': video.topic_categories or [],
+        'like_count': video.like_count,
+        'comment_count': video.comment_count,
+        'isicp': classification.is_icp,
+        'channel_info': channel.info_dict(),
+    }
@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+# Outcomes stored per channel. 'found' lives for SCRAPE_CACHE_TTL, 'empty' (scraped,
+# no contact info) for SCRAPE_CACHE_NEGATIVE_TTL, 'error' (failed or unsolved captcha)
+# for SCRAPE_CACHE_ERROR_TTL.
+FOUND = 'found'
+EMPTY = 'empty'
+ERROR = 'error'
+
+
+def canonical_channel_key(channel_url: str) -> str:
+    """
+    Canonical identity for a channel URL or handle:
+    "@handle" (lowercased), "channel/UC...", "c/name" or "user/name".
+    Sub-pages such as /about or /videos and query strings are ignored.
+    """
+    value = channel_url.strip()
+    if value.startswith("@"):
+        return value.split("/")[0].lower()
+    if "://" not in value:
+        value = f"https://{value}"
+    parsed = urlparse(value)
+    segments = [s for s in parsed.path.split("/") if s]
+    if segments and segments[0].startswith("@"):
+        return segments[0].lower()
+    if len(segments) >= 2 and segments[0] == "channel":
+        return f"channel/{segments[1]}"
+    if len(segments) >= 2 and segments[0] in ("c", "user"):
+        return f"{segments[0]}/{segments[1].lower()}"
+    host = (parsed.hostname or "").lower()
+    return f"{host}/{'/'.join(segments)}".rstrip("/")
+
+
+def classify_outcome(scrape_result: Dict[str, Any]) -> str:
+    if scrape_result.get('error'):
+        return ERROR
+    if scrape_result.get('email') or scrape_result.get('links'):
+        return FOUND
+    # A captcha page we never got past says nothing about the channel
+    if scrape_result.get('captcha'):
+        return ERROR
+    return EMPTY
+
+
+class ScrapeCache:
+    """
+    Persistent cache of About-page scrape results keyed by canonical channel identity.
+    SQLite (WAL) holds the entries across restarts; a small in-memory LRU in front
+    answers repeat lookups without touching disk.
+    """
+
+    def __init__(self, path: str, ttl: float, negative_ttl: float, error_ttl: float, memory_entries: int = 10000):
+        self.ttls = {FOUND: ttl, EMPTY: negative_ttl, ERROR: error_ttl}
+        self.memory_entries = memory_entries
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_cache ("
+            "channel_key TEXT PRIMARY KEY, outcome TEXT NOT NULL, email TEXT, "
+            "links TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, channel_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return {'email', 'links', 'outcome'} for a fresh entry, or None.
+        """
+        key = canonical_channel_key(channel_url)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return dict(entry[1])
+                del self._memory[key]
+            row = self._conn.execute(
+                "SELECT outcome, email, links, expires_at FROM scrape_cache WHERE channel_key = ?", (key,)
+            ).fetchone()
+            if row is None or row[3] <= now:
+                return None
+            value = {'outcome': row[0], 'email': row[1], 'links': json.loads(row[2])}
+            self._remember(key, row[3], value)
+            return dict(value)
+
+    def put(self, channel_url: str, scrape_result: Dict[str, Any]) -> str:
+        """
+        Store a scrape result with the TTL for its outcome; returns the outcome.
+        """
+        key = canonical_channel_key(channel_url)
+        outcome = classify_outcome(scrape_result)
+        value = {
+            'outcome': outcome,
+            'email': scrape_result.get('email'),
+            'links': list(scrape_result.get('links') or []),
+        }
+        expires_at = time.time() + self.ttls[outcome]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache (channel_key, outcome, email, links, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, outcome, value['email'], json.dumps(value['links']), expires_at),
+            )
+            self._remember(key, expires_at, value)
+        return outcome
+
+    def _remember(self, key: str, expires_at: float, value: Dict[str, Any]):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM scrape_cache WHERE expires_at <= ?", (time.time(),))
+            return cursor.rowcount
+
+
+_cache: Optional[ScrapeCache] = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> Optional[ScrapeCache]:
+    """
+    Shared cache at SCRAPE_CACHE_PATH (default .cache/scrape_cache.db).
+    Set SCRAPE_CACHE_PATH to an empty string to disable caching.
+    """
+    global _cache, _cache_loaded
+    with _cache_lock:
+        if not _cache_loaded:
+            _cache_loaded = True
+            path = os.getenv("SCRAPE_CACHE_PATH", os.path.join(".cache", "scrape_cache.db"))
+            if path:
+                _cache = ScrapeCache(
+                    path,
+                    ttl=float(os.getenv("SCRAPE_CACHE_TTL", 7 * 24 * 3600)),
+                    negative_ttl=float(os.getenv("SCRAPE_CACHE_NEGATIVE_TTL", 24 * 3600)),
+                    error_ttl=float(os.getenv("SCRAPE_CACHE_ERROR_TTL", 3600)),
+                )
+        return _cache
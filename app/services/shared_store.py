@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.executors import run_store
+
+# How long a connection waits for another process's write lock before giving up
+BUSY_TIMEOUT_MS = 5000
+
+
+class SharedStore:
+    """
+    State shared by every worker process on this host, kept in one SQLite (WAL) file:
+    a key/value store with TTLs, counters that can be consumed atomically against a
+    limit, token buckets for rate limits, and leases for cross-process concurrency limits.
+
+    Writes that must be atomic across processes run in BEGIN IMMEDIATE transactions,
+    so two workers can never both take the last unit of a quota or the last lease.
+
+    Every method blocks (up to BUSY_TIMEOUT_MS while another process holds the write
+    lock), so async code calls them through executors.run_store, never on the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+            "PRIMARY KEY (namespace, key));"
+            "CREATE TABLE IF NOT EXISTS counters ("
+            "name TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL);"
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "name TEXT NOT NULL, lease_id TEXT NOT NULL, expires_at REAL NOT NULL, "
+            "PRIMARY KEY (name, lease_id));"
+        )
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # --- key/value ---
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at),
+            )
+
+    def scan(self, namespace: str, prefix: str, after: Optional[str] = None, limit: int = 500) -> List[Tuple[str, Any]]:
+        """
+        Up to `limit` live (key, value) pairs in `namespace` whose key starts with `prefix`,
+        ordered by key. Pass the last key seen as `after` to fetch the next batch.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at FROM kv WHERE namespace = ? AND key > ? AND key < ? ORDER BY key LIMIT ?",
+                (namespace, after or prefix, prefix + "\uffff", limit),
+            ).fetchall()
+        now = time.time()
+        return [(key, json.loads(value)) for key, value, expires_at in rows if expires_at is None or expires_at > now]
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    # --- counters ---
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._read_counter(self._conn, name)[0]
+
+    def _read_counter(self, conn, name: str):
+        row = conn.execute("SELECT value, expires_at FROM counters WHERE name = ?", (name,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return 0, None
+        return row[0], row[1]
+
+    def try_consume(self, name: str, amount: int, limit: int, ttl: Optional[float] = None) -> bool:
+        """
+        Add `amount` to counter `name` unless that would take it past `limit`.
+        Returns False (and changes nothing) when the limit would be exceeded.
+        A live counter keeps its original expiry; `ttl` applies when it is (re)created.
+        """
+        with self._transaction() as conn:
+            value, expires_at = self._read_counter(conn, name)
+            if value + amount > limit:
+                return False
+            if value == 0 and ttl:
+                expires_at = time.time() + ttl
+            conn.execute(
+                "INSERT OR REPLACE INTO counters (name, value, expires_at) VALUES (?, ?, ?)",
+                (name, value + amount, expires_at),
+            )
+            return True
+
+    def set_counter(self, name: str, value: int, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO counters (name, value, expires_at) VALUES (?, ?, ?)",
+                (name, value, expires_at),
+            )
+
+    # --- token buckets ---
+    def take_tokens(self, name: str, amount: float, rate: float, capacity: float) -> float:
+        """
+        Take `amount` tokens from bucket `name`, which refills at `rate` per second up
+        to `capacity`. Returns 0 when granted, otherwise the seconds until enough
+        tokens will have refilled (nothing is taken in that case).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            if tokens < amount:
+                conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)", (name, tokens, now))
+                return (amount - tokens) / rate
+            conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)", (name, tokens - amount, now))
+            return 0.0
+
+    def return_tokens(self, name: str, amount: float, capacity: float):
+        """
+        Give back `amount` tokens taken for work that never ran, up to `capacity`.
+        """
+        with self._transaction() as conn:
+            conn.execute("UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE name = ?", (capacity, amount, name))
+
+    # --- leases ---
+    def acquire_lease(self, name: str, limit: int, ttl: float) -> Optional[str]:
+        """
+        Take one of `limit` slots for `name`, or return None if all are held.
+        Leases expire after `ttl` seconds so a crashed worker cannot leak slots.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND expires_at <= ?", (name, now))
+            held = conn.execute("SELECT COUNT(*) FROM leases WHERE name = ?", (name,)).fetchone()[0]
+            if held >= limit:
+                return None
+            lease_id = uuid.uuid4().hex
+            conn.execute("INSERT INTO leases (name, lease_id, expires_at) VALUES (?, ?, ?)", (name, lease_id, now + ttl))
+            return lease_id
+
+    def renew_lease(self, name: str, lease_id: str, ttl: float) -> bool:
+        """
+        Extend a live lease to `ttl` seconds from now. False if it already expired (and may be held by someone else).
+        """
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE name = ? AND lease_id = ? AND expires_at > ?",
+                (now + ttl, name, lease_id, now),
+            ).rowcount > 0
+
+    def release_lease(self, name: str, lease_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND lease_id = ?", (name, lease_id))
+
+    def leases_held(self, name: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE name = ? AND expires_at > ?", (name, time.time())
+            ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)).rowcount
+            removed += self._conn.execute("DELETE FROM counters WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)).rowcount
+            removed += self._conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,)).rowcount
+        return removed
+
+
+class SharedSemaphore:
+    """
+    Concurrency limit that holds across worker processes, backed by SharedStore leases.
+    A limit of 0 or less disables it.
+    """
+
+    def __init__(self, name: str, limit: int, lease_seconds: float = 300.0, poll_interval: float = 0.05, max_poll_interval: float = 0.5):
+        self.name = name
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    async def acquire(self) -> Optional[str]:
+        if self.limit <= 0:
+            return None
+        store = get_shared_store()
+        delay = self.poll_interval
+        while True:
+            lease_id = await run_store(store.acquire_lease, self.name, self.limit, self.lease_seconds)
+            if lease_id is not None:
+                return lease_id
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+    def release(self, lease_id: Optional[str]):
+        if lease_id is not None:
+            get_shared_store().release_lease(self.name, lease_id)
+
+    @asynccontextmanager
+    async def slot(self):
+        lease_id = await self.acquire()
+        try:
+            yield
+        finally:
+            if lease_id is not None:
+                await run_store(self.release, lease_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'held': get_shared_store().leases_held(self.name) if self.limit > 0 else None,
+        }
+
+
+_store: Optional[SharedStore] = None
+_store_pid: Optional[int] = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store() -> SharedStore:
+    """
+    This process's handle on the store at SHARED_STORE_PATH (default .cache/shared_store.db).
+    A new connection is opened after a fork; SQLite connections must not cross processes.
+    """
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            _store = SharedStore(os.getenv("SHARED_STORE_PATH", os.path.join(".cache", "shared_store.db")))
+            _store_pid = os.getpid()
+        return _store
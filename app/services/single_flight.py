@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from app.services.metrics import metrics
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+    The first caller starts the work; callers arriving while it is in flight
+    wait on the same future instead of starting their own.
+    Results are not cached: once the call finishes the key is released.
+    Joined calls are counted as cache hits on `stage` when one is given.
+    """
+
+    def __init__(self, name: str, stage: Optional[str] = None):
+        self.name = name
+        self.stage = stage
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn()` for `key`, or join the call already running for it.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._release(key, t))
+        else:
+            self.coalesced += 1
+            if self.stage:
+                metrics.record_cache_hit(self.stage)
+        # Shield so one caller being cancelled (e.g. client disconnect) doesn't cancel the shared work
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so an unobserved failure isn't logged as "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'in_flight': len(self._in_flight),
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+        }
+
+
+# Shared groups, one per granularity. They live at module level because the
+# services are created per request and the whole point is to dedupe across requests.
+search_requests = SingleFlight('search_request', stage='search_request')
+channel_details = SingleFlight('channel_details', stage='channel_enrichment')
+channel_last_videos = SingleFlight('channel_last_videos', stage='last_videos')
+channel_classification = SingleFlight('channel_classification', stage='llm_classification')
+search_pages = SingleFlight('search_page', stage='search_page')
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    groups = [search_requests, search_pages, channel_details, channel_last_videos, channel_classification]
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,155 @@
+import os
+import sys
+import time
+import importlib
+import importlib.abc
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+# Set STARTUP_PROFILE=true to time every module import from the moment this module loads
+PROFILE_ENABLED = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+_process_started = time.perf_counter()
+# Module name -> [cumulative seconds, self seconds], as with `python -X importtime`
+_import_times: Dict[str, List[float]] = {}
+# Heavy dependencies loaded on first use and warm-up steps, in the order they ran
+_lazy_loads: Dict[str, float] = {}
+_warmups: Dict[str, float] = {}
+_ready_at: Optional[float] = None
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, stack: List[float]):
+        self.loader = loader
+        self.stack = stack
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += elapsed
+            _import_times[module.__name__] = [elapsed, elapsed - nested]
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Wraps the loader of each newly imported module to time its execution.
+    """
+
+    def __init__(self):
+        self.stack: List[float] = []
+        self._finding = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self.stack)
+                    return spec
+            return None
+        finally:
+            self._finding.discard(fullname)
+
+
+if PROFILE_ENABLED:
+    sys.meta_path.insert(0, _ImportTimer())
+
+
+def lazy_import(module_name: str):
+    """
+    Import a heavy dependency on first use, recording how long the first load took.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _lazy_loads.setdefault(module_name, time.perf_counter() - started)
+    return module
+
+
+def mark_ready():
+    global _ready_at
+    if _ready_at is None:
+        _ready_at = time.perf_counter()
+
+
+def _warm_scraper():
+    lazy_import("app.services.channel_scraper")
+
+
+def _warm_llm():
+    from app.services.llm_handler import LLMHandler
+    LLMHandler()
+
+
+def _warm_youtube():
+    from app.services.youtube_search import YouTubeSearch
+    YouTubeSearch()
+
+
+# WARMUP names -> hooks that load a dependency ahead of the first request
+WARMUP_HOOKS: Dict[str, Callable[[], None]] = {
+    "llm": _warm_llm,
+    "youtube": _warm_youtube,
+    "scraper": _warm_scraper,
+}
+
+
+def run_warmup(names: Optional[str] = None):
+    """
+    Run the warm-up hooks listed in WARMUP (comma-separated, or "all"); none by default.
+    A failing hook is logged and skipped so a missing key never blocks startup.
+    """
+    names = os.getenv("WARMUP", "") if names is None else names
+    selected = list(WARMUP_HOOKS) if names.strip().lower() == "all" else [n.strip() for n in names.split(",") if n.strip()]
+    for name in selected:
+        hook = WARMUP_HOOKS.get(name)
+        if hook is None:
+            logger.warning("Unknown warm-up '%s', expected one of %s", name, ", ".join(WARMUP_HOOKS))
+            continue
+        started = time.perf_counter()
+        try:
+            hook()
+        except Exception as e:
+            logger.warning("Warm-up '%s' failed: %s", name, e)
+        _warmups[name] = time.perf_counter() - started
+
+
+def startup_profile(top: int = 25) -> Dict[str, Any]:
+    """
+    Import-time breakdown: slowest imports (when STARTUP_PROFILE is on), lazy loads and warm-ups, in milliseconds.
+    """
+    slowest = sorted(_import_times.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {
+        "profiling": PROFILE_ENABLED,
+        "ready_ms": round((_ready_at - _process_started) * 1000, 1) if _ready_at is not None else None,
+        "imports": [
+            {"module": name, "cumulative_ms": round(cumulative * 1000, 2), "self_ms": round(own * 1000, 2)}
+            for name, (cumulative, own) in slowest
+        ],
+        "lazy_loads": {name: round(seconds * 1000, 1) for name, seconds in _lazy_loads.items()},
+        "warmups": {name: round(seconds * 1000, 1) for name, seconds in _warmups.items()},
+        "loaded": {name: name in sys.modules for name in ("selenium", "google.generativeai", "googleapiclient.discovery", "twocaptcha")},
+    }
+
@@ -1,207 +1,467 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import os
-from typing import List, Dict, Any
-from dotenv import load_dotenv
+import logging
+import time
 import asyncio
-from functools import partial
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
 import json
 # Load environment variables from .env file
 load_dotenv()
-# Use the new ChannelScraper for email and link extraction
-from app.services.channel_scraper import ChannelScraper
+from app.services.executors import get_executor, run_api, run_cpu, run_scraper, run_store
+from app.services.contact_extraction import first_email
+from app.services.proxy_pool import get_proxy_pool
+from app.services.captcha import get_captcha_breaker, get_captcha_solver
+from app.services.scrape_cache import get_scrape_cache
+from app.services import single_flight
+from app.services.metrics import metrics, QUOTA_COSTS
+from app.services.records import ChannelRecord, VideoRecord
+from app.services.quota import QuotaExceeded, get_youtube_quota, key_fingerprint
+from app.services.startup import lazy_import
+from app.services.shared_store import get_shared_store
+
+logger = logging.getLogger(__name__)
+
+# Stored responses and their ETags for conditional refreshes, shared by all workers (0 disables)
+ETAG_NAMESPACE = 'youtube_etags'
+ETAG_TTL = float(os.getenv("YOUTUBE_ETAG_TTL", 7 * 24 * 3600))
+
+# channels.list part sets. The ETag covers the whole response, so records fetched with
+# different part sets never share an ETag
+CHANNEL_DETAILS_PARTS = 'snippet,statistics,brandingSettings'
+CHANNEL_BATCH_PARTS = CHANNEL_DETAILS_PARTS + ',contentDetails'
+
+# Attempts per URL when a page fails through a proxy (each retry uses a different proxy)
+MAX_SCRAPE_ATTEMPTS = 2
+
+class _ScrapeBatch:
+    """
+    Work queue for one extract_emails_and_links_from_urls call. Entries are
+    (index, captcha_token); workers stop once every queued item has a result.
+    """
+
+    def __init__(self, items: List[dict], results: List[dict], pending: List[int]):
+        self.items = items
+        self.results = results
+        self.remaining = len(pending)
+        self.workers = 1
+        self.queue: asyncio.Queue = asyncio.Queue()
+        for index in pending:
+            self.queue.put_nowait((index, None))
+
+    def finish(self, index: int, result: dict):
+        self.results[index] = result
+        self.remaining -= 1
+        if self.remaining == 0:
+            for _ in range(self.workers):
+                self.queue.put_nowait(None)
+
+def _channel_scraper(proxy=None):
+    # Selenium is imported on the first scrape, not when the API worker starts
+    return lazy_import("app.services.channel_scraper").ChannelScraper(proxy)
+
+def _is_quota_error(error: HttpError) -> bool:
+    status = getattr(error.resp, 'status', None)
+    return status == 403 and b'quotaExceeded' in (error.content or b'')
+
 
 class YouTubeSearch:
-    def __init__(self):
+    def __init__(self, youtube_client=None, scraper_factory=None):
         """
         Initializes the YouTube Data API client.
-        Requires a YOUTUBE_API_KEY environment variable to be set.
+        Requires YOUTUBE_API_KEY (or several keys in YOUTUBE_API_KEYS) unless a client is passed in.
+        Calls are charged against the daily quota shared by all worker processes and
+        rotate to the next key when one runs out.
+        `youtube_client` and `scraper_factory` let benchmarks substitute recorded stand-ins
+        for the API client and ChannelScraper; an injected client bypasses the quota.
         """
-        api_key = os.getenv('YOUTUBE_API_KEY')
-        if not api_key:
+        self.scraper_factory = scraper_factory or _channel_scraper
+        # API clients per pool thread: each wraps an httplib2.Http, which is not thread-safe
+        self._local = threading.local()
+        if youtube_client is not None:
+            self.youtube = youtube_client
+            self.quota = None
+            return
+        self.quota = get_youtube_quota()
+        if not self.quota.api_keys:
             raise ValueError("YOUTUBE_API_KEY environment variable is not set. "
                              "Please create a .env file and add YOUTUBE_API_KEY='YOUR_API_KEY_HERE'.")
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
-        print("YouTube API client initialized successfully.")
+        logger.debug("YouTube API client initialized")
 
-    async def search_videos(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def _client(self, api_key: str):
+        """
+        This thread's client for `api_key`. Called on the API pool thread that runs the request.
+        """
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = self._local.clients = {}
+        client = clients.get(api_key)
+        if client is None:
+            # The discovery client (httplib2, google-auth, discovery cache) is loaded on first use
+            build = lazy_import("googleapiclient.discovery").build
+            client = clients[api_key] = build('youtube', 'v3', developerKey=api_key)
+        return client
+
+    async def _execute(self, endpoint: str, build_request: Callable[[Any], Any], etag_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run one `endpoint` call. With an `etag_key`, the response is stored with its ETag
+        and the next call for the same key sends If-None-Match; on 304 Not Modified the
+        stored payload is returned unchanged (same ETags), so callers can tell nothing changed.
+        """
+        store = get_shared_store()
+        stored = await run_store(store.get, ETAG_NAMESPACE, etag_key) if etag_key and ETAG_TTL > 0 else None
+
+        def conditional_request(youtube):
+            request = build_request(youtube)
+            if stored is not None and hasattr(request, 'headers'):
+                request.headers['If-None-Match'] = stored['etag']
+            return request
+
+        try:
+            response = await self._execute_with_quota(endpoint, conditional_request)
+        except HttpError as e:
+            if stored is not None and getattr(e.resp, 'status', None) == 304:
+                metrics.increment("youtube_not_modified")
+                # Keep entries that keep being confirmed
+                await run_store(store.set, ETAG_NAMESPACE, etag_key, stored, ttl=ETAG_TTL)
+                return stored['payload']
+            raise
+        if etag_key and ETAG_TTL > 0 and response.get('etag'):
+            await run_store(store.set, ETAG_NAMESPACE, etag_key, {'etag': response['etag'], 'payload': response}, ttl=ETAG_TTL)
+        return response
+
+    async def _execute_with_quota(self, endpoint: str, build_request: Callable[[Any], Any]) -> Dict[str, Any]:
+        """
+        Reserve quota for one `endpoint` call, then build the request on the pool
+        thread's client for that key and run it there. If YouTube reports the key's quota as spent,
+        the key is marked exhausted for every worker and the call is retried once on the next key.
+        """
+        if self.quota is None:
+            return await run_api(build_request(self.youtube).execute)
+        for attempt in range(2):
+            api_key = await run_store(self.quota.reserve, QUOTA_COSTS[endpoint])
+            try:
+                return await run_api(lambda: build_request(self._client(api_key)).execute())
+            except HttpError as e:
+                if attempt or not _is_quota_error(e):
+                    raise
+                logger.warning("YouTube reported quota exhausted for key %s", key_fingerprint(api_key))
+                await run_store(self.quota.exhaust, api_key)
+
+    async def search_videos(self, query: str, limit: int = 10) -> List[ChannelRecord]:
         """
         Search for channels using the YouTube Data API and fetch up to `limit` channels using pagination.
-        Uses a single ChannelScraper instance for all link/email extraction in this batch.
         """
         try:
-            print(f"Searching for channels with query: '{query}' (Limit: {limit})...")
-            loop = asyncio.get_event_loop()
+            logger.debug("Searching for channels", extra={"query": query, "limit": limit})
             channels_info = []
             seen_channel_ids = set()
             next_page_token = None
             fetched = 0
-            # Initialize ChannelScraper once for this batch
-            # scraper = ChannelScraper()
             while fetched < limit:
-                max_results = min(50, limit - fetched)  # YouTube API max is 50 per call
-                search_params = {
-                    'q': query,
-                    'part': 'id,snippet',
-                    'type': 'channel',
-                    'maxResults': max_results
-                }
-                if next_page_token:
-                    search_params['pageToken'] = next_page_token
-
-                search_response = await loop.run_in_executor(
-                    None,
-                    partial(self.youtube.search().list, **search_params)
+                channel_ids, next_page_token = await self.search_channels_page(
+                    query, min(50, limit - fetched), next_page_token  # YouTube API max is 50 per call
                 )
-                search_response = await loop.run_in_executor(None, search_response.execute)
-            
-
-                for item in search_response.get('items', []):
-                    # Defensive: Only process if 'channelId' exists
-                    if 'id' in item and 'channelId' in item['id']:
-                        channel_id = item['id']['channelId']
-                    else:
-                     
-                        continue
+                for channel_id in channel_ids:
                     if channel_id in seen_channel_ids:
                         continue
                     seen_channel_ids.add(channel_id)
-               
-                    # --- Get Comprehensive Channel Details ---
-                    channel_request = self.youtube.channels().list(
-                        part='snippet,statistics,brandingSettings',
-                        id=channel_id
-                    )
-                    channel_response = await loop.run_in_executor(None, channel_request.execute)
-                    channel_data = channel_response['items'][0] if channel_response.get('items') else {}
-                    channel_snippet = channel_data.get('snippet', {})
-                    channel_stats = channel_data.get('statistics', {})
-                    channel_branding = channel_data.get('brandingSettings', {})
-                    # Construct the dictionary for comprehensive channel information
-                    channel_detail_info = {
-                        'channel_id': channel_id,
-                        'channel_name': channel_snippet.get('title', 'N/A'),
-                        'channel_description': channel_snippet.get('description', ''),
-                        'channel_custom_url': channel_snippet.get('customUrl', 'N/A'),
-                        'channel_published_at': channel_snippet.get('publishedAt', 'N/A'),
-                        'channel_country': channel_snippet.get('country', 'N/A'),
-                        'channel_default_language': channel_branding.get('channel', {}).get('defaultLanguage', 'N/A'),
-                        'channel_keywords': channel_branding.get('channel', {}).get('keywords', 'N/A'),
-                        'channel_subscriber_count': int(channel_stats.get('subscriberCount', 0)),
-                        'channel_video_count': int(channel_stats.get('videoCount', 0)),
-                        'channel_view_count': int(channel_stats.get('viewCount', 0)),
-                        'channel_hidden_subscriber_count': channel_stats.get('hiddenSubscriberCount', False),
-                    }
-                    # Use ChannelScraper to extract email and links from About page
-                    # Prefer @username format over channel ID for better scraping
-                    if channel_detail_info['channel_custom_url'] and channel_detail_info['channel_custom_url'] != 'N/A':
-                        # Use the @username format (e.g., @MrBeast)
-                        channel_url = f"https://www.youtube.com/{channel_detail_info['channel_custom_url']}"
-                     
-                    else:
-                        # Fallback to channel ID format if no custom URL available
-                        channel_url = f"https://www.youtube.com/channel/{channel_id}"
-                      
-                    channel_detail_info['channel_url'] = channel_url
-                   
-                    # Run the scraper in an executor to avoid blocking the async event loop
-                    # scrape_result = await loop.run_in_executor(None, scraper.extract_from_channel, channel_url)
-                    # print(json.dumps(scrape_result, indent=2))
-                    
-                    # channel_detail_info['email'] = scrape_result['email']
-                    # channel_detail_info['links'] = scrape_result['links']
-                    # print(json.dumps({'channel_id': channel_id, 'email': scrape_result['email'], 'links': scrape_result['links']}, indent=2))
-                    channels_info.append(channel_detail_info)
+                    channels_info.append(await self.get_channel_details(channel_id))
                     fetched += 1
                     if fetched >= limit:
                         break
-
-                next_page_token = search_response.get('nextPageToken')
                 if not next_page_token:
                     break  # No more pages
-            
-            # Clean up the scraper
-            # if 'scraper' in locals():
-            #     scraper.close()
-            
             return channels_info
 
+        except QuotaExceeded:
+            raise
         except HttpError as e:
-            print(f"YouTube API error: {str(e)}")
+            logger.error("YouTube API error: %s", e)
             raise Exception(f"YouTube API error: {str(e)}")
         except Exception as e:
-            print(f"An unexpected error occurred: {str(e)}")
+            logger.exception("Unexpected error searching channels: %s", e)
             raise Exception(f"Unexpected error: {str(e)}")
 
-    async def get_last_videos_for_channel(self, channel_id: str, n: int = 3) -> list:
+    async def search_channels_page(self, query: str, max_results: int, page_token: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
         """
-        Fetch the last n videos for a channel using the uploads playlist.
-        Returns a list of dicts with title, description, and view count for each video.
+        One page of channel search results: the channel IDs in order and the next page token (None on the last page).
         """
-        loop = asyncio.get_event_loop()
-        # Get the uploads playlist ID
-        channel_response = await loop.run_in_executor(
-            None,
-            partial(
-                self.youtube.channels().list,
-                part='contentDetails',
+        search_params = {
+            'q': query,
+            'part': 'id,snippet',
+            'type': 'channel',
+            'maxResults': max_results
+        }
+        if page_token:
+            search_params['pageToken'] = page_token
+        search_response = await single_flight.search_pages.do(
+            tuple(sorted(search_params.items())),
+            lambda: self._search_page(search_params)
+        )
+        # Defensive: Only keep items that carry a 'channelId'
+        channel_ids = [item['id']['channelId'] for item in search_response.get('items', []) if 'channelId' in item.get('id', {})]
+        return channel_ids, search_response.get('nextPageToken')
+
+    async def get_channel_details(self, channel_id: str) -> ChannelRecord:
+        """
+        Comprehensive details for one channel. Coalesced per channel: concurrent searches that
+        surface the same channel share one channels.list call (and one read-only record).
+        """
+        return await single_flight.channel_details.do(
+            channel_id, lambda: self._fetch_channel_details(channel_id)
+        )
+
+    async def resolve_handle(self, handle: str) -> Optional[str]:
+        """
+        Channel ID for an @handle via channels.list forHandle (1 unit), or None if there is no such channel.
+        """
+        handle = handle if handle.startswith('@') else f"@{handle}"
+        with metrics.span('channel_enrichment', quota_units=QUOTA_COSTS['channels.list']):
+            response = await self._execute('channels.list', lambda youtube: youtube.channels().list(
+                part='id',
+                forHandle=handle
+            ), etag_key=f"channels:handle:{handle.lower()}")
+        items = response.get('items', [])
+        return items[0]['id'] if items else None
+
+    async def get_channels_batch(self, channel_ids: List[str]) -> Dict[str, Tuple[ChannelRecord, Optional[str]]]:
+        """
+        Details and uploads playlist ID for up to 50 channels in one channels.list call.
+        Returns {channel_id: (record, uploads_playlist_id)}; unknown IDs are left out.
+        """
+        with metrics.span('channel_enrichment', quota_units=QUOTA_COSTS['channels.list']):
+            response = await self._execute('channels.list', lambda youtube: youtube.channels().list(
+                part=CHANNEL_BATCH_PARTS,
+                id=','.join(channel_ids)
+            ))
+        channels = {}
+        for item in response.get('items', []):
+            uploads = item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+            channels[item['id']] = (ChannelRecord.from_api(item['id'], item), uploads)
+        return channels
+
+    async def get_playlist_video_ids(self, playlist_id: str, n: int = 3) -> List[str]:
+        with metrics.span('last_videos', quota_units=QUOTA_COSTS['playlistItems.list']):
+            response = await self._execute('playlistItems.list', lambda youtube: youtube.playlistItems().list(
+                part='snippet',
+                playlistId=playlist_id,
+                maxResults=n
+            ), etag_key=f"playlistItems:{playlist_id}:{n}")
+        return [item['snippet']['resourceId']['videoId'] for item in response.get('items', [])]
+
+    async def get_videos_batch(self, video_ids: List[str]) -> Dict[str, VideoRecord]:
+        """
+        Snippet and statistics for up to 50 videos in one videos.list call, keyed by video ID.
+        """
+        with metrics.span('last_videos', quota_units=QUOTA_COSTS['videos.list']):
+            response = await self._execute('videos.list', lambda youtube: youtube.videos().list(
+                part='snippet,statistics',
+                id=','.join(video_ids)
+            ))
+        return {item['id']: VideoRecord.from_api(item) for item in response.get('items', [])}
+
+    async def _search_page(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        with metrics.span('search_page', quota_units=QUOTA_COSTS['search.list']):
+            return await self._execute('search.list', lambda youtube: youtube.search().list(**search_params))
+
+    async def _fetch_channel_details(self, channel_id: str) -> ChannelRecord:
+        """
+        Fetch snippet, statistics and branding for one channel.
+        """
+        with metrics.span('channel_enrichment', quota_units=QUOTA_COSTS['channels.list']):
+            channel_response = await self._execute('channels.list', lambda youtube: youtube.channels().list(
+                part=CHANNEL_DETAILS_PARTS,
                 id=channel_id
-            )
+            ), etag_key=f"channels:details:{channel_id}")
+        channel_data = channel_response['items'][0] if channel_response.get('items') else {}
+        return ChannelRecord.from_api(channel_id, channel_data)
+
+    async def get_last_videos_for_channel(self, channel_id: str, n: int = 3) -> List[VideoRecord]:
+        """
+        Fetch the last n videos for a channel using the uploads playlist.
+        Returns VideoRecords with title, description and view count (shared, read-only).
+        """
+        videos = await single_flight.channel_last_videos.do(
+            (channel_id, n), lambda: self._fetch_last_videos(channel_id, n)
         )
-        channel_response = await loop.run_in_executor(None, channel_response.execute)
+        return list(videos)
+
+    async def _fetch_last_videos(self, channel_id: str, n: int) -> list:
+        with metrics.span('last_videos') as span:
+            return await self._fetch_last_videos_in_span(channel_id, n, span)
+
+    async def _fetch_last_videos_in_span(self, channel_id: str, n: int, span) -> list:
+        # Get the uploads playlist ID
+        span.add_quota(QUOTA_COSTS['channels.list'])
+        channel_response = await self._execute('channels.list', lambda youtube: youtube.channels().list(
+            part='contentDetails',
+            id=channel_id
+        ), etag_key=f"channels:uploads:{channel_id}")
         items = channel_response.get('items', [])
         if not items:
             return []
         uploads_playlist_id = items[0]['contentDetails']['relatedPlaylists']['uploads']
         # Get the last n videos from the uploads playlist
-        playlist_items_request = self.youtube.playlistItems().list(
+        span.add_quota(QUOTA_COSTS['playlistItems.list'])
+        playlist_items_response = await self._execute('playlistItems.list', lambda youtube: youtube.playlistItems().list(
             part='snippet',
             playlistId=uploads_playlist_id,
             maxResults=n
-        )
-        playlist_items_response = await loop.run_in_executor(None, playlist_items_request.execute)
+        ), etag_key=f"playlistItems:{uploads_playlist_id}:{n}")
         video_ids = [item['snippet']['resourceId']['videoId'] for item in playlist_items_response.get('items', [])]
         if not video_ids:
             return []
         # Fetch video details for these video IDs
-        videos_request = self.youtube.videos().list(
+        span.add_quota(QUOTA_COSTS['videos.list'])
+        videos_response = await self._execute('videos.list', lambda youtube: youtube.videos().list(
             part='snippet,statistics',
             id=','.join(video_ids)
-        )
-        videos_response = await loop.run_in_executor(None, videos_request.execute)
-        results = []
-        for item in videos_response.get('items', []):
-            snippet = item.get('snippet', {})
-            stats = item.get('statistics', {})
-            results.append({
-                'title': snippet.get('title', ''),
-                'description': snippet.get('description', ''),
-                'view_count': int(stats.get('viewCount', 0))
-            })
-        return results
+        ), etag_key=f"videos:{','.join(video_ids)}")
+        return [VideoRecord.from_api(item) for item in videos_response.get('items', [])]
 
     async def extract_emails_and_links_from_urls(self, video_url_items: List[dict]) -> List[dict]:
         """
         Given a list of dicts with 'id' and 'url', extract emails and links from each using ChannelScraper.
-        Returns a list of dicts: { 'id': ..., 'url': ..., 'email': ..., 'links': ... }
+        Returns a list of dicts: { 'id': ..., 'url': ..., 'email': ..., 'links': ... } in input order.
+        URLs are spread over several browser workers, one proxy from the proxy pool each,
+        so sustained throughput scales with the number of healthy proxies.
+        Pages that hit a captcha are parked while the solver runs in the background and
+        are re-queued with the token, so no browser waits on a solve.
+        Channels in the scrape cache (including "nothing found" entries) are answered
+        before any browser is started.
+        """
+        if not video_url_items:
+            return []
+        cache = get_scrape_cache()
+        results: List[dict] = [None] * len(video_url_items)
+        pending = []
+        cached_entries = [None] * len(video_url_items)
+        if cache:
+            # One trip to the store pool for the whole batch
+            cached_entries = await run_store(lambda: [cache.get(item['url']) for item in video_url_items])
+        for index, (item, cached) in enumerate(zip(video_url_items, cached_entries)):
+            if cached is None:
+                pending.append(index)
+                continue
+            metrics.record_cache_hit('scraping')
+            results[index] = {'id': item['id'], 'url': item['url'], 'email': cached['email'], 'links': cached['links']}
+        if not pending:
+            return results
+
+        proxy_pool = get_proxy_pool()
+        batch = _ScrapeBatch(video_url_items, results, pending)
+        workers = min(
+            len(pending),
+            get_executor('scraper').max_workers,
+            max(1, proxy_pool.available_count()),
+        )
+        batch.workers = workers
+        solves = set()
+        tasks = [asyncio.ensure_future(self._scrape_worker(batch, proxy_pool, solves)) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # On failure, stop the other workers (closing their browsers) and any pending solves
+            for task in tasks + list(solves):
+                task.cancel()
+        return batch.results
+
+    async def _solve_and_requeue(self, batch: '_ScrapeBatch', index: int, challenge: Dict[str, str], parked_result: dict):
+        """
+        Requeue a parked page with its solved token. Without a token (or if the solver
+        fails) the page is finished with its parked result, so the batch always drains.
+        """
+        requeued = False
+        try:
+            token = await get_captcha_solver().solve(challenge['site_key'], challenge['page_url'])
+            if token:
+                batch.queue.put_nowait((index, token))
+                requeued = True
+                return
+            cache = get_scrape_cache()
+            if cache:
+                await run_store(cache.put, parked_result['url'], {'captcha': True})
+        except Exception as e:
+            logger.warning("Captcha solve failed for %s: %s", challenge.get('page_url'), e)
+        finally:
+            if not requeued:
+                batch.finish(index, parked_result)
+
+    async def _launch_scraper(self, proxy_pool, previous=None, previous_proxy=None, exclude=None):
+        """
+        Close the worker's current browser (if any) and start a new one on a fresh proxy.
         """
-        loop = asyncio.get_event_loop()
-        scraper = ChannelScraper()
-        results = []
+        if previous is not None:
+            await run_scraper(previous.close)
+        proxy_pool.release(previous_proxy)
+        proxy = proxy_pool.acquire(exclude=exclude)
+        try:
+            # Chrome startup is blocking too, so it runs on the scraper pool
+            scraper = await run_scraper(self.scraper_factory, proxy.server if proxy else None)
+        except Exception:
+            proxy_pool.release(proxy)
+            raise
+        return scraper, proxy
+
+    async def _scrape_worker(self, batch: '_ScrapeBatch', proxy_pool, solves: set):
+        scraper = proxy = None
+        breaker = get_captcha_breaker()
         try:
-            for item in video_url_items:
-                url = item['url']
-                vid = item['id']
-                # Run the scraper in an executor to avoid blocking the async event loop
-                scrape_result = await loop.run_in_executor(None, scraper.extract_from_channel, url)
-             
-                results.append({
-                    'id': vid,
-                    'url': url,
+            while True:
+                entry = await batch.queue.get()
+                if entry is None:
+                    return
+                index, captcha_token = entry
+                item = batch.items[index]
+                for attempt in range(MAX_SCRAPE_ATTEMPTS):
+                    if scraper is None or not proxy_pool.is_usable(proxy):
+                        scraper, proxy = await self._launch_scraper(proxy_pool, scraper, proxy)
+                    # Back off while the captcha rate is high instead of burning proxies
+                    await breaker.before_page()
+                    started = time.perf_counter()
+                    # Run the scraper on the dedicated scraper pool so slow pages never hold API threads
+                    with metrics.span('scraping') as span:
+                        scrape_result = await run_scraper(scraper.extract_from_channel, item['url'], captcha_token)
+                        if scrape_result.get('error'):
+                            span.error()
+                    # The (often >1 MB) page source is scanned on the CPU pool, not the browser's thread
+                    page_source = scrape_result.pop('page_source', None)
+                    if page_source and not scrape_result.get('email'):
+                        scrape_result['email'] = await run_cpu(first_email, page_source)
+                    captcha = bool(scrape_result.get('captcha'))
+                    breaker.record(captcha)
+                    proxy_pool.report(
+                        proxy,
+                        success=not scrape_result.get('error'),
+                        latency=time.perf_counter() - started,
+                        captcha=captcha,
+                    )
+                    if not scrape_result.get('error') or proxy is None:
+                        break
+                    # The page failed through this proxy: retry it on a different exit
+                    if attempt + 1 < MAX_SCRAPE_ATTEMPTS:
+                        scraper, proxy = await self._launch_scraper(proxy_pool, scraper, proxy, exclude=proxy)
+
+                result = {
+                    'id': item['id'],
+                    'url': item['url'],
                     'email': scrape_result.get('email'),
                     'links': scrape_result.get('links'),
-                })
+                }
+                challenge = scrape_result.get('captcha_challenge')
+                if challenge and captcha_token is None:
+                    # Park the page: solve in the background and let this browser move on
+                    task = asyncio.ensure_future(self._solve_and_requeue(batch, index, challenge, result))
+                    solves.add(task)
+                    task.add_done_callback(solves.discard)
+                    continue
+                cache = get_scrape_cache()
+                if cache:
+                    await run_store(cache.put, item['url'], scrape_result)
+                batch.finish(index, result)
         finally:
-            scraper.close()
-        return results
-
+            if scraper is not None:
+                await run_scraper(scraper.close)
+            proxy_pool.release(proxy)
@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for YouTube Content Discovery Tool
+"""
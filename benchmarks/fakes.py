@@ -0,0 +1,257 @@
+"""
+Local stand-ins for the YouTube Data API client, the Gemini model and ChannelScraper.
+They replay recorded responses from benchmarks/fixtures with configurable injected latency,
+so the pipeline can be measured without live keys.
+"""
+import copy
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name: str) -> Dict[str, Any]:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Latency:
+    """
+    Injected latency: a base delay in seconds plus uniform jitter (fraction of the base).
+    """
+
+    def __init__(self, seconds: float = 0.0, jitter: float = 0.2, seed: int = 0):
+        self.seconds = seconds
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sleep(self):
+        if self.seconds <= 0:
+            return
+        with self._lock:
+            factor = 1 + self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(self.seconds * factor)
+
+
+class CallCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def add(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+def _stable_int(*parts) -> int:
+    return zlib.crc32('|'.join(str(p) for p in parts).encode('utf-8'))
+
+
+class _FakeRequest:
+    """
+    Mimics googleapiclient's HttpRequest: built eagerly, blocks in execute().
+    """
+
+    def __init__(self, client: 'FakeYouTubeClient', endpoint: str, builder, params: Dict[str, Any]):
+        self._client = client
+        self._endpoint = endpoint
+        self._builder = builder
+        self._params = params
+        self.headers: Dict[str, str] = {}
+
+    def execute(self):
+        self._client.calls.add(self._endpoint)
+        self._client.latency.sleep()
+        return self._builder(**self._params)
+
+
+class _FakeResource:
+    def __init__(self, client: 'FakeYouTubeClient', endpoint: str, builder):
+        self._client = client
+        self._endpoint = endpoint
+        self._builder = builder
+
+    def list(self, **params):
+        return _FakeRequest(self._client, self._endpoint, self._builder, params)
+
+
+class FakeYouTubeClient:
+    """
+    Replays recorded YouTube Data API v3 responses.
+
+    Channels are drawn from a fixed pool of `channel_pool` synthetic IDs so that
+    different queries overlap the way real keyword expansions do.
+    """
+
+    def __init__(self, latency: Optional[Latency] = None, channel_pool: int = 500, pages_per_query: int = 20):
+        self.fixtures = load_fixture('youtube_api.json')
+        self.latency = latency or Latency()
+        self.channel_pool = channel_pool
+        self.pages_per_query = pages_per_query
+        self.calls = CallCounter()
+
+    # --- resource accessors, same shape as googleapiclient's discovery client ---
+    def search(self):
+        return _FakeResource(self, 'search.list', self._search_list)
+
+    def channels(self):
+        return _FakeResource(self, 'channels.list', self._channels_list)
+
+    def playlistItems(self):
+        return _FakeResource(self, 'playlistItems.list', self._playlist_items_list)
+
+    def videos(self):
+        return _FakeResource(self, 'videos.list', self._videos_list)
+
+    # --- response builders ---
+    def _channel_id(self, index: int) -> str:
+        return f"UCbench{index:017d}"
+
+    def _search_list(self, q: str = '', maxResults: int = 5, pageToken: Optional[str] = None, **_):
+        template = self.fixtures['search.list']
+        item_template = template['items'][0]
+        page = int(pageToken) if pageToken else 0
+        response = {k: v for k, v in template.items() if k != 'items'}
+        items = []
+        for i in range(maxResults):
+            index = _stable_int(q, page, i) % self.channel_pool
+            item = copy.deepcopy(item_template)
+            channel_id = self._channel_id(index)
+            item['id']['channelId'] = channel_id
+            item['snippet']['channelId'] = channel_id
+            item['snippet']['title'] = f"Bench Channel {index}"
+            items.append(item)
+        response['items'] = items
+        response['pageInfo'] = {'totalResults': self.pages_per_query * maxResults, 'resultsPerPage': maxResults}
+        if page + 1 < self.pages_per_query:
+            response['nextPageToken'] = str(page + 1)
+        else:
+            response.pop('nextPageToken', None)
+        return response
+
+    def _channels_list(self, id: str = '', part: str = '', forHandle: Optional[str] = None, **_):
+        template = self.fixtures['channels.list']
+        item_template = template['items'][0]
+        response = {k: v for k, v in template.items() if k != 'items'}
+        if forHandle:
+            ids = [self._channel_id(_stable_int(forHandle) % self.channel_pool)]
+        else:
+            ids = [channel_id for channel_id in id.split(',') if channel_id]
+        items = []
+        for channel_id in ids:
+            seed = _stable_int(channel_id)
+            item = copy.deepcopy(item_template)
+            item['id'] = channel_id
+            item['snippet']['title'] = f"Bench Channel {channel_id[-6:]}"
+            item['snippet']['customUrl'] = f"@benchchannel{channel_id[-6:]}"
+            item['snippet']['country'] = ['US', 'GB', 'DE', 'IN', 'CA'][seed % 5]
+            item['statistics']['subscriberCount'] = str(50000 + seed % 5000000)
+            item['statistics']['viewCount'] = str(1000000 + seed % 900000000)
+            item['contentDetails']['relatedPlaylists']['uploads'] = 'UU' + channel_id[2:]
+            items.append(item)
+        response['items'] = items
+        response['pageInfo'] = {'totalResults': len(items), 'resultsPerPage': len(items)}
+        return response
+
+    def _playlist_items_list(self, playlistId: str = '', maxResults: int = 3, **_):
+        template = self.fixtures['playlistItems.list']
+        item_template = template['items'][0]
+        response = {k: v for k, v in template.items() if k != 'items'}
+        items = []
+        for i in range(maxResults):
+            item = copy.deepcopy(item_template)
+            item['snippet']['playlistId'] = playlistId
+            item['snippet']['position'] = i
+            item['snippet']['resourceId']['videoId'] = f"{playlistId[-8:]}v{i:02d}"
+            items.append(item)
+        response['items'] = items
+        return response
+
+    def _videos_list(self, id: str = '', part: str = '', **_):
+        template = self.fixtures['videos.list']
+        item_template = template['items'][0]
+        response = {k: v for k, v in template.items() if k != 'items'}
+        items = []
+        for video_id in [v for v in id.split(',') if v]:
+            item = copy.deepcopy(item_template)
+            item['id'] = video_id
+            item['statistics']['viewCount'] = str(10000 + _stable_int(video_id) % 2000000)
+            items.append(item)
+        response['items'] = items
+        response['pageInfo'] = {'totalResults': len(items), 'resultsPerPage': len(items)}
+        return response
+
+
+class _FakeGeminiResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    Replays recorded Gemini responses for synonym generation and ICP classification.
+    """
+
+    def __init__(self, latency: Optional[Latency] = None):
+        self.fixtures = load_fixture('gemini.json')
+        self.latency = latency or Latency()
+        self.calls = CallCounter()
+
+    def generate_content(self, prompt: str):
+        kind = 'synonyms' if prompt.startswith('Generate 5 related search terms') else 'classification'
+        self.calls.add(f'gemini.{kind}')
+        self.latency.sleep()
+        return _FakeGeminiResponse(self.fixtures[kind])
+
+
+class FakeChannelScraper:
+    """
+    Stand-in for ChannelScraper that replays recorded About-page results.
+    Instances are created through `factory()` so the harness can count browser launches.
+    """
+
+    fixtures = None
+
+    def __init__(self, latency: Latency, calls: CallCounter, captcha_rate: float = 0.0):
+        if FakeChannelScraper.fixtures is None:
+            FakeChannelScraper.fixtures = load_fixture('scraper.json')['extract_from_channel']
+        self.latency = latency
+        self.calls = calls
+        self.captcha_rate = captcha_rate
+        self.calls.add('scraper.launch')
+
+    @classmethod
+    def factory(cls, latency: Optional[Latency] = None, calls: Optional[CallCounter] = None, captcha_rate: float = 0.0):
+        latency = latency or Latency()
+        calls = calls or CallCounter()
+
+        def build(*args, **kwargs):
+            return cls(latency, calls, captcha_rate)
+
+        build.calls = calls
+        return build
+
+    def extract_from_channel(self, channel_url: str, captcha_token: Optional[str] = None) -> Dict[str, Any]:
+        self.calls.add('scraper.extract_from_channel')
+        self.latency.sleep()
+        # Deterministic per URL, so a captcha'd page is parked once and then read with the token
+        if not captcha_token and (_stable_int('captcha', channel_url) % 1000) < self.captcha_rate * 1000:
+            self.calls.add('scraper.captcha')
+            return {'email': None, 'links': [], 'captcha': True, 'error': None,
+                    'captcha_challenge': {'site_key': 'bench-site-key', 'page_url': channel_url}}
+        results: List[Dict[str, Any]] = self.fixtures
+        return copy.deepcopy(results[_stable_int(channel_url) % len(results)])
+
+    def close(self):
+        self.calls.add('scraper.close')
@@ -0,0 +1,60 @@
+"""
+Refresh benchmarks/fixtures from the live services.
+Needs YOUTUBE_API_KEY and GOOGLE_API_KEY; costs ~103 YouTube quota units and two Gemini calls.
+
+Usage:
+    python -m benchmarks.record_fixtures "science explainer"
+"""
+import asyncio
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+from googleapiclient.discovery import build
+
+from app.services.llm_handler import LLMHandler
+from benchmarks.fakes import FIXTURES_DIR
+
+load_dotenv()
+
+
+def _write(name: str, data):
+    with open(os.path.join(FIXTURES_DIR, name), 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {name}")
+
+
+async def record(query: str):
+    youtube = build('youtube', 'v3', developerKey=os.environ['YOUTUBE_API_KEY'])
+    search = youtube.search().list(q=query, part='id,snippet', type='channel', maxResults=1).execute()
+    channel_id = search['items'][0]['id']['channelId']
+    channels = youtube.channels().list(part='snippet,statistics,brandingSettings,contentDetails', id=channel_id).execute()
+    uploads = channels['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+    playlist_items = youtube.playlistItems().list(part='snippet', playlistId=uploads, maxResults=1).execute()
+    video_id = playlist_items['items'][0]['snippet']['resourceId']['videoId']
+    videos = youtube.videos().list(part='snippet,statistics', id=video_id).execute()
+    _write('youtube_api.json', {
+        'search.list': search,
+        'channels.list': channels,
+        'playlistItems.list': playlist_items,
+        'videos.list': videos,
+    })
+
+    llm = LLMHandler()
+    synonyms = llm.model.generate_content(
+        "Generate 5 related search terms or phrases for YouTube content discovery.\n"
+        f"Original query: {query}\n"
+        "Return only the 5 terms, one per line"
+    )
+    snippet = channels['items'][0]['snippet']
+    classification = llm.model.generate_content(
+        "Analyze whether this YouTube channel fits our ICP and return ONLY a JSON object with keys "
+        "'email', 'contact_links', 'isicp', 'why', 'high_ticket', 'potential_icp'.\n"
+        f"Channel Name: {snippet.get('title', '')}\nAbout: {snippet.get('description', '')}"
+    )
+    _write('gemini.json', {'synonyms': synonyms.text, 'classification': classification.text})
+
+
+if __name__ == '__main__':
+    asyncio.run(record(sys.argv[1] if len(sys.argv) > 1 else 'science explainer'))
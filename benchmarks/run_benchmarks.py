@@ -0,0 +1,250 @@
+"""
+Offline benchmark harness for the discovery pipeline.
+
+Replays recorded YouTube Data API, Gemini and scraper responses (benchmarks/fixtures)
+through local stand-ins with injected latency, then drives /search, /extract-emails and
+VideoFilter.filter_videos at several sizes and concurrency levels.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --scenarios search --sizes 5,25 --concurrency 1,8 --api-latency 0.08
+    python -m benchmarks.run_benchmarks --json bench_results.json
+    python -m benchmarks.run_benchmarks --scenarios extract --captcha-rate 0.3 --captcha-breaker
+
+Logs go to stdout like the app's, so they are kept to WARNING (set LOG_LEVEL to see more).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+# Placeholder keys keep the startup key check quiet; the stand-ins never use them
+os.environ.setdefault('YOUTUBE_API_KEY', 'benchmark-offline')
+os.environ.setdefault('GOOGLE_API_KEY', 'benchmark-offline')
+# Every benchmark call comes from one client; measure the pipeline, not the per-client rate limit
+os.environ.setdefault('ADMISSION_CLIENT_RATE', '0')
+os.environ.setdefault('ADMISSION_MAX_QUEUE', '100000')
+# Reused analyses and stored ETags would carry over between runs and cells
+os.environ.setdefault('YOUTUBE_ETAG_TTL', '0')
+os.environ.setdefault('CHANNEL_ANALYSIS_TTL', '0')
+# Per-request INFO lines would be interleaved with the results table
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import httpx
+
+from app.main import app, get_llm_service, get_youtube_service
+from app.services.filters import VideoFilter
+from app.services.llm_handler import LLMHandler
+from app.services.youtube_search import YouTubeSearch
+from app.services.records import ChannelRecord, VideoRecord
+from app.services.captcha import CaptchaCircuitBreaker, FakeCaptchaSolver, set_captcha_breaker, set_captcha_solver
+from benchmarks.fakes import CallCounter, FakeChannelScraper, FakeGeminiModel, FakeYouTubeClient, Latency
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Harness:
+    """
+    Wires the stand-ins into the FastAPI app and VideoFilter and keeps their call counters.
+    """
+
+    def __init__(self, args):
+        self.youtube_client = FakeYouTubeClient(
+            latency=Latency(args.api_latency, args.jitter, seed=1),
+            channel_pool=args.channel_pool,
+        )
+        self.gemini_model = FakeGeminiModel(latency=Latency(args.llm_latency, args.jitter, seed=2))
+        self.scraper_calls = CallCounter()
+        self.scraper_factory = FakeChannelScraper.factory(
+            Latency(args.scrape_latency, args.jitter, seed=3), self.scraper_calls, captcha_rate=args.captcha_rate
+        )
+        set_captcha_solver(FakeCaptchaSolver(delay=args.captcha_latency))
+        if not args.captcha_breaker:
+            # Thresholds no rate can reach: a captcha rate above CAPTCHA_SLOW_RATE would
+            # otherwise add per-page delays and, at CAPTCHA_OPEN_RATE, a 120 s pause
+            set_captcha_breaker(CaptchaCircuitBreaker(slow_rate=float('inf'), open_rate=float('inf')))
+
+        app.dependency_overrides[get_youtube_service] = lambda: YouTubeSearch(
+            youtube_client=self.youtube_client, scraper_factory=self.scraper_factory
+        )
+        app.dependency_overrides[get_llm_service] = lambda: LLMHandler(model=self.gemini_model)
+
+    def call_counts(self) -> Dict[str, int]:
+        counts = {}
+        counts.update(self.youtube_client.calls.snapshot())
+        counts.update(self.gemini_model.calls.snapshot())
+        counts.update(self.scraper_calls.snapshot())
+        return counts
+
+
+async def run_load(make_call: Callable[[int], Any], total: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Run `total` calls with at most `concurrency` in flight and collect per-call latency.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await make_call(i)
+            except Exception as e:
+                errors += 1
+                print(f"  call {i} failed: {e}", file=sys.stderr)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': total,
+        'errors': errors,
+        'elapsed_s': elapsed,
+        'throughput_rps': total / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+async def bench_search(harness: Harness, client: httpx.AsyncClient, size: int, total: int, concurrency: int, distinct: int):
+    async def call(i: int):
+        response = await client.post('/search', json={
+            'query': f'benchmark query {i % distinct}',
+            'limit': size,
+            'min_subscribers': 1,
+        })
+        response.raise_for_status()
+    return await run_load(call, total, concurrency)
+
+
+async def bench_extract_emails(harness: Harness, client: httpx.AsyncClient, size: int, total: int, concurrency: int, distinct: int):
+    async def call(i: int):
+        response = await client.post('/extract-emails', json={
+            'video_urls': [
+                {'id': str(j), 'url': f'https://www.youtube.com/@benchchannel{(i % distinct) * size + j:06d}'}
+                for j in range(size)
+            ]
+        })
+        response.raise_for_status()
+    return await run_load(call, total, concurrency)
+
+
+def _video_rows(size: int) -> List[VideoRecord]:
+    return [VideoRecord(
+        video_id=f'benchvid{i:04d}',
+        title=f'Benchmark video {i}',
+        view_count=150000 + i,
+        description='Recorded description ' * 20,
+        channel=ChannelRecord(
+            f'UCbenchfilter{i:011d}',
+            name=f'Bench Channel {i}',
+            subscriber_count=250000 + i,
+            country='US',
+            description='Educational explainers about history and science.',
+        ),
+    ) for i in range(size)]
+
+
+async def bench_filter_videos(harness: Harness, client: httpx.AsyncClient, size: int, total: int, concurrency: int, distinct: int):
+    video_filter = VideoFilter(min_views=1, min_subscribers=1, llm_handler=LLMHandler(model=harness.gemini_model))
+    videos = _video_rows(size)
+
+    async def call(i: int):
+        await video_filter.filter_videos(videos)
+    return await run_load(call, total, concurrency)
+
+
+SCENARIOS = {
+    'search': bench_search,
+    'extract': bench_extract_emails,
+    'filter': bench_filter_videos,
+}
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+async def main(args) -> List[Dict[str, Any]]:
+    harness = Harness(args)
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as client:
+        for scenario in args.scenarios.split(','):
+            bench = SCENARIOS[scenario]
+            for size in _int_list(args.sizes):
+                for concurrency in _int_list(args.concurrency):
+                    counts_before = harness.call_counts()
+                    tracemalloc.start()
+                    stats = await bench(harness, client, size, args.requests, concurrency, args.distinct or args.requests)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    counts_after = harness.call_counts()
+                    stats.update({
+                        'scenario': scenario,
+                        'size': size,
+                        'concurrency': concurrency,
+                        'peak_memory_mb': peak / (1024 * 1024),
+                        'calls': {k: v - counts_before.get(k, 0) for k, v in counts_after.items() if v - counts_before.get(k, 0)},
+                    })
+                    results.append(stats)
+                    print_row(stats)
+    return results
+
+
+def print_header():
+    print(f"{'scenario':<9} {'size':>5} {'conc':>5} {'req':>5} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'rps':>8} {'peak MB':>8}  calls")
+
+
+def print_row(stats: Dict[str, Any]):
+    calls = ', '.join(f'{k}={v}' for k, v in sorted(stats['calls'].items()))
+    print(
+        f"{stats['scenario']:<9} {stats['size']:>5} {stats['concurrency']:>5} {stats['requests']:>5} {stats['errors']:>4} "
+        f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['throughput_rps']:>8.2f} {stats['peak_memory_mb']:>8.2f}  {calls}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Offline benchmark for the YouTube discovery pipeline')
+    parser.add_argument('--scenarios', default='search,extract,filter', help='Comma-separated: search, extract, filter')
+    parser.add_argument('--sizes', default='5,20', help='Result limit / URL count / video count per request')
+    parser.add_argument('--concurrency', default='1,8', help='Concurrent requests in flight')
+    parser.add_argument('--requests', type=int, default=16, help='Requests per (scenario, size, concurrency) cell')
+    parser.add_argument('--distinct', type=int, default=0, help='Distinct queries per cell (default: all distinct)')
+    parser.add_argument('--channel-pool', type=int, default=500, help='Synthetic channels shared across queries')
+    parser.add_argument('--api-latency', type=float, default=0.05, help='Seconds per YouTube API call')
+    parser.add_argument('--llm-latency', type=float, default=0.4, help='Seconds per Gemini call')
+    parser.add_argument('--scrape-latency', type=float, default=0.5, help='Seconds per scraped channel page')
+    parser.add_argument('--captcha-rate', type=float, default=0.0, help='Fraction of scraped pages that show a captcha')
+    parser.add_argument('--captcha-latency', type=float, default=2.0, help='Seconds for the fake solver to return a token')
+    parser.add_argument('--captcha-breaker', action='store_true',
+                        help='Keep the captcha circuit breaker (CAPTCHA_SLOW_RATE/CAPTCHA_OPEN_RATE) instead of disabling it')
+    parser.add_argument('--jitter', type=float, default=0.2, help='Uniform latency jitter as a fraction of the base')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    print_header()
+    results = asyncio.run(main(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,91 @@
+import os
+import asyncio
+
+import pytest
+
+from app.services import shared_store
+from app.services.admission import (
+    AdmissionController, AdmissionRejected, client_identity,
+    estimate_enrich_cost, estimate_extract_cost, estimate_search_cost,
+)
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_store, "_store", shared_store.SharedStore(str(tmp_path / "shared_store.db")))
+    monkeypatch.setattr(shared_store, "_store_pid", os.getpid())
+
+
+def _controller(**kwargs) -> AdmissionController:
+    options = dict(client_rate=0, client_burst=100, max_inflight_cost=10, max_queue=10, queue_timeout=5)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_costs_grow_with_request_size():
+    assert estimate_search_cost(5) < estimate_search_cost(50)
+    assert estimate_search_cost(None) == estimate_search_cost(5)
+    assert estimate_extract_cost(0) == 1 < estimate_extract_cost(3)
+    # Batched lookups are per 50 channels; classification and scraping are per channel
+    assert estimate_enrich_cost(100, classify=False, scrape=False) == 2
+    assert estimate_enrich_cost(100, classify=True, scrape=False) < estimate_enrich_cost(100, classify=True, scrape=True)
+
+
+def test_queue_admits_cheapest_first():
+    async def main():
+        controller = _controller()
+        held = await controller.acquire("a", 10)
+        tasks = {cost: asyncio.ensure_future(controller.acquire("b", cost)) for cost in (8, 2, 5)}
+        await asyncio.sleep(0.01)
+        controller.release(held)
+        await asyncio.wait_for(asyncio.gather(tasks[2], tasks[5]), timeout=1)
+        waiting = not tasks[8].done()
+        tasks[8].cancel()
+        return waiting, controller.inflight_cost
+
+    # 8 came first but does not fit beside the cheaper 2 and 5
+    assert asyncio.run(main()) == (True, 7)
+
+
+def test_rate_limit_rejects_with_retry_hint():
+    async def main():
+        controller = _controller(client_rate=1, client_burst=5)
+        await controller.charge("a", 5)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.charge("a", 3)
+        return rejected.value
+
+    rejected = asyncio.run(main())
+    assert rejected.reason == "rate_limited"
+    assert rejected.retry_after >= 1
+
+
+def test_full_queue_refunds_the_rate_charge():
+    async def main():
+        controller = _controller(client_rate=0.001, client_burst=10, max_queue=0)
+        await controller.acquire("other", 10)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("a", 6)
+        # The whole burst is still available to the turned-away client
+        await controller.charge("a", 10)
+        return rejected.value.reason
+
+    assert asyncio.run(main()) == "queue_full"
+
+
+def test_queue_timeout_refunds_the_rate_charge():
+    async def main():
+        controller = _controller(client_rate=0.001, client_burst=10, queue_timeout=0.05)
+        await controller.acquire("other", 10)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("a", 6)
+        await controller.charge("a", 10)
+        return rejected.value.reason, controller.stats()["queue_depth"]
+
+    assert asyncio.run(main()) == ("queue_timeout", 0)
+
+
+def test_client_identity_hides_api_keys():
+    identity = client_identity("secret-key", "10.0.0.1")
+    assert identity.startswith("key:") and "secret" not in identity
+    assert client_identity(None, "10.0.0.1") == "ip:10.0.0.1"
@@ -0,0 +1,65 @@
+from app.services.contact_extraction import (
+    CONTACT_PATTERN, extract_contacts, first_email, is_valid_email, social_handle, social_platform,
+)
+
+
+def test_finds_emails_and_urls_in_one_pass():
+    text = "Business: hello@creator.io | shop https://creator.io/store"
+    kinds = [(m.lastgroup, m.group(m.lastgroup)) for m in CONTACT_PATTERN.finditer(text)]
+    assert kinds == [("email", "hello@creator.io"), ("url", "https://creator.io/store")]
+
+
+def test_email_trailing_punctuation_and_duplicates():
+    contacts = extract_contacts("Mail hello@creator.io. Or (hello@creator.io), or team@studio.co.uk!")
+    assert contacts["emails"] == ["hello@creator.io", "team@studio.co.uk"]
+
+
+def test_placeholder_and_asset_emails_are_rejected():
+    text = "contact@example.com logo@2x.png wght@400.css sub@mail.test.com real@creator.io"
+    assert extract_contacts(text)["emails"] == ["real@creator.io"]
+    assert not is_valid_email("logo@2x.png")
+
+
+def test_obfuscated_emails_are_not_extracted():
+    # Like the original patterns, "[at]"/"(dot)" spellings are left to the LLM classification
+    text = "hello [at] creator [dot] io, hello(at)creator(dot)io"
+    assert extract_contacts(text)["emails"] == []
+
+
+def test_email_inside_long_token_is_not_split():
+    assert first_email("x" * 5000 + "@creator.io") == "x" * 5000 + "@creator.io"
+    assert first_email("no address here") is None
+
+
+def test_url_trailing_punctuation_is_stripped():
+    contacts = extract_contacts("Follow (https://instagram.com/creator). Also https://x.com/creator!")
+    assert contacts["urls"] == ["https://instagram.com/creator", "https://x.com/creator"]
+    assert contacts["handles"] == ["instagram:creator", "twitter:creator"]
+
+
+def test_json_escaped_urls_are_unescaped():
+    contacts = extract_contacts('"url":"https:\\/\\/www.tiktok.com\\/@creator?a=1\\u0026b=2"')
+    assert contacts["urls"] == ["https://www.tiktok.com/@creator?a=1&b=2"]
+    assert contacts["handles"] == ["tiktok:creator"]
+
+
+def test_redirect_targets_are_decoded():
+    url = "https://www.youtube.com/redirect?event=channel&q=https%3A%2F%2Fpatreon.com%2Fcreator"
+    contacts = extract_contacts(f"Support me: {url}")
+    assert contacts["redirect_targets"] == ["https://patreon.com/creator"]
+    assert contacts["social_links"] == ["https://patreon.com/creator"]
+
+
+def test_social_domains_match_whole_host_labels():
+    assert social_platform("https://m.facebook.com/creator") == "facebook"
+    assert social_platform("https://uk.linkedin.com/in/creator") == "linkedin"
+    assert social_platform("https://t.me/creator") == "telegram"
+    # Substrings of other domains are not social links
+    assert social_platform("https://notinstagram.com/creator") is None
+    assert social_platform("https://box.me/creator") is None
+
+
+def test_section_paths_are_not_handles():
+    assert social_handle("https://instagram.com/p/abc123") is None
+    assert social_handle("https://linkedin.com/in/creator") is None
+    assert social_handle("https://twitter.com/@creator") == "twitter:creator"
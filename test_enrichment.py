@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.discovery import classification_key
+from app.services.enrichment import parse_channel_ref
+
+CHANNEL_ID = "UC" + "a" * 20 + "-_"
+
+
+@pytest.mark.parametrize("ref, expected", [
+    (CHANNEL_ID, ("id", CHANNEL_ID)),
+    (f"  {CHANNEL_ID}\n", ("id", CHANNEL_ID)),
+    ("@Creator", ("handle", "@creator")),
+    ("@Creator/videos", ("handle", "@creator")),
+    ("https://www.youtube.com/@Creator/about?si=x", ("handle", "@creator")),
+    ("youtube.com/@creator", ("handle", "@creator")),
+    (f"https://www.youtube.com/channel/{CHANNEL_ID}/videos", ("id", CHANNEL_ID)),
+    (f"m.youtube.com/channel/{CHANNEL_ID}", ("id", CHANNEL_ID)),
+])
+def test_parse_channel_ref(ref, expected):
+    assert parse_channel_ref(ref) == expected
+
+
+@pytest.mark.parametrize("ref", [
+    "",
+    "@",
+    "not a channel",
+    "UCtooshort",
+    "https://www.youtube.com/c/LegacyName",
+    "https://www.youtube.com/user/legacy",
+    "https://www.youtube.com/channel/UCtooshort",
+    "https://www.youtube.com/watch?v=abc",
+])
+def test_parse_channel_ref_rejects(ref):
+    with pytest.raises(ValueError):
+        parse_channel_ref(ref)
+
+
+def test_classification_key_depends_on_prompt_inputs():
+    details = {"last_3_titles": ["a", "b", "c"], "avg_views": 10.0}
+    key = classification_key("UC1", "About", details)
+    assert key == classification_key("UC1", "About", dict(reversed(list(details.items()))))
+    assert key != classification_key("UC1", "About", {**details, "last_3_titles": ["a", "b"]})
+    assert key != classification_key("UC1", "About!", details)
+    assert key.startswith("UC1:")
@@ -0,0 +1,62 @@
+import csv
+import gzip
+import io
+import json
+import asyncio
+
+from app.services.export import EXPORT_COLUMNS, csv_chunks, export_stream, flatten_channel, gzip_chunks
+from app.services.records import NOT_AVAILABLE, ChannelRecord, ClassificationResult, DiscoveredChannel, VideoRecord
+
+
+def _result(channel_id: str, videos: int = 1) -> DiscoveredChannel:
+    return DiscoveredChannel(
+        ChannelRecord(channel_id, name="Creator, Inc.", description='Says "hi"\nand more', subscriber_count=5000),
+        ["a@creator.io", "b@creator.io"], ["https://x.com/c"],
+        [VideoRecord(f"v{i}", title=f"Video {i}", view_count=100 * i) for i in range(videos)],
+        250.0, ClassificationResult(is_icp=True),
+    )
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect_list(chunks):
+    return [chunk async for chunk in chunks]
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join(await _collect_list(chunks))
+
+
+def test_flatten_channel_joins_lists_and_pads_videos():
+    row = flatten_channel(_result("UC1", videos=1))
+    assert list(row) == EXPORT_COLUMNS
+    assert row["emails"] == "a@creator.io; b@creator.io"
+    assert row["country"] == NOT_AVAILABLE
+    assert (row["video_1_title"], row["video_1_view_count"]) == ("Video 0", 0)
+    assert row["video_2_title"] is None and row["video_3_description"] is None
+
+
+def test_csv_chunks_stream_header_then_one_row_each():
+    chunks = asyncio.run(_collect_list(csv_chunks(_aiter([_result("UC1"), _result("UC2")]))))
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert [r["id"] for r in rows] == ["UC1", "UC2"]
+    # Commas, quotes and newlines survive quoting
+    assert rows[0]["channel_name"] == "Creator, Inc."
+    assert rows[0]["about"] == 'Says "hi"\nand more'
+
+
+def test_gzip_chunks_round_trip():
+    data = [b"first line\n", b"", b"second line\n" * 1000]
+    compressed = asyncio.run(_collect(gzip_chunks(_aiter(data))))
+    assert gzip.decompress(compressed) == b"".join(data)
+    assert len(compressed) < len(b"".join(data))
+
+
+def test_export_stream_ndjson_gzip():
+    body = asyncio.run(_collect(export_stream(_aiter([_result("UC1")]), "ndjson", gzip=True)))
+    lines = gzip.decompress(body).decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["UC1"]
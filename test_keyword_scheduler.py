@@ -0,0 +1,93 @@
+from app.services.keyword_scheduler import KeywordScheduler
+
+
+def _ids(prefix: str, count: int):
+    return [f"{prefix}{i}" for i in range(count)]
+
+
+def test_record_page_returns_only_unseen_channels():
+    scheduler = KeywordScheduler(["a", "b"])
+    scheduler.start(per_keyword=10)
+    assert scheduler.record_page("a", _ids("x", 10), "next") == _ids("x", 10)
+    new_ids = scheduler.record_page("b", _ids("x", 5) + _ids("y", 5), "next")
+    assert new_ids == _ids("y", 5)
+    stats = scheduler.keywords["b"]
+    assert (stats.fetched, stats.new, stats.pages) == (10, 5, 1)
+
+
+def test_repeated_keyword_is_paged_once():
+    scheduler = KeywordScheduler(["a", "a", "b"])
+    assert list(scheduler.keywords) == ["a", "b"]
+
+
+def test_low_yield_keyword_is_retired():
+    scheduler = KeywordScheduler(["a", "b"], retire_yield=0.3, min_sample=5)
+    scheduler.start(per_keyword=100)
+    scheduler.record_page("a", _ids("x", 50), "next")
+    scheduler.record_page("b", _ids("x", 45) + _ids("y", 5), "next")
+    assert scheduler.keywords["b"].retired
+    assert not scheduler.keywords["a"].retired
+
+
+def test_small_sample_is_not_retired():
+    scheduler = KeywordScheduler(["a", "b"], retire_yield=0.3, min_sample=5)
+    scheduler.start(per_keyword=100)
+    scheduler.record_page("a", _ids("x", 4), "next")
+    scheduler.record_page("b", _ids("x", 4), "next")
+    assert not scheduler.keywords["b"].retired
+
+
+def test_last_page_exhausts_keyword():
+    scheduler = KeywordScheduler(["a"])
+    scheduler.start(per_keyword=100)
+    scheduler.record_page("a", _ids("x", 20), None)
+    assert scheduler.keywords["a"].done
+    assert scheduler.next_keyword() is None
+
+
+def test_retired_keyword_pages_go_to_best_yield():
+    scheduler = KeywordScheduler(["a", "b", "c"], retire_yield=0.3, min_sample=5)
+    scheduler.start(per_keyword=100)  # two pages per keyword, six in total
+    assert scheduler.page_budget == 6
+    order = []
+    pages = {
+        "a": [_ids("a", 50), _ids("a2", 50)],
+        "b": [_ids("a", 50)],  # all duplicates: retired after one page
+        "c": [_ids("c", 25) + _ids("a", 25), _ids("c2", 25) + _ids("a2", 25)],
+    }
+    while True:
+        keyword = scheduler.next_keyword()
+        if keyword is None:
+            break
+        order.append(keyword)
+        page = pages[keyword].pop(0) if pages[keyword] else _ids(f"{keyword}{len(order)}-", 50)
+        scheduler.record_page(keyword, page, "next")
+    assert order[:5] == ["a", "a", "b", "c", "c"]
+    # b's unused page goes to a, whose yield is highest
+    assert order[5:] == ["a"]
+    assert scheduler.pages_used == scheduler.page_budget
+
+
+def test_page_size_shrinks_to_remaining_need():
+    scheduler = KeywordScheduler(["a"])
+    scheduler.start(per_keyword=70)
+    assert scheduler.page_size("a") == 50
+    scheduler.record_page("a", _ids("x", 50), "next")
+    assert scheduler.page_size("a") == 20
+
+
+def test_restore_keeps_seen_channels():
+    first = KeywordScheduler(["a", "b"])
+    first.start(per_keyword=100)
+    first.record_page("a", _ids("x", 50), "next")
+    first.record_page("b", _ids("y", 50), "next")
+
+    resumed = KeywordScheduler(["a", "b"])
+    resumed.start(per_keyword=100)
+    for keyword in resumed.keywords:
+        resumed.restore(keyword, first.progress(keyword))
+    assert resumed.pages_used == 2
+    assert resumed.progress("a") == first.progress("a")
+    # Channels found through "a" before the resume are still duplicates for "b"
+    assert resumed.record_page("b", _ids("x", 10) + _ids("z", 10), "next") == _ids("z", 10)
+    assert resumed.keywords["b"].new == 60
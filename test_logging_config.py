@@ -0,0 +1,37 @@
+import json
+import queue
+import logging
+
+from app.services.logging_config import JsonFormatter, RecordQueueHandler
+
+
+def _queued_record(log) -> logging.LogRecord:
+    handler = RecordQueueHandler(queue.SimpleQueue())
+    logger = logging.getLogger("test.logging_config")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        log(logger)
+    finally:
+        logger.removeHandler(handler)
+    return handler.queue.get_nowait()
+
+
+def test_traceback_goes_to_exc_info_field():
+    def log(logger):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Job failed: %s", "boom", extra={"job_id": "j1"})
+
+    entry = json.loads(JsonFormatter().format(_queued_record(log)))
+    assert entry["message"] == "Job failed: boom"
+    assert entry["job_id"] == "j1"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_args_are_merged_before_queueing():
+    values = ["first"]
+    record = _queued_record(lambda logger: logger.warning("Values: %s", values))
+    values.append("later")
+    assert record.getMessage() == "Values: ['first']"
@@ -0,0 +1,62 @@
+from app.services.prompt_compaction import (
+    CHARS_PER_TOKEN, TRUNCATION_MARK, compact_classification_input, compact_links, compact_text,
+)
+
+
+def test_timestamp_and_hashtag_lines_are_dropped():
+    text = "Chapters:\n0:00 Intro\n(12:34) - Part 2\n1:02:03 Outro\n#science #space\nA real sentence."
+    assert compact_text(text, 400) == "Chapters:\nA real sentence."
+
+
+def test_repeated_lines_and_links_are_sent_once():
+    text = "Subscribe for more!\nsubscribe   FOR more!\nhttps://creator.io\n- https://creator.io\nSite: https://creator.io"
+    # A line that is only links already sent goes; one with other text stays
+    assert compact_text(text, 400) == "Subscribe for more!\nhttps://creator.io\nSite: https://creator.io"
+
+
+def test_affiliate_lines_are_folded_into_a_summary():
+    text = (
+        "My gear: https://amzn.to/abc\n"
+        "Use code CREATOR for 10% off https://shop.brand.com/x\n"
+        "Email me: hello@creator.io for promo code deals\n"
+        "Weekly science videos."
+    )
+    lines = compact_text(text, 400).split("\n")
+    # A line with an email is never folded, whatever else it says
+    assert lines[:2] == ["Email me: hello@creator.io for promo code deals", "Weekly science videos."]
+    assert lines[2] == "[2 sponsor/affiliate lines removed: amzn.to, shop.brand.com]"
+
+
+def test_budget_keeps_priority_lines_in_order():
+    filler = ["Filler line number %d about nothing in particular." % i for i in range(20)]
+    text = "\n".join(filler[:10] + ["For business inquiries: hello@creator.io"] + filler[10:])
+    result = compact_text(text, 40)
+    assert len(result) <= 40 * CHARS_PER_TOKEN
+    lines = result.split("\n")
+    # The contact line after the budget is kept ahead of earlier filler, in its original place
+    assert lines[-1] == "For business inquiries: hello@creator.io"
+    assert lines[0] == filler[0]
+    assert len(lines) < 11
+
+
+def test_budget_cuts_the_first_line_that_does_not_fit():
+    text = "\n".join(["word " * 30, "second line"])
+    result = compact_text(text, 20)
+    assert result.endswith(TRUNCATION_MARK)
+    assert "second line" not in result
+    assert len(result) <= 20 * CHARS_PER_TOKEN
+
+
+def test_links_already_in_about_are_not_repeated():
+    description, details = compact_classification_input("About text https://creator.io", {
+        "about": "About text https://creator.io",
+        "links": ["https://creator.io", "https://patreon.com/creator"],
+        "last_3_descriptions": ["About text https://creator.io\nNew video notes"],
+    })
+    assert description == "(same as About)"
+    assert details["links"] == ["https://patreon.com/creator"]
+    assert details["last_3_descriptions"] == ["New video notes"]
+
+
+def test_compact_links_dedupes_in_order():
+    assert compact_links(["a", "b", "a", "c"], 100) == ["a", "b", "c"]
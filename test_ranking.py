@@ -0,0 +1,56 @@
+from app.services.ranking import TopKRanker, score_channel, upper_bound
+from app.services.records import ChannelRecord, ClassificationResult, DiscoveredChannel
+
+
+def _channel(channel_id: str, subscribers: int, is_icp: bool = False) -> DiscoveredChannel:
+    return DiscoveredChannel(
+        ChannelRecord(channel_id, subscriber_count=subscribers), [], [], [], 1000.0,
+        ClassificationResult(is_icp=is_icp),
+    )
+
+
+def _full_ranker(**kwargs) -> TopKRanker:
+    ranker = TopKRanker(3, **kwargs)
+    for i in range(3):
+        assert ranker.offer(_channel(f"top{i}", 1_000_000, is_icp=True))
+    return ranker
+
+
+def test_upper_bound_covers_score():
+    result = _channel("a", 50_000, is_icp=True)
+    assert upper_bound(50_000) >= score_channel(result)
+
+
+def test_ranked_keeps_best_first():
+    ranker = TopKRanker(2)
+    for channel_id, subscribers in (("small", 1_000), ("big", 5_000_000), ("mid", 100_000)):
+        ranker.offer(_channel(channel_id, subscribers))
+    assert [r.channel.channel_id for _, r in ranker.ranked()] == ["big", "mid"]
+
+
+def test_prune_below_threshold():
+    ranker = _full_ranker()
+    assert ranker.prune(ranker.threshold())
+    assert not ranker.prune(ranker.threshold() + 0.1)
+    assert ranker.pruned == 1
+
+
+def test_stops_after_a_window_of_misses():
+    ranker = _full_ranker(window=10)
+    for i in range(9):
+        ranker.offer(_channel(f"low{i}", 1_000))
+        assert not ranker.exhausted(20)
+    ranker.offer(_channel("low9", 1_000))
+    assert ranker.exhausted(20)
+
+
+def test_recent_entry_keeps_searching():
+    ranker = _full_ranker(window=10)
+    for i in range(9):
+        ranker.offer(_channel(f"low{i}", 1_000))
+    assert ranker.offer(_channel("better", 9_000_000, is_icp=True))
+    assert not ranker.exhausted(20)
+    # The entry slides out of the window after ten more misses
+    for i in range(10):
+        assert ranker.prune(0.0)
+    assert ranker.exhausted(20)
@@ -0,0 +1,71 @@
+from app.services.records import (
+    NOT_AVAILABLE, ChannelRecord, ClassificationResult, DiscoveredChannel, VideoRecord, video_result_dict,
+)
+
+CHANNEL_ITEM = {
+    "etag": "c-etag",
+    "snippet": {"title": "Creator", "description": "About", "customUrl": "@creator", "country": "US"},
+    "statistics": {"subscriberCount": "12000", "videoCount": "40", "viewCount": "900000"},
+    "brandingSettings": {"channel": {"keywords": "science space"}},
+}
+VIDEO_ITEM = {
+    "id": "v1",
+    "etag": "v-etag",
+    "snippet": {"title": "Video", "description": "Desc", "tags": ["a"]},
+    "statistics": {"viewCount": "1500", "likeCount": "30"},
+}
+
+
+def test_channel_from_api():
+    channel = ChannelRecord.from_api("UC1", CHANNEL_ITEM)
+    assert (channel.name, channel.subscriber_count, channel.view_count) == ("Creator", 12000, 900000)
+    assert channel.url == "https://www.youtube.com/@creator"
+    assert channel.etag == "c-etag"
+
+
+def test_missing_channel_fields_stay_none_until_the_boundary():
+    channel = ChannelRecord.from_api("UC2", {})
+    assert channel.name is None and channel.country is None
+    assert channel.url == "https://www.youtube.com/channel/UC2"
+    result = DiscoveredChannel(channel, [], [], [], 0.0, ClassificationResult()).to_dict()
+    assert result["channel_name"] == result["country"] == NOT_AVAILABLE
+
+
+def test_video_from_api_keeps_missing_counts_unknown():
+    video = VideoRecord.from_api(VIDEO_ITEM)
+    assert (video.view_count, video.like_count, video.comment_count) == (1500, 30, None)
+    assert video.link == "https://www.youtube.com/watch?v=v1"
+
+
+def test_video_result_dict_fills_placeholders():
+    row = video_result_dict(VideoRecord(), ClassificationResult())
+    assert row["title"] == row["link"] == row["channel_name"] == row["email"] == row["country"] == NOT_AVAILABLE
+    assert row["tags"] == [] and row["topic_categories"] == []
+    assert row["subscriber_count"] == 0
+
+
+def test_video_result_dict_uses_channel_and_classification():
+    channel = ChannelRecord.from_api("UC1", CHANNEL_ITEM)
+    row = video_result_dict(VideoRecord.from_api(VIDEO_ITEM, channel), ClassificationResult(email="hi@creator.io", is_icp=True))
+    assert (row["channel_name"], row["country"], row["email"], row["isicp"]) == ("Creator", "US", "hi@creator.io", True)
+    assert row["channel_info"]["total_views"] == 900000
+
+
+def test_from_flat_reads_the_older_row_shape():
+    video = VideoRecord.from_flat({"video_id": "v1", "video_title": "T", "channel_name": "C", "channel_subscriber_count": 5})
+    assert (video.title, video.channel.name, video.channel.subscriber_count) == ("T", "C", 5)
+
+
+def test_discovered_channel_state_round_trip():
+    channel = ChannelRecord.from_api("UC1", CHANNEL_ITEM)
+    result = DiscoveredChannel(channel, ["hi@creator.io"], ["https://x.com/c"], [VideoRecord.from_api(VIDEO_ITEM)],
+                               1500.0, ClassificationResult(is_icp=True, why="fits"))
+    restored = DiscoveredChannel.from_state(result.to_state())
+    assert restored.to_dict() == result.to_dict()
+    assert restored.classification.why == "fits"
+
+
+def test_classification_from_llm_normalises_shapes():
+    result = ClassificationResult.from_llm({"email": ["a@b.io", "c@d.io"], "contact_links": "https://x.com/c", "isicp": 1})
+    assert (result.email, result.contact_links, result.is_icp) == ("a@b.io", ["https://x.com/c"], True)
+    assert ClassificationResult.from_llm({"email": None, "contact_links": None}).email == ""
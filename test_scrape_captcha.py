@@ -0,0 +1,63 @@
+import os
+import asyncio
+
+os.environ.setdefault("SCRAPE_CACHE_PATH", "")
+os.environ.setdefault("PROXY_LIST_PATH", "")
+
+from app.services.captcha import CaptchaSolver, FakeCaptchaSolver, set_captcha_solver
+from app.services.youtube_search import YouTubeSearch
+from benchmarks.fakes import FakeYouTubeClient
+
+CAPTCHA_URL = "https://www.youtube.com/@captcha"
+
+
+class CaptchaPageScraper:
+    """
+    Shows a reCAPTCHA on CAPTCHA_URL until a token is passed; every other page has an email.
+    """
+
+    def __init__(self, proxy=None):
+        pass
+
+    def extract_from_channel(self, channel_url, captcha_token=None):
+        if channel_url == CAPTCHA_URL and not captcha_token:
+            return {"email": None, "links": [], "captcha": True, "error": None,
+                    "captcha_challenge": {"site_key": "key", "page_url": channel_url}}
+        return {"email": "hello@creator.io", "links": [], "captcha": channel_url == CAPTCHA_URL, "error": None}
+
+    def close(self):
+        pass
+
+
+class FailingSolver(CaptchaSolver):
+    name = "failing"
+
+    async def solve(self, site_key, page_url):
+        raise RuntimeError("solver backend unavailable")
+
+
+def _scrape(solver):
+    set_captcha_solver(solver)
+    youtube = YouTubeSearch(youtube_client=FakeYouTubeClient(), scraper_factory=CaptchaPageScraper)
+    items = [
+        {"id": "a", "url": "https://www.youtube.com/@a"},
+        {"id": "b", "url": CAPTCHA_URL},
+        {"id": "c", "url": "https://www.youtube.com/@c"},
+    ]
+    try:
+        # A batch that never drains would hang here; fail the test instead
+        return asyncio.run(asyncio.wait_for(youtube.extract_emails_and_links_from_urls(items), timeout=10))
+    finally:
+        set_captcha_solver(None)
+
+
+def test_solver_error_finishes_parked_page():
+    results = _scrape(FailingSolver())
+    assert [r["id"] for r in results] == ["a", "b", "c"]
+    assert results[0]["email"] == results[2]["email"] == "hello@creator.io"
+    assert results[1]["email"] is None
+
+
+def test_solved_page_is_requeued_with_token():
+    results = _scrape(FakeCaptchaSolver(delay=0))
+    assert results[1]["email"] == "hello@creator.io"
@@ -0,0 +1,135 @@
+import time
+import sqlite3
+import asyncio
+import threading
+import multiprocessing
+
+from app.services.executors import run_store
+from app.services.shared_store import SharedStore
+
+
+def _store(tmp_path) -> SharedStore:
+    return SharedStore(str(tmp_path / "shared_store.db"))
+
+
+def test_try_consume_stops_at_limit(tmp_path):
+    store = _store(tmp_path)
+    assert store.try_consume("quota", 6, limit=10)
+    assert not store.try_consume("quota", 5, limit=10)
+    assert store.try_consume("quota", 4, limit=10)
+    assert not store.try_consume("quota", 1, limit=10)
+    assert store.counter("quota") == 10
+
+
+def test_counter_restarts_after_ttl(tmp_path):
+    store = _store(tmp_path)
+    assert store.try_consume("daily", 10, limit=10, ttl=0.2)
+    assert not store.try_consume("daily", 1, limit=10, ttl=0.2)
+    time.sleep(0.3)
+    assert store.try_consume("daily", 1, limit=10, ttl=0.2)
+    assert store.counter("daily") == 1
+
+
+def test_lease_expires(tmp_path):
+    store = _store(tmp_path)
+    first = store.acquire_lease("llm", limit=1, ttl=0.2)
+    assert first is not None
+    assert store.acquire_lease("llm", limit=1, ttl=0.2) is None
+    time.sleep(0.3)
+    assert store.acquire_lease("llm", limit=1, ttl=0.2) is not None
+
+
+def test_released_lease_frees_its_slot(tmp_path):
+    store = _store(tmp_path)
+    lease_id = store.acquire_lease("llm", limit=1, ttl=60)
+    store.release_lease("llm", lease_id)
+    assert store.leases_held("llm") == 0
+    assert store.acquire_lease("llm", limit=1, ttl=60) is not None
+
+
+def test_expired_lease_cannot_be_renewed(tmp_path):
+    store = _store(tmp_path)
+    lease_id = store.acquire_lease("job:1", limit=1, ttl=0.2)
+    assert store.renew_lease("job:1", lease_id, ttl=0.2)
+    time.sleep(0.3)
+    assert not store.renew_lease("job:1", lease_id, ttl=60)
+    assert store.acquire_lease("job:1", limit=1, ttl=60) is not None
+
+
+def test_bucket_refills(tmp_path):
+    store = _store(tmp_path)
+    assert store.take_tokens("client", 2, rate=10, capacity=2) == 0
+    wait = store.take_tokens("client", 1, rate=10, capacity=2)
+    assert 0 < wait <= 0.1
+    time.sleep(wait + 0.05)
+    assert store.take_tokens("client", 1, rate=10, capacity=2) == 0
+
+
+def _consume_until_empty(path, start, results):
+    store = SharedStore(path)
+    start.wait()
+    taken = 0
+    while store.try_consume("race", 1, limit=200):
+        taken += 1
+    results.put(taken)
+
+
+def _lease_once(path, start, results):
+    store = SharedStore(path)
+    start.wait()
+    results.put(store.acquire_lease("race", limit=1, ttl=60) is not None)
+
+
+def _race(target, path, processes=2):
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    workers = [context.Process(target=target, args=(path, start, results)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    start.set()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=60)
+    return outcomes
+
+
+def test_processes_never_share_the_last_units(tmp_path):
+    path = str(tmp_path / "shared_store.db")
+    SharedStore(path)
+    taken = _race(_consume_until_empty, path)
+    assert sum(taken) == 200
+    assert SharedStore(path).counter("race") == 200
+
+
+def test_processes_never_share_the_last_lease(tmp_path):
+    path = str(tmp_path / "shared_store.db")
+    SharedStore(path)
+    assert sorted(_race(_lease_once, path, processes=4)) == [False, False, False, True]
+
+
+def test_locked_store_does_not_block_the_event_loop(tmp_path):
+    store = _store(tmp_path)
+    # Another process holding the write lock
+    other = sqlite3.connect(store.path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.5, lambda: other.execute("COMMIT")).start()
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        granted = await run_store(store.try_consume, "quota", 1, 10)
+        ticker.cancel()
+        return granted, ticks
+
+    granted, ticks = asyncio.run(main())
+    assert granted
+    # The loop kept running for the whole wait on the lock
+    assert ticks >= 20